@@ -0,0 +1,172 @@
+"""
+Batch SMS tool of the MCP server
+
+`post_sms_batch` takes a list of recipients in one tool call, splits it into
+/smsmulti requests of up to API_BATCH_SIZE recipients, sends them
+concurrently, at most API_BATCH_CONCURRENCY at once, and returns a compact
+summary: the number of recipients per result code and the failures only.
+"""
+
+import asyncio
+import json
+import os
+from collections import Counter
+from typing import Annotated, Any, Callable, Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+from config.config import get_config
+from registry import MISSING_CONFIG, Operation, http_error, is_configured, request_error, send_operation
+
+# failures listed in a summary, the others are only counted
+MAX_FAILURES = 100
+
+
+class Recipient(BaseModel):
+    num: str = Field(description="Numéro de téléphone du destinataire")
+    sms: Optional[str] = Field(None, description="Message du destinataire, le message commun si absent")
+    tracker: Optional[str] = Field(None, description="Tracker renvoyé avec les accusés de réception")
+
+
+def get_batch_settings() -> dict:
+    """Get the batch size and concurrency from the environment."""
+    return {
+        "batch_size": int(os.getenv("API_BATCH_SIZE", "500")),
+        "concurrency": int(os.getenv("API_BATCH_CONCURRENCY", "4")),
+    }
+
+
+def chunk_arguments(chunk: List[Recipient], sms: Optional[str], options: Dict[str, Any]) -> Dict[str, Any]:
+    """Build the /smsmulti arguments of a chunk of recipients."""
+    messages = [recipient.sms if recipient.sms is not None else sms for recipient in chunk]
+    arguments = dict(options)
+    arguments["num"] = [recipient.num for recipient in chunk]
+    # one message for all the recipients when they share it
+    arguments["sms"] = messages[:1] if len(set(messages)) == 1 else messages
+    if any(recipient.tracker for recipient in chunk):
+        arguments["tracker"] = [recipient.tracker or "" for recipient in chunk]
+    return arguments
+
+
+def entries(data: Any) -> List[dict]:
+    """Get the per-recipient entries of an /smsmulti response."""
+    etat = data.get("etat") if isinstance(data, dict) else None
+    if isinstance(etat, dict):
+        etat = etat.get("etat", etat)
+    if isinstance(etat, dict):
+        return [etat]
+    return [entry for entry in etat or [] if isinstance(entry, dict)]
+
+
+async def send_batch(operation: Operation, recipients: List[Recipient], sms: Optional[str] = None,
+                     options: Optional[Dict[str, Any]] = None, batch_size: int = 500,
+                     concurrency: int = 4, max_failures: int = MAX_FAILURES,
+                     on_progress: Optional[Callable[[int], None]] = None) -> dict:
+    """Send recipients through /smsmulti in concurrent chunks and summarize the results.
+
+    :return: dict with the number of recipients and requests, the number of
+        recipients per result code ("error" for the requests that failed),
+        and up to `max_failures` failures. `on_progress` is called with the
+        number of recipients of each chunk once it is sent.
+    """
+    config = get_config()
+    options = {name: value for name, value in (options or {}).items() if value is not None}
+    chunks = [recipients[i:i + batch_size] for i in range(0, len(recipients), batch_size)]
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def send(chunk):
+        async with semaphore:
+            result = await send_chunk(chunk)
+        if on_progress is not None:
+            on_progress(len(chunk))
+        return result
+
+    async def send_chunk(chunk):
+        try:
+            response = await send_operation(operation, chunk_arguments(chunk, sms, options), config)
+        except Exception as e:
+            return request_error(e, operation)
+        if response.status_code >= 400:
+            return http_error(response, operation)
+        try:
+            return entries(response.json())
+        except json.JSONDecodeError:
+            return f"Unexpected response: {response.text}"
+
+    counts = Counter()
+    failures = []
+    for chunk, result in zip(chunks, await asyncio.gather(*[send(chunk) for chunk in chunks])):
+        if isinstance(result, str):
+            counts["error"] += len(chunk)
+            failures.append({"error": result, "num": [recipient.num for recipient in chunk]})
+            continue
+        # entries come in the order of the recipients, when there is one each
+        matched = len(result) == len(chunk)
+        for i, entry in enumerate(result):
+            code = str(entry.get("code", ""))
+            counts[code] += 1
+            if code != "0":
+                failure = {"num": chunk[i].num if matched else entry.get("tel"),
+                           "code": code, "message": entry.get("message")}
+                if matched and chunk[i].tracker:
+                    failure["tracker"] = chunk[i].tracker
+                failures.append(failure)
+
+    summary = {"recipients": len(recipients), "requests": len(chunks), "counts": dict(counts),
+               "failures": failures[:max_failures]}
+    if len(failures) > max_failures:
+        summary["failures_omitted"] = len(failures) - max_failures
+    return summary
+
+
+def check_batch(arguments: Dict[str, Any]) -> Optional[str]:
+    """Get the error of the arguments of a batch, None if it can be sent."""
+    if not is_configured(get_config()):
+        return MISSING_CONFIG
+    missing = [recipient.num for recipient in arguments["recipients"]
+               if recipient.sms is None and arguments.get("sms") is None]
+    if missing:
+        return f"Error: No message for {len(missing)} recipients, e.g. {missing[0]}. Set sms or their own sms."
+    return None
+
+
+async def run_batch(operation: Operation, arguments: Dict[str, Any],
+                    on_progress: Optional[Callable[[int], None]] = None) -> dict:
+    """Send a batch from the arguments of post_sms_batch."""
+    options = {name: value for name, value in arguments.items() if name not in ("recipients", "sms")}
+    return await send_batch(operation, arguments["recipients"], arguments.get("sms"), options,
+                            on_progress=on_progress, **get_batch_settings())
+
+
+def register_batch_tools(mcp, operations: List[Operation]) -> Dict[str, Callable]:
+    """Register post_sms_batch on a FastMCP server, on the /smsmulti operation.
+
+    :return: dict of tool name -> tool function.
+    """
+    operation = next((operation for operation in operations if operation.name == "post_smsmulti"), None)
+    if operation is None:
+        return {}
+
+    async def post_sms_batch(
+        keyid: Annotated[str, Field(description="Clé API")],
+        recipients: Annotated[List[Recipient], Field(description="Destinataires, avec leur message s'il leur est propre")],
+        sms: Annotated[Optional[str], Field(description="Message commun aux destinataires sans message")] = None,
+        emetteur: Annotated[Optional[str], Field(description="Emetteur, 4 à 11 caractères alphanumériques")] = None,
+        date_envoi: Annotated[Optional[str], Field(description="Date d'envoi au format YYYY-MM-DD hh:mm")] = None,
+        gmt_zone: Annotated[Optional[str], Field(description="Fuseau horaire de la date d'envoi")] = None,
+        smslong: Annotated[Optional[str], Field(description="Nombre maximum de SMS concaténés, 999 pour un calcul dynamique")] = None,
+        nostop: Annotated[Optional[str], Field(description="1 pour ne pas ajouter la mention STOP")] = None,
+        ucs2: Annotated[Optional[str], Field(description="1 pour envoyer en alphabet non latin")] = None,
+        numAzur: Annotated[Optional[str], Field(description="Numéro azur")] = None,
+    ) -> str:
+        """Send SMS to a list of recipients and summarize the results by code, listing only the failures."""
+        arguments = {"keyid": keyid, "recipients": recipients, "sms": sms, "emetteur": emetteur,
+                     "date_envoi": date_envoi, "gmt_zone": gmt_zone, "smslong": smslong,
+                     "nostop": nostop, "ucs2": ucs2, "numAzur": numAzur}
+        error = check_batch(arguments)
+        if error:
+            return error
+        return json.dumps(await run_batch(operation, arguments), ensure_ascii=False)
+
+    mcp.add_tool(post_sms_batch)
+    return {"post_sms_batch": post_sms_batch}
@@ -0,0 +1,106 @@
+"""
+Benchmark of concurrent post_sms tool calls against a local API stub
+
+Compares the post_sms tool generated by main.py with the same request sent
+on the blocking pooled session of session.py, sequentially and from a pool
+of worker threads. The stub answers every request after a fixed latency.
+
+Usage: python benchmarks/bench_post_sms.py [calls] [latency_ms] [threads]
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+
+RESPONSE = b'{"etat": {"etat": [{"code": "0", "tel": "33680010203", "message": "Envoi OK"}]}}'
+
+
+async def handle(reader, writer, latency):
+    try:
+        while True:
+            head = await reader.readuntil(b"\r\n\r\n")
+            length = 0
+            for line in head.split(b"\r\n"):
+                if line.lower().startswith(b"content-length:"):
+                    length = int(line.split(b":", 1)[1])
+            await reader.readexactly(length)
+            await asyncio.sleep(latency)
+            writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                         b"Content-Length: %d\r\n\r\n%s" % (len(RESPONSE), RESPONSE))
+            await writer.drain()
+    except (asyncio.IncompleteReadError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+
+
+def start_stub(latency):
+    """Start the API stub on its own event loop thread, return its URL."""
+    loop = asyncio.new_event_loop()
+    started = threading.Event()
+    address = {}
+
+    async def serve():
+        server = await asyncio.start_server(lambda r, w: handle(r, w, latency), "127.0.0.1", 0)
+        address["port"] = server.sockets[0].getsockname()[1]
+        started.set()
+        await server.serve_forever()
+
+    threading.Thread(target=loop.run_until_complete, args=(serve(),), daemon=True).start()
+    started.wait()
+    return f"http://127.0.0.1:{address['port']}"
+
+
+def sms_args(i):
+    return dict(keyid="k", num="0680%06d" % i, smslong="", date_envoi="", emetteur="",
+                gmt_zone="", ucs2="", tracker="t%d" % i, nostop="", numAzur="", sms="Bonjour")
+
+
+def main(calls=200, latency_ms=50, threads=8):
+    os.environ["API_BASE_URL"] = start_stub(latency_ms / 1000.0)
+    os.environ["API_BEARER_TOKEN"] = "token"
+
+    import main as server
+    from config.config import get_config
+    from registry import build_request, format_response
+    from session import close_async_client, get_session
+
+    operation = next(operation for operation in server.operations if operation.name == "post_sms")
+
+    def blocking_post_sms(**arguments):
+        method, url, options = build_request(operation, arguments, get_config())
+        return format_response(get_session().request(method, url, **options), operation)
+
+    print(f"{calls} post_sms calls, {latency_ms} ms API latency")
+
+    start = time.perf_counter()
+    for i in range(min(calls, 20)):
+        blocking_post_sms(**sms_args(i))
+    sequential = (time.perf_counter() - start) / min(calls, 20) * calls
+    print(f"  blocking, sequential        {sequential:8.2f} s (extrapolated)")
+
+    with ThreadPoolExecutor(threads) as pool:
+        start = time.perf_counter()
+        list(pool.map(lambda i: blocking_post_sms(**sms_args(i)), range(calls)))
+        print(f"  blocking, {threads:3d} threads        {time.perf_counter() - start:8.2f} s")
+
+    async def run_async():
+        await server.tools["post_sms"](**sms_args(0))
+        start = time.perf_counter()
+        results = await asyncio.gather(*[server.tools["post_sms"](**sms_args(i)) for i in range(calls)])
+        elapsed = time.perf_counter() - start
+        await close_async_client()
+        assert all("Envoi OK" in result for result in results), results[0]
+        return elapsed
+
+    print(f"  async, one event loop       {asyncio.run(run_async()):8.2f} s")
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:4]])
@@ -1,81 +1,101 @@
 """
-MCP tool for No description available
+Configuration of the MCP server
 """
 
 import json
-import requests
-from typing import Dict, Any, Optional
+import os
+import signal
+import threading
+import time
+from pathlib import Path
+from typing import Optional
 
+CONFIG_PATH = Path.home() / ".api" / "config.json"
 
-def load_api_config() -> str:
-    """
-    No description available
+
+class Config:
+    """Snapshot of the API configuration."""
+
+    def __init__(self, base_url: Optional[str], bearer_token: Optional[str]):
+        self.base_url = base_url
+        self.bearer_token = bearer_token
+
+
+class ConfigLoader:
+    """Process-wide configuration, loaded once and reloaded when it changes.
+
+    Settings come from API_BASE_URL and API_BEARER_TOKEN, completed by the
+    config file when they are not set. The file modification time is
+    checked at most every `check_interval` seconds, so tool calls do not
+    touch the filesystem; `invalidate` (on SIGHUP) forces a reload.
     """
-    try:
-        # Get configuration
-        config = get_config()
-        
-        if not config.base_url or not config.bearer_token:
-            return "Error: Missing API configuration. Please set API_BASE_URL and API_BEARER_TOKEN environment variables."
-        
-        # Build request parameters
-        params = {}
-        pass
-        
-        # Make API call
-        url = f"{config.base_url}/api/unknown"
-        
-        headers = {
-            "Authorization": f"Bearer {config.bearer_token}",
-            "Accept": "application/json",
-            "Content-Type": "application/json"
-        }
-        
-        response = requests.get(url, headers=headers, params=params)
-        
-        # Handle HTTP errors
-        if response.status_code >= 400:
-            try:
-                error_data = response.json()
-                return f"API error: {json.dumps(error_data, indent=2)}"
-            except json.JSONDecodeError:
-                return f"API error: {response.text}"
-        
-        # Parse response
+
+    def __init__(self, path: Path = CONFIG_PATH, check_interval: float = 1.0):
+        self.path = path
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._config: Optional[Config] = None
+        self._mtime: Optional[float] = None
+        self._checked_at = 0.0
+
+    def get(self) -> Config:
+        """Get the current configuration, reloading it if needed."""
+        config = self._config
+        if config is not None and time.monotonic() - self._checked_at < self.check_interval:
+            return config
+        with self._lock:
+            if self._config is None or self._file_changed():
+                self._config = self._load()
+            self._checked_at = time.monotonic()
+            return self._config
+
+    def invalidate(self) -> None:
+        """Reload the configuration on next use."""
+        self._config = None
+
+    def _mtime_of_file(self) -> Optional[float]:
         try:
-            result = response.json()
-            return json.dumps(result, indent=2)
-        except json.JSONDecodeError:
-            # Fallback to raw text if JSON parsing fails
-            return response.text
-            
-    except requests.exceptions.ConnectionError as e:
-        return f"Request failed: Connection error - {str(e)}"
-    except requests.exceptions.Timeout as e:
-        return f"Request failed: Request timeout - {str(e)}"
-    except requests.exceptions.RequestException as e:
-        return f"Request failed: {str(e)}"
-    except Exception as e:
-        return f"Unexpected error: {str(e)}"
-
-
-def get_config():
+            return self.path.stat().st_mtime
+        except OSError:
+            return None
+
+    def _file_changed(self) -> bool:
+        return self._mtime_of_file() != self._mtime
+
+    def _load(self) -> Config:
+        base_url = os.getenv("API_BASE_URL")
+        bearer_token = os.getenv("API_BEARER_TOKEN")
+        self._mtime = self._mtime_of_file()
+
+        # Try to load from config file if env vars not set
+        if (not base_url or not bearer_token) and self._mtime is not None:
+            try:
+                with open(self.path, 'r') as f:
+                    config_data = json.load(f)
+                base_url = base_url or config_data.get("baseURL")
+                bearer_token = bearer_token or config_data.get("bearerToken")
+            except (OSError, ValueError):
+                pass
+        return Config(base_url, bearer_token)
+
+
+_loader = ConfigLoader()
+
+
+def get_config() -> Config:
     """Get configuration from environment or config file."""
-    import os
-    from pathlib import Path
-    
-    class Config:
-        def __init__(self):
-            self.base_url = os.getenv("API_BASE_URL")
-            self.bearer_token = os.getenv("API_BEARER_TOKEN")
-            
-            # Try to load from config file if env vars not set
-            if not self.base_url or not self.bearer_token:
-                config_path = Path.home() / ".api" / "config.json"
-                if config_path.exists():
-                    with open(config_path, 'r') as f:
-                        config_data = json.load(f)
-                        self.base_url = self.base_url or config_data.get("baseURL")
-                        self.bearer_token = self.bearer_token or config_data.get("bearerToken")
-    
-    return Config()
+    return _loader.get()
+
+
+def reload_config() -> None:
+    """Reload the configuration on next use."""
+    _loader.invalidate()
+
+
+def install_reload_signal() -> None:
+    """Reload the configuration on SIGHUP, where available.
+
+    Must be called from the main thread.
+    """
+    if hasattr(signal, "SIGHUP"):
+        signal.signal(signal.SIGHUP, lambda signum, frame: reload_config())
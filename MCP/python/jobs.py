@@ -0,0 +1,306 @@
+"""
+Background jobs of the MCP server
+
+Long operations, such as a large campaign send or a campaign report over
+several months, run as jobs: start_bulk_send and start_report_export return
+a job id at once, and the work runs on a pool of API_JOB_WORKERS workers on
+the event loop of the server, which keeps serving other tool calls
+meanwhile. job_status reports the progress of a job, optionally waiting for
+it with MCP progress notifications, and job_result returns its result.
+"""
+
+import asyncio
+import inspect
+import functools
+import json
+import os
+import shutil
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Annotated, Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from mcp.server.fastmcp import Context
+from pydantic import Field
+
+from batch import check_batch, run_batch
+from config.config import get_config
+from registry import MISSING_CONFIG, Operation, build_request, http_error, is_configured, request_error
+from session import async_download, run_blocking
+
+EXPORT_DIR = Path(os.getenv("API_EXPORT_DIR", Path.home() / ".cache" / "isendpro-mcp" / "exports"))
+DATE_FORMAT = "%Y-%m-%d %H:%M"
+
+# longest wait of a job_status call, in seconds
+MAX_WAIT = 60.0
+
+
+class Job:
+    """A background job, its progress and its result."""
+
+    def __init__(self, kind: str, run: Callable[["Job"], Awaitable[Any]], total: Optional[int] = None):
+        self.id = uuid.uuid4().hex[:12]
+        self.kind = kind
+        self.run = run
+        self.status = "queued"
+        self.progress = 0
+        self.total = total
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        # files written by the job, deleted when it expires
+        self.directory: Optional[Path] = None
+        self._changed = asyncio.Event()
+
+    @property
+    def done(self) -> bool:
+        return self.status in ("done", "failed")
+
+    def advance(self, count: int = 1) -> None:
+        """Add `count` units of work done."""
+        self.progress += count
+        self._notify()
+
+    def _notify(self) -> None:
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    async def wait_change(self, timeout: float) -> None:
+        """Wait until the job progresses or ends, at most `timeout` seconds."""
+        try:
+            await asyncio.wait_for(self._changed.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    def to_dict(self) -> dict:
+        end = self.finished_at or time.time()
+        return {"job_id": self.id, "kind": self.kind, "status": self.status,
+                "progress": self.progress, "total": self.total, "error": self.error,
+                "elapsed": round(end - (self.started_at or end), 3)}
+
+
+class JobManager:
+    """Runs jobs on a pool of `workers` coroutines of the event loop.
+
+    Finished jobs are kept `ttl` seconds for job_status and job_result,
+    then forgotten with their `directory`.
+    """
+
+    def __init__(self, workers: int = 2, ttl: float = 3600.0):
+        self.workers = workers
+        self.ttl = ttl
+        self.jobs: Dict[str, Job] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._tasks: List[asyncio.Task] = []
+
+    def submit(self, kind: str, run: Callable[[Job], Awaitable[Any]], total: Optional[int] = None) -> Job:
+        """Queue `run(job)` as a new job."""
+        self._prune()
+        self._start()
+        job = Job(kind, run, total)
+        self.jobs[job.id] = job
+        self._queue.put_nowait(job)
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self.jobs.get(job_id)
+
+    def _start(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._queue = asyncio.Queue()
+            self._tasks = [loop.create_task(self._work()) for _ in range(self.workers)]
+            self._loop = loop
+
+    async def _work(self) -> None:
+        while True:
+            job = await self._queue.get()
+            job.status = "running"
+            job.started_at = time.time()
+            job._notify()
+            try:
+                job.result = await job.run(job)
+                job.status = "done"
+            except Exception as e:
+                job.error = str(e) or type(e).__name__
+                job.status = "failed"
+            job.finished_at = time.time()
+            job.run = None
+            job._notify()
+
+    def _prune(self) -> None:
+        expired = time.time() - self.ttl
+        for job in [job for job in self.jobs.values() if job.done and job.finished_at < expired]:
+            del self.jobs[job.id]
+            if job.directory is not None:
+                asyncio.get_running_loop().run_in_executor(
+                    None, functools.partial(shutil.rmtree, job.directory, ignore_errors=True))
+
+
+_manager: Optional[JobManager] = None
+
+
+def get_job_manager() -> JobManager:
+    """Get the job manager of the server, set up from API_JOB_WORKERS and API_JOB_TTL."""
+    global _manager
+    if _manager is None:
+        _manager = JobManager(workers=int(os.getenv("API_JOB_WORKERS", "2")),
+                              ttl=float(os.getenv("API_JOB_TTL", "3600")))
+    return _manager
+
+
+def month_windows(date_deb: str, date_fin: str) -> List[Tuple[str, str]]:
+    """Split a period into calendar months, dates in the YYYY-MM-DD hh:mm format.
+
+    Both ends of a window are included, so a window ends on the last minute
+    of its month and the next one starts on the first minute of the next
+    month: no minute is reported twice.
+    """
+    start = datetime.strptime(date_deb, DATE_FORMAT)
+    end = datetime.strptime(date_fin, DATE_FORMAT)
+    windows = []
+    while start < end:
+        month = (start.replace(day=1, hour=0, minute=0) + timedelta(days=32)).replace(day=1)
+        if month >= end:
+            windows.append((start.strftime(DATE_FORMAT), end.strftime(DATE_FORMAT)))
+            break
+        windows.append((start.strftime(DATE_FORMAT), (month - timedelta(minutes=1)).strftime(DATE_FORMAT)))
+        start = month
+    return windows
+
+
+async def export_report(operation: Operation, keyid: str, windows: List[Tuple[str, str]], directory: Path,
+                        on_progress: Optional[Callable[[int], None]] = None) -> dict:
+    """Download the campaign report of each window to `directory`, one zip file each.
+
+    :return: dict of the files written and of the windows that failed.
+    """
+    config = get_config()
+    await run_blocking(directory.mkdir, parents=True, exist_ok=True)
+    files = []
+    errors = []
+    for date_deb, date_fin in windows:
+        path = directory / f"campagne-{date_deb[:10]}-{date_fin[:10]}.zip"
+        method, url, options = build_request(operation, {"keyid": keyid, "rapportCampagne": "1",
+                                                         "date_deb": date_deb, "date_fin": date_fin}, config)
+        try:
+            response = await async_download(method, url, str(path), **options)
+        except Exception as e:
+            await run_blocking(_remove, path)
+            errors.append({"date_deb": date_deb, "date_fin": date_fin, "error": request_error(e, operation)})
+        else:
+            if response.status_code >= 400:
+                errors.append({"date_deb": date_deb, "date_fin": date_fin,
+                               "error": http_error(response, operation)})
+            else:
+                size = (await run_blocking(path.stat)).st_size
+                files.append({"path": str(path), "date_deb": date_deb, "date_fin": date_fin,
+                              "bytes": size})
+        if on_progress is not None:
+            on_progress(1)
+    return {"files": files, "errors": errors}
+
+
+def _remove(path: Path) -> None:
+    if path.exists():
+        path.unlink()
+
+
+def register_job_tools(mcp, operations: List[Operation], tools: Dict[str, Callable]) -> Dict[str, Callable]:
+    """Register the job tools on a FastMCP server.
+
+    start_bulk_send takes the arguments of the post_sms_batch tool of
+    `tools`; start_report_export uses the get_campagne operation.
+
+    :return: dict of tool name -> tool function.
+    """
+    manager = get_job_manager()
+    by_name = {operation.name: operation for operation in operations}
+    registered = {}
+
+    smsmulti = by_name.get("post_smsmulti")
+    if smsmulti is not None and "post_sms_batch" in tools:
+        async def start_bulk_send(**arguments) -> str:
+            """Start sending SMS to a list of recipients in the background and return the job id.
+
+            Follow it with job_status and get its summary with job_result.
+            """
+            error = check_batch(arguments)
+            if error:
+                return error
+            job = manager.submit("bulk_send", lambda job: run_batch(smsmulti, arguments, on_progress=job.advance),
+                                 total=len(arguments["recipients"]))
+            return json.dumps(job.to_dict())
+
+        start_bulk_send.__signature__ = inspect.signature(tools["post_sms_batch"])
+        mcp.add_tool(start_bulk_send)
+        registered["start_bulk_send"] = start_bulk_send
+
+    campagne = by_name.get("get_campagne")
+    if campagne is not None:
+        async def start_report_export(
+            keyid: Annotated[str, Field(description="Clé API")],
+            date_deb: Annotated[str, Field(description="date de debut au format YYYY-MM-DD hh:mm")],
+            date_fin: Annotated[str, Field(description="date de fin au format YYYY-MM-DD hh:mm")],
+        ) -> str:
+            """Start downloading the campaign reports of a period, month by month, in the background and return the job id.
+
+            The result lists the zip files written on the server.
+            """
+            if not is_configured(get_config()):
+                return MISSING_CONFIG
+            try:
+                windows = month_windows(date_deb, date_fin)
+            except ValueError as e:
+                return f"Error: Invalid date, expected YYYY-MM-DD hh:mm - {str(e)}"
+            if not windows:
+                return "Error: date_fin must be after date_deb"
+
+            def run(job):
+                job.directory = EXPORT_DIR / job.id
+                return export_report(campagne, keyid, windows, job.directory, on_progress=job.advance)
+
+            job = manager.submit("report_export", run, total=len(windows))
+            return json.dumps(job.to_dict())
+
+        mcp.add_tool(start_report_export)
+        registered["start_report_export"] = start_report_export
+
+    async def job_status(
+        job_id: Annotated[str, Field(description="Identifiant du job")],
+        wait: Annotated[float, Field(description=f"Secondes à attendre la fin du job, au plus {MAX_WAIT:g}")] = 0,
+        ctx: Context = None,
+    ) -> str:
+        """Get the status and progress of a job, waiting up to `wait` seconds for it to finish."""
+        job = manager.get(job_id)
+        if job is None:
+            return f"Error: Unknown job {job_id}"
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + min(max(wait, 0), MAX_WAIT)
+        while not job.done and loop.time() < deadline:
+            if ctx is not None:
+                await ctx.report_progress(job.progress, job.total)
+            await job.wait_change(deadline - loop.time())
+        if ctx is not None and wait:
+            await ctx.report_progress(job.progress, job.total)
+        return json.dumps(job.to_dict())
+
+    async def job_result(job_id: Annotated[str, Field(description="Identifiant du job")]) -> str:
+        """Get the result of a finished job."""
+        job = manager.get(job_id)
+        if job is None:
+            return f"Error: Unknown job {job_id}"
+        if job.status == "failed":
+            return f"Job failed: {job.error}"
+        if not job.done:
+            return json.dumps(job.to_dict())
+        return json.dumps(job.result, ensure_ascii=False)
+
+    for tool in (job_status, job_result):
+        mcp.add_tool(tool)
+        registered[tool.__name__] = tool
+    return registered
@@ -1,81 +1,271 @@
 """
-MCP tool for No description available
+MCP tool registry generated from the OpenAPI specification
+
+Each operation of openapi.yaml is compiled once into a request builder
+(method, path, query parameters, JSON body fields) and registered as an
+MCP tool named after its method and path, e.g. post_sms or get_credit.
+The compiled form is cached on disk under the hash of the specification,
+so the YAML is only parsed when it changes. Every tool call goes through
+`call_operation`.
 """
 
+import asyncio
+import hashlib
+import inspect
 import json
-import requests
-from typing import Dict, Any, Optional
+import os
+import tempfile
+from pathlib import Path
+from typing import Annotated, Any, Callable, Dict, List, Optional, Tuple, Union
 
+import aiohttp
+from pydantic import Field
 
-def get_all() -> str:
-    """
-    No description available
-    """
+from config.config import get_config
+from session import AsyncResponse, async_request
+
+SPEC_PATH = Path(os.getenv("API_SPEC_PATH", Path(__file__).resolve().parents[2] / "openapi.yaml"))
+CACHE_DIR = Path(os.getenv("API_REGISTRY_CACHE_DIR", Path.home() / ".cache" / "isendpro-mcp"))
+
+# bump when the compiled form changes, to invalidate the caches
+COMPILER_VERSION = "1"
+
+METHODS = ("get", "post", "put", "delete", "patch")
+TYPES = {"string": str, "integer": int, "number": float, "boolean": bool, "object": dict}
+
+MISSING_CONFIG = ("Error: Missing API configuration. "
+                  "Please set API_BASE_URL and API_BEARER_TOKEN environment variables.")
+
+# enums listed in the parameter descriptions up to this size
+MAX_LISTED_ENUM = 10
+
+# prefixes of the HTTP errors and of the failed requests, as the hand-written
+# tools reported them for operations with a JSON body and for the others
+BODY_ERRORS = ("Failed to read response body", "Failed to create request")
+QUERY_ERRORS = ("Failed to format JSON", "Request failed")
+
+
+class Operation:
+    """Compiled request builder of one API operation."""
+
+    __slots__ = ("name", "method", "path", "summary", "fields", "query", "body")
+
+    def __init__(self, name: str, method: str, path: str, summary: str, fields: List[dict]):
+        self.name = name
+        self.method = method
+        self.path = path
+        self.summary = summary
+        self.fields = fields
+        self.query = [(field["name"], field["wire"]) for field in fields if field["in"] == "query"]
+        self.body = [(field["name"], field["wire"]) for field in fields if field["in"] == "body"]
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Operation":
+        return cls(data["name"], data["method"], data["path"], data["summary"], data["fields"])
+
+    def to_dict(self) -> dict:
+        return {"name": self.name, "method": self.method, "path": self.path,
+                "summary": self.summary, "fields": self.fields}
+
+
+def _resolve(spec: dict, schema: dict) -> dict:
+    while "$ref" in schema:
+        node = spec
+        for part in schema["$ref"].lstrip("#/").split("/"):
+            node = node[part]
+        schema = node
+    return schema
+
+
+def _field(name: str, location: str, schema: dict, required: bool, description: str) -> dict:
+    enum = schema.get("enum") or []
+    if enum and len(enum) <= MAX_LISTED_ENUM:
+        description = f"{description} (one of: {', '.join(repr(value) for value in enum)})".strip()
+    field = {
+        "name": name if name.isidentifier() else "_".join(name.split("-")),
+        "wire": name,
+        "in": location,
+        "type": schema.get("type", "string"),
+        "items": (schema.get("items") or {}).get("type", "string"),
+        "required": required,
+        "default": None,
+        "description": description or "",
+    }
+    if required and len(enum) == 1:
+        # constant parameters, e.g. getHLR="1", are filled in
+        field["required"] = False
+        field["default"] = enum[0]
+    return field
+
+
+def compile_spec(spec: dict) -> List[Operation]:
+    """Compile the operations of a parsed OpenAPI 3 specification."""
+    operations = []
+    for path, item in spec.get("paths", {}).items():
+        for method in METHODS:
+            operation = item.get(method)
+            if operation is None:
+                continue
+            fields = []
+            for parameter in operation.get("parameters", []):
+                parameter = _resolve(spec, parameter)
+                if parameter.get("in") != "query":
+                    continue
+                fields.append(_field(parameter["name"], "query",
+                                     _resolve(spec, parameter.get("schema", {})),
+                                     parameter.get("required", False),
+                                     parameter.get("description", "")))
+            content = (operation.get("requestBody") or {}).get("content", {})
+            schema = _resolve(spec, (content.get("application/json") or {}).get("schema", {}))
+            required = set(schema.get("required", []))
+            for name, prop in schema.get("properties", {}).items():
+                prop = _resolve(spec, prop)
+                fields.append(_field(name, "body", prop, name in required,
+                                     prop.get("description", "")))
+            name = f"{method}_{path.strip('/').replace('/', '_').replace('{', '').replace('}', '')}"
+            operations.append(Operation(name, method.upper(), path,
+                                        operation.get("summary") or operation.get("description") or name,
+                                        fields))
+    return operations
+
+
+def load_operations(spec_path: Path = SPEC_PATH, cache_dir: Path = CACHE_DIR) -> List[Operation]:
+    """Load the compiled operations of a specification, from the cache when fresh."""
+    content = spec_path.read_bytes()
+    digest = hashlib.sha256(content + COMPILER_VERSION.encode()).hexdigest()
+    cache_path = cache_dir / f"registry-{digest[:32]}.json"
     try:
-        # Get configuration
-        config = get_config()
-        
-        if not config.base_url or not config.bearer_token:
-            return "Error: Missing API configuration. Please set API_BASE_URL and API_BEARER_TOKEN environment variables."
-        
-        # Build request parameters
-        params = {}
+        with open(cache_path, "r", encoding="utf-8") as f:
+            return [Operation.from_dict(data) for data in json.load(f)]
+    except (OSError, ValueError, KeyError):
         pass
-        
-        # Make API call
-        url = f"{config.base_url}/api/unknown"
-        
-        headers = {
-            "Authorization": f"Bearer {config.bearer_token}",
-            "Accept": "application/json",
-            "Content-Type": "application/json"
-        }
-        
-        response = requests.get(url, headers=headers, params=params)
-        
-        # Handle HTTP errors
-        if response.status_code >= 400:
-            try:
-                error_data = response.json()
-                return f"API error: {json.dumps(error_data, indent=2)}"
-            except json.JSONDecodeError:
-                return f"API error: {response.text}"
-        
-        # Parse response
-        try:
-            result = response.json()
-            return json.dumps(result, indent=2)
-        except json.JSONDecodeError:
-            # Fallback to raw text if JSON parsing fails
-            return response.text
-            
-    except requests.exceptions.ConnectionError as e:
-        return f"Request failed: Connection error - {str(e)}"
-    except requests.exceptions.Timeout as e:
-        return f"Request failed: Request timeout - {str(e)}"
-    except requests.exceptions.RequestException as e:
-        return f"Request failed: {str(e)}"
+
+    import yaml
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    operations = compile_spec(yaml.load(content, Loader=loader))
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump([operation.to_dict() for operation in operations], f)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        pass
+    return operations
+
+
+def error_prefixes(operation: Operation) -> Tuple[str, str]:
+    """Get the prefixes of the HTTP errors and of the failed requests of an operation."""
+    return BODY_ERRORS if operation.body else QUERY_ERRORS
+
+
+def format_response(response, operation: Operation) -> str:
+    """Format an API response as the tool of `operation` returns it."""
+    if response.status_code >= 400:
+        return http_error(response, operation)
+    try:
+        return json.dumps(response.json(), indent=2)
+    except json.JSONDecodeError:
+        # Fallback to raw text if JSON parsing fails
+        return response.text
+
+
+def is_configured(config) -> bool:
+    return bool(config.base_url and config.bearer_token)
+
+
+def http_error(response, operation: Operation) -> str:
+    """Message of an HTTP error response of an operation."""
+    prefix, _ = error_prefixes(operation)
+    try:
+        return f"{prefix}: {json.dumps(response.json(), indent=2)}"
+    except json.JSONDecodeError:
+        return f"{prefix}: {response.text}"
+
+
+def request_error(e: Exception, operation: Operation) -> str:
+    """Message of a request of an operation that failed before getting a response."""
+    _, prefix = error_prefixes(operation)
+    if isinstance(e, asyncio.TimeoutError):
+        return f"{prefix}: Request timeout - {str(e)}"
+    if isinstance(e, aiohttp.ClientConnectionError):
+        return f"{prefix}: Connection error - {str(e)}"
+    if isinstance(e, aiohttp.ClientError):
+        return f"{prefix}: {str(e)}"
+    return f"Unexpected error: {str(e)}"
+
+
+def build_request(operation: Operation, arguments: Dict[str, Any], config) -> Tuple[str, str, Dict[str, Any]]:
+    """Build the method, URL and request options of an operation call."""
+    params = {wire: arguments[name] for name, wire in operation.query
+              if arguments.get(name) is not None}
+    body = None
+    if operation.body:
+        body = {wire: arguments[name] for name, wire in operation.body
+                if arguments.get(name) is not None}
+    headers = {
+        "Authorization": f"Bearer {config.bearer_token}",
+        "Accept": "application/json",
+    }
+    return operation.method, config.base_url + operation.path, {"headers": headers, "params": params, "json": body}
+
+
+async def send_operation(operation: Operation, arguments: Dict[str, Any], config) -> AsyncResponse:
+    """Send the request of an operation with the shared async client."""
+    method, url, options = build_request(operation, arguments, config)
+    return await async_request(method, url, **options)
+
+
+async def call_operation(operation: Operation, arguments: Dict[str, Any]) -> str:
+    """Send the request of an operation and format its response."""
+    config = get_config()
+    if not is_configured(config):
+        return MISSING_CONFIG
+    try:
+        response = await send_operation(operation, arguments, config)
     except Exception as e:
-        return f"Unexpected error: {str(e)}"
-
-
-def get_config():
-    """Get configuration from environment or config file."""
-    import os
-    from pathlib import Path
-    
-    class Config:
-        def __init__(self):
-            self.base_url = os.getenv("API_BASE_URL")
-            self.bearer_token = os.getenv("API_BEARER_TOKEN")
-            
-            # Try to load from config file if env vars not set
-            if not self.base_url or not self.bearer_token:
-                config_path = Path.home() / ".api" / "config.json"
-                if config_path.exists():
-                    with open(config_path, 'r') as f:
-                        config_data = json.load(f)
-                        self.base_url = self.base_url or config_data.get("baseURL")
-                        self.bearer_token = self.bearer_token or config_data.get("bearerToken")
-    
-    return Config()
+        return request_error(e, operation)
+    return format_response(response, operation)
+
+
+def _annotation(field: dict):
+    kind = TYPES.get(field["type"], str)
+    if field["type"] == "array":
+        # a single string, as the hand-written tools took, is still accepted
+        kind = Union[str, List[TYPES.get(field["items"], str)]]
+    if not field["required"]:
+        kind = Optional[kind]
+    return Annotated[kind, Field(description=field["description"])]
+
+
+def make_tool(operation: Operation) -> Callable:
+    """Make the tool function of an operation, with its typed signature."""
+    defaults = {field["name"]: field["default"] for field in operation.fields
+                if field["default"] is not None}
+
+    async def tool(**arguments) -> str:
+        return await call_operation(operation, {**defaults, **arguments})
+
+    tool.__name__ = operation.name
+    tool.__qualname__ = operation.name
+    tool.__doc__ = operation.summary
+    tool.__signature__ = inspect.Signature(
+        [inspect.Parameter(field["name"], inspect.Parameter.KEYWORD_ONLY,
+                           annotation=_annotation(field),
+                           default=inspect.Parameter.empty if field["required"] else field["default"])
+         for field in operation.fields],
+        return_annotation=str)
+    return tool
+
+
+def register_tools(mcp, operations: Optional[List[Operation]] = None) -> Dict[str, Callable]:
+    """Register a tool per operation on a FastMCP server.
+
+    :return: dict of tool name -> tool function.
+    """
+    tools = {}
+    for operation in operations if operations is not None else load_operations():
+        tool = make_tool(operation)
+        mcp.add_tool(tool, name=operation.name, description=operation.summary)
+        tools[operation.name] = tool
+    return tools
@@ -0,0 +1,181 @@
+"""
+Shared HTTP session of the MCP server tools
+"""
+
+import asyncio
+import functools
+import json
+import os
+import threading
+from typing import Dict, Optional, Tuple
+
+import aiohttp
+import requests
+from requests.adapters import HTTPAdapter
+
+_session: Optional[requests.Session] = None
+# event loop -> its async client and the task closing it at shutdown
+_async_clients: Dict[asyncio.AbstractEventLoop, Tuple[aiohttp.ClientSession, asyncio.Task]] = {}
+_lock = threading.Lock()
+
+
+class TimeoutHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter applying default (connect, read) timeouts to every request."""
+
+    def __init__(self, timeout, **kwargs):
+        self.timeout = timeout
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = self.timeout
+        return super().send(request, **kwargs)
+
+
+def get_session_settings() -> dict:
+    """Get the pool size and timeouts of the session from the environment."""
+    return {
+        "pool_size": int(os.getenv("API_POOL_SIZE", "10")),
+        "pool_block": os.getenv("API_POOL_BLOCK", "false").lower() in ("1", "true", "yes"),
+        "connect_timeout": float(os.getenv("API_CONNECT_TIMEOUT", "5")),
+        "read_timeout": float(os.getenv("API_READ_TIMEOUT", "30")),
+    }
+
+
+def create_session(pool_size: int = 10, pool_block: bool = False,
+                   connect_timeout: float = 5.0, read_timeout: float = 30.0) -> requests.Session:
+    """Create a session keeping up to `pool_size` connections alive per host."""
+    session = requests.Session()
+    adapter = TimeoutHTTPAdapter(timeout=(connect_timeout, read_timeout),
+                                 pool_connections=pool_size, pool_maxsize=pool_size,
+                                 pool_block=pool_block)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def get_session() -> requests.Session:
+    """Get the blocking session shared by the callers, created on first use.
+
+    The tools use `get_async_client`; this session serves blocking code,
+    such as the baseline of benchmarks/bench_post_sms.py. Connections are kept alive between tool calls, so only the first call
+    to a host pays for the TCP and TLS handshakes. Settings come from
+    API_POOL_SIZE, API_POOL_BLOCK, API_CONNECT_TIMEOUT and API_READ_TIMEOUT.
+    """
+    global _session
+    if _session is None:
+        with _lock:
+            if _session is None:
+                _session = create_session(**get_session_settings())
+    return _session
+
+
+def close_session() -> None:
+    """Close the shared session and its connections."""
+    global _session
+    with _lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+
+
+class AsyncResponse:
+    """Response of `async_request`, read in full, with the requests API."""
+
+    def __init__(self, status_code: int, content: bytes, encoding: Optional[str]):
+        self.status_code = status_code
+        self.content = content
+        self.encoding = encoding or "utf-8"
+
+    @property
+    def text(self) -> str:
+        return self.content.decode(self.encoding, errors="replace")
+
+    def json(self):
+        return json.loads(self.content)
+
+
+def create_async_client(pool_size: int = 10, connect_timeout: float = 5.0,
+                        read_timeout: float = 30.0) -> aiohttp.ClientSession:
+    """Create an async client keeping its connections alive.
+
+    At most `pool_size` requests run at once per host, the others wait for
+    a free connection: aiohttp has no extra connections closed after use.
+    """
+    connector = aiohttp.TCPConnector(limit=0, limit_per_host=pool_size)
+    timeout = aiohttp.ClientTimeout(sock_connect=connect_timeout, sock_read=read_timeout)
+    return aiohttp.ClientSession(connector=connector, timeout=timeout)
+
+
+def get_async_client() -> aiohttp.ClientSession:
+    """Get the async client shared by the tools of the running event loop.
+
+    It serves any number of concurrent tool calls from the event loop of
+    the server, without a thread per call. Settings are the ones of
+    `get_session`, except API_POOL_BLOCK: the pool always blocks. Each
+    event loop gets its own client, closed when the loop shuts down
+    (asyncio.run and anyio.run cancel the pending tasks before closing the
+    loop) or by `close_async_client`.
+    """
+    loop = asyncio.get_running_loop()
+    entry = _async_clients.get(loop)
+    if entry is not None and not entry[0].closed:
+        return entry[0]
+    settings = get_session_settings()
+    del settings["pool_block"]
+    client = create_async_client(**settings)
+    task = loop.create_task(_close_at_shutdown(client))
+    with _lock:
+        for old in [old for old in _async_clients if old.is_closed()]:
+            del _async_clients[old]
+        _async_clients[loop] = (client, task)
+    return client
+
+
+async def _close_at_shutdown(client: aiohttp.ClientSession) -> None:
+    try:
+        await asyncio.get_running_loop().create_future()
+    finally:
+        await client.close()
+
+
+async def async_request(method: str, url: str, **kwargs) -> AsyncResponse:
+    """Send a request with the shared async client and read its response."""
+    async with get_async_client().request(method, url, **kwargs) as response:
+        content = await response.read()
+        return AsyncResponse(response.status, content, response.charset)
+
+
+async def run_blocking(func, *args, **kwargs):
+    """Run a blocking call, such as file I/O, on the default executor of the loop."""
+    return await asyncio.get_running_loop().run_in_executor(None, functools.partial(func, *args, **kwargs))
+
+
+async def async_download(method: str, url: str, path: str, chunk_size: int = 64 * 1024,
+                         **kwargs) -> AsyncResponse:
+    """Send a request and stream the body of a successful response to `path`.
+
+    The content of the returned response is empty unless the request
+    failed, so large files are never held in memory. The file is written
+    off the event loop.
+    """
+    async with get_async_client().request(method, url, **kwargs) as response:
+        if response.status >= 400:
+            return AsyncResponse(response.status, await response.read(), response.charset)
+        f = await run_blocking(open, path, "wb")
+        try:
+            async for chunk in response.content.iter_chunked(chunk_size):
+                await run_blocking(f.write, chunk)
+        finally:
+            await run_blocking(f.close)
+        return AsyncResponse(response.status, b"", response.charset)
+
+
+async def close_async_client() -> None:
+    """Close the async client of the running event loop and its connections."""
+    with _lock:
+        entry = _async_clients.pop(asyncio.get_running_loop(), None)
+    if entry is not None:
+        client, task = entry
+        task.cancel()
+        await client.close()
@@ -0,0 +1,83 @@
+"""
+Local API stub shared by the tests
+"""
+
+import inspect
+import logging
+import os
+import unittest
+from typing import Any, Callable, List, Optional
+
+from aiohttp import web
+
+from config.config import reload_config
+from session import close_async_client
+
+# the test loops run in debug mode, which logs every server start and slow step
+logging.getLogger("asyncio").setLevel(logging.ERROR)
+
+
+class ApiStub:
+    """HTTP server answering every request with `answer(request, body)`.
+
+    The requests are recorded in `requests`, and `max_active` is the
+    largest number of requests served at once.
+    """
+
+    def __init__(self, answer: Optional[Callable[[web.Request, Any], Any]] = None):
+        self.answer = answer or (lambda request, body: web.json_response({"etat": {}}))
+        self.requests: List[dict] = []
+        self.active = 0
+        self.max_active = 0
+        self.url = None
+        self._runner = None
+
+    async def start(self) -> str:
+        app = web.Application()
+        app.router.add_route("*", "/{path:.*}", self._handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, "127.0.0.1", 0).start()
+        self.url = f"http://127.0.0.1:{self._runner.addresses[0][1]}"
+        return self.url
+
+    async def stop(self) -> None:
+        await self._runner.cleanup()
+
+    async def _handle(self, request: web.Request) -> web.StreamResponse:
+        body = await request.json() if request.can_read_body else None
+        self.requests.append({"method": request.method, "path": request.path,
+                              "query": dict(request.query), "json": body})
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            response = self.answer(request, body)
+            if inspect.isawaitable(response):
+                response = await response
+            return response
+        finally:
+            self.active -= 1
+
+
+class StubTestCase(unittest.IsolatedAsyncioTestCase):
+    """Test case with the API configuration pointing to a started `ApiStub`."""
+
+    def answer(self, request: web.Request, body: Any) -> Any:
+        return web.json_response({"etat": {}})
+
+    async def asyncSetUp(self):
+        self.stub = ApiStub(self.answer)
+        environ = {"API_BASE_URL": await self.stub.start(), "API_BEARER_TOKEN": "token"}
+        self.saved_environ = {name: os.environ.get(name) for name in environ}
+        os.environ.update(environ)
+        reload_config()
+
+    async def asyncTearDown(self):
+        await close_async_client()
+        await self.stub.stop()
+        for name, value in self.saved_environ.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+        reload_config()
@@ -0,0 +1,106 @@
+"""
+Tests of the post_sms_batch fan-out to /smsmulti
+"""
+
+import asyncio
+import json
+import unittest
+
+from aiohttp import web
+from mcp.server.fastmcp import FastMCP
+
+from batch import Recipient, chunk_arguments, entries, register_batch_tools, send_batch
+from registry import SPEC_PATH, load_operations
+
+from .stub import StubTestCase
+
+
+def smsmulti():
+    return next(operation for operation in load_operations(SPEC_PATH) if operation.name == "post_smsmulti")
+
+
+class TestChunkArguments(unittest.TestCase):
+
+    def test_common_message_is_sent_once(self):
+        chunk = [Recipient(num="0680000001"), Recipient(num="0680000002", sms="a")]
+        arguments = chunk_arguments(chunk, "a", {"keyid": "k"})
+        self.assertEqual(arguments, {"keyid": "k", "num": ["0680000001", "0680000002"], "sms": ["a"]})
+
+    def test_own_messages_and_trackers(self):
+        chunk = [Recipient(num="0680000001", sms="a", tracker="t1"), Recipient(num="0680000002")]
+        arguments = chunk_arguments(chunk, "b", {})
+        self.assertEqual(arguments["sms"], ["a", "b"])
+        self.assertEqual(arguments["tracker"], ["t1", ""])
+
+    def test_entries(self):
+        entry = {"code": 0, "tel": "33680000001"}
+        self.assertEqual(entries({"etat": {"etat": [entry, "junk"]}}), [entry])
+        self.assertEqual(entries({"etat": {"etat": entry}}), [entry])
+        self.assertEqual(entries({"etat": [entry]}), [entry])
+        self.assertEqual(entries([]), [])
+
+
+class TestSendBatch(StubTestCase):
+
+    async def answer(self, request, body):
+        await asyncio.sleep(0.01)
+        if self.fail and body["num"][0] == self.fail:
+            return web.json_response({"erreur": "boom"}, status=500)
+        # code 8 for the numbers ending with 9, one entry per number
+        return web.json_response({"etat": {"etat": [
+            {"code": 8 if num.endswith("9") else 0, "tel": num, "message": "Numero invalide" if num.endswith("9") else "OK"}
+            for num in body["num"]]}})
+
+    async def asyncSetUp(self):
+        self.fail = None
+        await super().asyncSetUp()
+
+    async def test_chunks_are_sent_concurrently_within_the_limit(self):
+        recipients = [Recipient(num="068%07d" % i) for i in range(1050)]
+        progress = []
+        summary = await send_batch(smsmulti(), recipients, "a", {"keyid": "k"}, batch_size=100,
+                                   concurrency=3, on_progress=progress.append)
+
+        self.assertEqual(len(self.stub.requests), 11)
+        self.assertLessEqual(self.stub.max_active, 3)
+        self.assertGreater(self.stub.max_active, 1)
+        sent = [num for request in self.stub.requests for num in request["json"]["num"]]
+        self.assertEqual(sorted(sent), [recipient.num for recipient in recipients])
+        self.assertTrue(all(request["json"]["keyid"] == "k" and request["json"]["sms"] == ["a"]
+                            for request in self.stub.requests))
+        self.assertEqual(sorted(progress), [50] + [100] * 10)
+
+        self.assertEqual((summary["recipients"], summary["requests"]), (1050, 11))
+        self.assertEqual(summary["counts"], {"0": 945, "8": 105})
+        self.assertEqual(len(summary["failures"]), 100)
+        self.assertEqual(summary["failures_omitted"], 5)
+        self.assertEqual(summary["failures"][0], {"num": "0680000009", "code": "8", "message": "Numero invalide"})
+
+    async def test_failed_requests_count_all_their_recipients(self):
+        self.fail = "0680000010"
+        recipients = [Recipient(num="068%07d" % i, tracker="t%d" % i) for i in range(20)]
+        summary = await send_batch(smsmulti(), recipients, "a", batch_size=10)
+
+        self.assertEqual(summary["counts"], {"0": 9, "8": 1, "error": 10})
+        errors = [failure for failure in summary["failures"] if "error" in failure]
+        self.assertEqual(len(errors), 1)
+        self.assertTrue(errors[0]["error"].startswith("Failed to read response body: "))
+        self.assertEqual(errors[0]["num"], [recipient.num for recipient in recipients[10:]])
+        self.assertIn({"num": "0680000009", "code": "8", "message": "Numero invalide", "tracker": "t9"},
+                      summary["failures"])
+
+    async def test_tool(self):
+        mcp = FastMCP("test")
+        tool = register_batch_tools(mcp, load_operations(SPEC_PATH))["post_sms_batch"]
+        recipients = [Recipient(num="0680000001", sms="a"), Recipient(num="0680000002")]
+        self.assertEqual(await tool(keyid="k", recipients=recipients),
+                         "Error: No message for 1 recipients, e.g. 0680000002. Set sms or their own sms.")
+        summary = json.loads(await tool(keyid="k", recipients=recipients, sms="b", emetteur="iSendPro"))
+        self.assertEqual(summary["counts"], {"0": 2})
+        self.assertEqual(self.stub.requests[0]["json"],
+                         {"keyid": "k", "num": ["0680000001", "0680000002"], "sms": ["a", "b"],
+                          "emetteur": "iSendPro"})
+
+
+if __name__ == "__main__":
+    unittest.main()
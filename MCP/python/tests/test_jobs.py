@@ -0,0 +1,187 @@
+"""
+Tests of the background jobs
+"""
+
+import asyncio
+import json
+import shutil
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from pathlib import Path
+from unittest import mock
+
+from aiohttp import web
+from mcp.server.fastmcp import FastMCP
+from mcp.shared.memory import create_connected_server_and_client_session
+
+import jobs
+from batch import register_batch_tools
+from jobs import DATE_FORMAT, JobManager, export_report, month_windows, register_job_tools
+from registry import SPEC_PATH, load_operations, register_tools
+
+from .stub import StubTestCase
+
+
+class TestMonthWindows(unittest.TestCase):
+
+    def test_windows_do_not_overlap(self):
+        windows = month_windows("2024-01-15 10:00", "2024-03-10 00:00")
+        self.assertEqual(windows, [("2024-01-15 10:00", "2024-01-31 23:59"),
+                                   ("2024-02-01 00:00", "2024-02-29 23:59"),
+                                   ("2024-03-01 00:00", "2024-03-10 00:00")])
+        for (_, end), (start, _) in zip(windows, windows[1:]):
+            self.assertEqual(datetime.strptime(start, DATE_FORMAT) - datetime.strptime(end, DATE_FORMAT),
+                             timedelta(minutes=1))
+
+    def test_period_ending_on_a_month_boundary(self):
+        self.assertEqual(month_windows("2024-01-15 10:00", "2024-02-01 00:00"),
+                         [("2024-01-15 10:00", "2024-02-01 00:00")])
+        self.assertEqual(month_windows("2024-12-01 00:00", "2025-01-01 00:01"),
+                         [("2024-12-01 00:00", "2024-12-31 23:59"), ("2025-01-01 00:00", "2025-01-01 00:01")])
+
+    def test_empty_period(self):
+        self.assertEqual(month_windows("2024-01-15 10:00", "2024-01-15 10:00"), [])
+        with self.assertRaises(ValueError):
+            month_windows("2024-01-15", "2024-02-15")
+
+
+class TestJobManager(unittest.IsolatedAsyncioTestCase):
+
+    async def test_jobs_run_on_a_bounded_pool(self):
+        manager = JobManager(workers=2)
+        release = asyncio.Event()
+
+        async def run(job):
+            job.advance()
+            await release.wait()
+            job.advance()
+            return job.id
+
+        submitted = [manager.submit("test", run, total=2) for _ in range(3)]
+        self.assertEqual([job.status for job in submitted], ["queued"] * 3)
+        await asyncio.sleep(0.01)
+        self.assertEqual([(job.status, job.progress) for job in submitted],
+                         [("running", 1), ("running", 1), ("queued", 0)])
+
+        release.set()
+        await asyncio.wait_for(asyncio.gather(*[self.wait_done(job) for job in submitted]), 1)
+        self.assertEqual([(job.status, job.progress, job.result) for job in submitted],
+                         [("done", 2, job.id) for job in submitted])
+
+    async def test_failed_job(self):
+        async def run(job):
+            raise ValueError("boom")
+
+        job = JobManager().submit("test", run)
+        await asyncio.wait_for(self.wait_done(job), 1)
+        self.assertEqual((job.status, job.error), ("failed", "boom"))
+
+    async def test_finished_jobs_expire(self):
+        async def run(job):
+            return None
+
+        manager = JobManager(ttl=0)
+        job = manager.submit("test", run)
+        await asyncio.wait_for(self.wait_done(job), 1)
+        self.assertIs(manager.get(job.id), job)
+        manager.submit("test", run)
+        self.assertIsNone(manager.get(job.id))
+
+    async def test_expired_jobs_delete_their_files(self):
+        tmp = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, tmp, ignore_errors=True)
+
+        async def run(job):
+            job.directory = tmp / job.id
+            job.directory.mkdir()
+            (job.directory / "report.zip").write_bytes(b"PK")
+
+        manager = JobManager(ttl=0)
+        job = manager.submit("test", run)
+        await asyncio.wait_for(self.wait_done(job), 1)
+        self.assertTrue((tmp / job.id / "report.zip").exists())
+        manager.submit("test", run)
+        for _ in range(100):
+            if not (tmp / job.id).exists():
+                break
+            await asyncio.sleep(0.01)
+        self.assertFalse((tmp / job.id).exists())
+
+    @staticmethod
+    async def wait_done(job):
+        while not job.done:
+            await job.wait_change(1)
+
+
+class TestReportExport(StubTestCase):
+
+    async def answer(self, request, body):
+        await asyncio.sleep(0.02)
+        if request.query["date_deb"].startswith("2024-02"):
+            return web.json_response({"etat": {"code": 1}}, status=500)
+        return web.Response(body=b"PK" + request.query["date_deb"].encode(), content_type="application/zip")
+
+    async def asyncSetUp(self):
+        await super().asyncSetUp()
+        self.tmp = Path(tempfile.mkdtemp())
+        operations = load_operations(SPEC_PATH)
+        self.campagne = next(operation for operation in operations if operation.name == "get_campagne")
+        self.mcp = FastMCP("test")
+        tools = register_tools(self.mcp, operations)
+        tools.update(register_batch_tools(self.mcp, operations))
+        self.tools = register_job_tools(self.mcp, operations, tools)
+
+    async def asyncTearDown(self):
+        shutil.rmtree(self.tmp)
+        await super().asyncTearDown()
+
+    async def test_export_report(self):
+        windows = month_windows("2024-01-15 10:00", "2024-03-10 00:00")
+        progress = []
+        result = await export_report(self.campagne, "k", windows, self.tmp / "job", on_progress=progress.append)
+
+        self.assertEqual(progress, [1, 1, 1])
+        self.assertEqual([(request["query"]["date_deb"], request["query"]["date_fin"]) for request in self.stub.requests],
+                         windows)
+        self.assertEqual([(file["date_deb"], file["date_fin"], file["bytes"]) for file in result["files"]],
+                         [("2024-01-15 10:00", "2024-01-31 23:59", 18), ("2024-03-01 00:00", "2024-03-10 00:00", 18)])
+        self.assertEqual(Path(result["files"][0]["path"]).read_bytes(), b"PK2024-01-15 10:00")
+        error, = result["errors"]
+        self.assertEqual(error["date_deb"], "2024-02-01 00:00")
+        self.assertTrue(error["error"].startswith("Failed to format JSON: "), error)
+        self.assertEqual(sorted(path.name for path in (self.tmp / "job").iterdir()),
+                         ["campagne-2024-01-15-2024-01-31.zip", "campagne-2024-03-01-2024-03-10.zip"])
+
+    async def test_job_status_reports_progress(self):
+        progress = []
+
+        async def on_progress(value, total, message):
+            progress.append((value, total))
+
+        with mock.patch.object(jobs, "EXPORT_DIR", self.tmp):
+            async with create_connected_server_and_client_session(self.mcp._mcp_server) as client:
+                started = await client.call_tool("start_report_export", {
+                    "keyid": "k", "date_deb": "2024-03-15 00:00", "date_fin": "2024-06-01 00:00"})
+                job = json.loads(started.content[0].text)
+                self.assertEqual((job["kind"], job["total"]), ("report_export", 3))
+
+                status = await client.call_tool("job_status", {"job_id": job["job_id"], "wait": 10},
+                                                progress_callback=on_progress)
+                status = json.loads(status.content[0].text)
+                self.assertEqual((status["status"], status["progress"]), ("done", 3))
+                self.assertEqual(progress[-1], (3, 3))
+                self.assertEqual([value for value, _ in progress], sorted(value for value, _ in progress))
+
+                result = await client.call_tool("job_result", {"job_id": job["job_id"]})
+                result = json.loads(result.content[0].text)
+                self.assertEqual([file["date_fin"] for file in result["files"]],
+                                 ["2024-03-31 23:59", "2024-04-30 23:59", "2024-06-01 00:00"])
+
+    async def test_unknown_job(self):
+        self.assertEqual(await self.tools["job_status"](job_id="nope"), "Error: Unknown job nope")
+        self.assertEqual(await self.tools["job_result"](job_id="nope"), "Error: Unknown job nope")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,147 @@
+"""
+Tests of the tools generated from openapi.yaml
+"""
+
+import asyncio
+import json
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from aiohttp import web
+from mcp.server.fastmcp import FastMCP
+
+import registry
+from registry import SPEC_PATH, load_operations, register_tools
+
+from .stub import StubTestCase
+
+SPEC = """
+openapi: 3.0.0
+paths:
+  /credit:
+    get:
+      summary: Credit
+      parameters:
+        - {in: query, name: keyid, required: true, schema: {type: string}}
+"""
+
+
+class TestCompile(unittest.TestCase):
+
+    def setUp(self):
+        self.operations = {operation.name: operation for operation in load_operations(SPEC_PATH)}
+
+    def test_one_tool_per_operation(self):
+        self.assertEqual(sorted(self.operations), [
+            "get_campagne", "get_credit", "post_comptage", "post_dellistenoire", "post_getlistenoire",
+            "post_hlr", "post_repertoire", "post_setlistenoire", "post_shortlink", "post_sms",
+            "post_smsmulti", "post_subaccount", "put_repertoire", "put_subaccount"])
+
+    def test_query_and_body_fields(self):
+        credit = self.operations["get_credit"]
+        self.assertEqual((credit.method, credit.path), ("GET", "/credit"))
+        self.assertEqual(credit.query, [("keyid", "keyid"), ("credit", "credit")])
+        self.assertEqual(credit.body, [])
+        hlr = self.operations["post_hlr"]
+        self.assertEqual(sorted(name for name, _ in hlr.body), ["getHLR", "keyid", "num"])
+        self.assertEqual(hlr.query, [])
+
+    def test_signatures(self):
+        mcp = FastMCP("test")
+        register_tools(mcp, list(self.operations.values()))
+        schemas = {tool.name: tool.inputSchema for tool in asyncio.run(mcp.list_tools())}
+        hlr = schemas["post_hlr"]
+        # constant parameters are filled in
+        self.assertEqual(sorted(hlr["required"]), ["keyid", "num"])
+        self.assertEqual(hlr["properties"]["getHLR"]["default"], "1")
+        # lists still take a single string, as the hand-written tools did
+        self.assertEqual([kind["type"] for kind in hlr["properties"]["num"]["anyOf"]], ["string", "array"])
+        self.assertEqual(sorted(schemas["get_credit"]["required"]), ["credit", "keyid"])
+
+
+class TestCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        self.spec = self.tmp / "openapi.yaml"
+        self.spec.write_text(SPEC)
+        self.cache = self.tmp / "cache"
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def load(self):
+        return [operation.name for operation in load_operations(self.spec, self.cache)]
+
+    def test_compiled_operations_are_cached(self):
+        self.assertEqual(self.load(), ["get_credit"])
+        self.assertEqual(len(list(self.cache.glob("registry-*.json"))), 1)
+        with mock.patch("yaml.load", side_effect=AssertionError("parsed again")):
+            self.assertEqual(self.load(), ["get_credit"])
+
+    def test_cache_is_invalidated_by_a_new_spec(self):
+        self.load()
+        self.spec.write_text(SPEC.replace("/credit", "/solde"))
+        self.assertEqual(self.load(), ["get_solde"])
+        self.assertEqual(len(list(self.cache.glob("registry-*.json"))), 2)
+
+    def test_cache_is_invalidated_by_a_new_compiler(self):
+        self.load()
+        with mock.patch.object(registry, "COMPILER_VERSION", "test"), \
+                mock.patch("registry.compile_spec", wraps=registry.compile_spec) as compile_spec:
+            self.load()
+        compile_spec.assert_called_once()
+
+    def test_corrupt_cache_is_rebuilt(self):
+        self.load()
+        path, = self.cache.glob("registry-*.json")
+        path.write_text("{")
+        self.assertEqual(self.load(), ["get_credit"])
+        self.assertEqual(json.loads(path.read_text())[0]["name"], "get_credit")
+
+
+class TestCalls(StubTestCase):
+
+    def answer(self, request, body):
+        if request.query.get("keyid") == "bad" or (body or {}).get("keyid") == "bad":
+            return web.json_response({"etat": {"code": 1}}, status=400)
+        return web.json_response({"etat": {"credit": "10"}})
+
+    async def asyncSetUp(self):
+        await super().asyncSetUp()
+        self.tools = register_tools(FastMCP("test"), load_operations(SPEC_PATH))
+
+    async def test_query_operation(self):
+        result = await self.tools["get_credit"](keyid="k", credit="1")
+        self.assertEqual(json.loads(result), {"etat": {"credit": "10"}})
+        request, = self.stub.requests
+        self.assertEqual((request["method"], request["path"]), ("GET", "/credit"))
+        self.assertEqual(request["query"], {"keyid": "k", "credit": "1"})
+        self.assertIsNone(request["json"])
+
+    async def test_body_operation(self):
+        await self.tools["post_hlr"](keyid="k", num=["0680000001"])
+        await self.tools["post_hlr"](keyid="k", num="0680000002")
+        self.assertEqual([request["json"] for request in self.stub.requests],
+                         [{"getHLR": "1", "keyid": "k", "num": ["0680000001"]},
+                          {"getHLR": "1", "keyid": "k", "num": "0680000002"}])
+
+    async def test_error_messages(self):
+        result = await self.tools["post_hlr"](keyid="bad", num=["0680000001"])
+        self.assertTrue(result.startswith("Failed to read response body: "), result)
+        result = await self.tools["get_credit"](keyid="bad", credit="1")
+        self.assertTrue(result.startswith("Failed to format JSON: "), result)
+
+        await self.stub.stop()
+        result = await self.tools["post_hlr"](keyid="k", num=["0680000001"])
+        self.assertTrue(result.startswith("Failed to create request: Connection error - "), result)
+        result = await self.tools["get_credit"](keyid="k", credit="1")
+        self.assertTrue(result.startswith("Request failed: Connection error - "), result)
+        await self.stub.start()
+
+
+if __name__ == "__main__":
+    unittest.main()
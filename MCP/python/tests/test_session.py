@@ -0,0 +1,33 @@
+"""
+Tests of the shared HTTP clients
+"""
+
+import asyncio
+import os
+import unittest
+from unittest import mock
+
+from aiohttp import web
+
+from session import async_request
+
+from .stub import StubTestCase
+
+
+class TestAsyncClient(StubTestCase):
+
+    async def answer(self, request, body):
+        await asyncio.sleep(0.05)
+        return web.json_response({"etat": {}})
+
+    async def test_pool_size_limits_concurrent_requests(self):
+        with mock.patch.dict(os.environ, {"API_POOL_SIZE": "2"}):
+            responses = await asyncio.gather(*[async_request("GET", f"{self.stub.url}/credit")
+                                               for _ in range(6)])
+        self.assertEqual([response.status_code for response in responses], [200] * 6)
+        self.assertEqual(len(self.stub.requests), 6)
+        self.assertEqual(self.stub.max_active, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+# coding: utf-8
+
+"""
+    API iSendPro
+
+    Benchmark of the JSON codecs on a large /smsmulti request body and a
+    large /smsmulti response body.
+
+    "legacy" is the previous path: `json.dumps` to str for requests, and
+    `.decode('utf8')` then `json.loads` for responses.
+
+    Usage: python benchmarks/bench_codec.py [entries] [repeat]
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+"""
+
+from __future__ import absolute_import, print_function
+
+import json
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from swagger_client import codec
+
+
+def sms_multi_request(entries):
+    return {
+        "keyid": "0123456789abcdef",
+        "num": ["336%08d" % i for i in range(entries)],
+        "sms": [u"Bonjour, votre code est %06d. Bonne journée !" % i for i in range(entries)],
+        "tracker": ["t-%d" % i for i in range(entries)],
+        "emetteur": "iSendPro",
+    }
+
+
+def sms_multi_response(entries):
+    return json.dumps({"etat": {"etat": [
+        {"code": 0, "tel": "336%08d" % i, "smslong": "1", "message": "Envoi OK"}
+        for i in range(entries)]}}).encode('utf-8')
+
+
+def best(func, repeat):
+    return min(timeit.repeat(func, number=1, repeat=repeat)) * 1000
+
+
+def main(entries=200000, repeat=5):
+    request = sms_multi_request(entries)
+    response = sms_multi_response(entries)
+
+    print("smsmulti request and response with %d entries (best of %d)" % (entries, repeat))
+    print("  %-8s  %10s  %10s" % ('codec', 'dumps ms', 'loads ms'))
+    print("  %-8s  %10.1f  %10.1f" % (
+        'legacy',
+        best(lambda: json.dumps(request), repeat),
+        best(lambda: json.loads(response.decode('utf8')), repeat)))
+    for name in codec.PREFERRED_CODECS:
+        try:
+            json_codec = codec.get_codec(name)
+        except ImportError:
+            print("  %-8s  not installed" % name)
+            continue
+        print("  %-8s  %10.1f  %10.1f" % (
+            name,
+            best(lambda: json_codec.dumps(request), repeat),
+            best(lambda: json_codec.loads(response), repeat)))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:3]])
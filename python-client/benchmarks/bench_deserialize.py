@@ -0,0 +1,118 @@
+# coding: utf-8
+
+"""
+    API iSendPro
+
+    Benchmark of the deserialization of a large /smsmulti response.
+
+    Compares the precompiled `Deserializer` used by `ApiClient`, in its
+    'model', 'compact' and 'raw' response modes, with the previous
+    per-field implementation (`eval` and regular expressions on every
+    nested type), kept below as a baseline. Time, JSON parsing included,
+    and memory held by the result are reported.
+
+    Usage: python benchmarks/bench_deserialize.py [entries] [repeat]
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+"""
+
+from __future__ import absolute_import, print_function
+
+import json
+import os
+import re
+import sys
+import timeit
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from six import iteritems
+
+from swagger_client import models
+from swagger_client.deserializer import get_deserializer
+
+
+def legacy_deserialize(data, klass):
+    if data is None:
+        return None
+
+    if type(klass) == str:
+        if klass.startswith('list['):
+            sub_kls = re.match(r'list\[(.*)\]', klass).group(1)
+            return [legacy_deserialize(sub_data, sub_kls) for sub_data in data]
+
+        if klass.startswith('dict('):
+            sub_kls = re.match(r'dict\(([^,]*), (.*)\)', klass).group(2)
+            return {k: legacy_deserialize(v, sub_kls) for k, v in iteritems(data)}
+
+        if klass in ['int', 'long', 'float', 'str', 'bool',
+                     "date", 'datetime', "object"]:
+            klass = eval(klass)
+        else:
+            klass = eval('models.' + klass)
+
+    if klass in [int, float, str, bool]:
+        try:
+            return klass(data)
+        except TypeError:
+            return data
+    elif klass == object:
+        return data
+
+    instance = klass()
+    for attr, attr_type in iteritems(instance.swagger_types):
+        if data is not None \
+           and instance.attribute_map[attr] in data\
+           and isinstance(data, (list, dict)):
+            value = data[instance.attribute_map[attr]]
+            setattr(instance, attr, legacy_deserialize(value, attr_type))
+    return instance
+
+
+def sms_multi_response(entries):
+    return json.dumps({"etat": {"etat": [
+        {"code": 0, "tel": "336%08d" % i, "smslong": "1", "message": "Envoi OK"}
+        for i in range(entries)]}})
+
+
+def measure(deserialize, body, repeat):
+    seconds = min(timeit.repeat(lambda: deserialize(json.loads(body), 'SMSReponse'),
+                                number=1, repeat=repeat))
+    tracemalloc.start()
+    result = deserialize(json.loads(body), 'SMSReponse')
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return seconds, size
+
+
+def main(entries=10000, repeat=5):
+    body = sms_multi_response(entries)
+    data = json.loads(body)
+
+    assert legacy_deserialize(data, 'SMSReponse') == get_deserializer().deserialize(data, 'SMSReponse')
+
+    print("SMSReponse with %d entries (best of %d)" % (entries, repeat))
+    legacy = measure(legacy_deserialize, body, repeat)
+    for name, deserialize in [('legacy', legacy_deserialize),
+                              ('model', get_deserializer('model').deserialize),
+                              ('compact', get_deserializer('compact').deserialize),
+                              ('raw', get_deserializer('raw').deserialize)]:
+        seconds, size = legacy if name == 'legacy' else measure(deserialize, body, repeat)
+        print("  %-8s: %8.1f ms %9.1f KiB  %6.1fx faster" % (
+            name, seconds * 1000, size / 1024.0, legacy[0] / seconds))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:3]])
@@ -0,0 +1,75 @@
+# coding: utf-8
+
+"""
+    API iSendPro
+
+    Benchmark of the phone number normalisation and deduplication on a
+    column of mixed national, international and formatted numbers.
+
+    "legacy" is the previous path: `normalize_num` on every number and a
+    set for the duplicates.
+
+    Usage: python benchmarks/bench_numbers.py [entries] [repeat]
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+"""
+
+from __future__ import absolute_import, print_function
+
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from swagger_client import numbers
+
+FORMATS = ['06%08d', '+33 6%08d', '00336%08d', '336%08d', '06 %08d x']
+
+
+def column(entries):
+    rng = random.Random(0)
+    return [rng.choice(FORMATS) % rng.randrange(entries) for _ in range(entries)]
+
+
+def legacy(nums):
+    seen = set()
+    unique = []
+    for num in nums:
+        num = numbers.normalize_num(num)
+        if num not in seen:
+            seen.add(num)
+            unique.append(num)
+    return unique
+
+
+def best(func, repeat):
+    return min(timeit.repeat(func, number=1, repeat=repeat)) * 1000
+
+
+def main(entries=1000000, repeat=3):
+    nums = column(entries)
+
+    print("%d numbers (best of %d)" % (entries, repeat))
+    print("  %-14s  %10s" % ('', 'ms'))
+    print("  %-14s  %10.1f" % ('legacy', best(lambda: legacy(nums), repeat)))
+    print("  %-14s  %10.1f" % ('normalize_nums', best(lambda: numbers.normalize_nums(nums), repeat)))
+    print("  %-14s  %10.1f" % ('unique_nums', best(lambda: numbers.unique_nums(nums), repeat)))
+    if numbers.numpy is not None:
+        array = numbers.numpy.asarray(nums)
+        print("  %-14s  %10.1f" % ('  on an array', best(lambda: numbers.unique_nums(array), repeat)))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:3]])
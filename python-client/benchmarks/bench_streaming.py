@@ -0,0 +1,73 @@
+# coding: utf-8
+
+"""
+    API iSendPro
+
+    Benchmark of the encoding of a very large /smsmulti request body:
+    peak memory and time of `sanitize_for_serialization` + `dumps`
+    against `StreamingBody`.
+
+    Usage: python benchmarks/bench_streaming.py [entries]
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+"""
+
+from __future__ import absolute_import, print_function
+
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import swagger_client
+from swagger_client.models.sms_request import SMSRequest
+from swagger_client.streaming import StreamingBody
+
+
+def measure(func):
+    tracemalloc.start()
+    start = time.time()
+    size = func()
+    seconds = time.time() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return size, seconds, peak
+
+
+def main(entries=200000):
+    request = SMSRequest(keyid='0123456789abcdef', emetteur='iSendPro',
+                         num=['336%08d' % i for i in range(entries)],
+                         sms=[u"Bonjour, votre code est %06d. Bonne journée !" % i
+                              for i in range(entries)],
+                         tracker=['t-%d' % i for i in range(entries)])
+    api_client = swagger_client.ApiClient()
+    codec = api_client.codec
+
+    def whole():
+        return len(codec.dumps(api_client.sanitize_for_serialization(request)))
+
+    def streamed():
+        return sum(len(chunk) for chunk in
+                   StreamingBody(request, api_client.sanitize_for_serialization, codec))
+
+    print("SMSRequest with %d entries, %s codec" % (entries, codec.name))
+    for name, func in [('whole', whole), ('streamed', streamed)]:
+        size, seconds, peak = measure(func)
+        print("  %-9s: %8.1f ms  peak %8.1f KiB  body %d bytes" % (
+            name, seconds * 1000, peak / 1024.0, size))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:2]])
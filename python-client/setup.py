@@ -35,7 +35,13 @@ VERSION = "1.0.0"
 # prerequisite: setuptools
 # http://pypi.python.org/pypi/setuptools
 
-REQUIRES = ["urllib3 >= 1.15", "six >= 1.10", "certifi", "python-dateutil"]
+REQUIRES = ["urllib3 >= 1.15", "six >= 1.10", "certifi", "python-dateutil",
+            "futures; python_version < '3.2'"]
+EXTRAS_REQUIRE = {
+    "asyncio": ["aiohttp >= 3.0"],
+    "orjson": ["orjson"],
+    "numpy": ["numpy"],
+}
 
 setup(
     name=NAME,
@@ -45,6 +51,7 @@ setup(
     url="https://www.isendpro.com/",
     keywords=["Swagger", "API iSendPro"],
     install_requires=REQUIRES,
+    extras_require=EXTRAS_REQUIRE,
     packages=find_packages(),
     include_package_data=True,
     long_description="""\
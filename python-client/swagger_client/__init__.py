@@ -24,6 +24,8 @@
 
 from __future__ import absolute_import
 
+import sys
+
 # import models into sdk package
 from .models.comptage_reponse import ComptageReponse
 from .models.comptage_reponse_etat import ComptageReponseEtat
@@ -67,6 +69,26 @@ from .apis.sms_api import SmsApi
 # import ApiClient
 from .api_client import ApiClient
 
+# the asyncio client uses async generators, which need python 3.6
+if sys.version_info >= (3, 6):
+    from .apis.async_apis import AsyncCampagneApi
+    from .apis.async_apis import AsyncComptageApi
+    from .apis.async_apis import AsyncCreditApi
+    from .apis.async_apis import AsyncHlrApi
+    from .apis.async_apis import AsyncRepertoireApi
+    from .apis.async_apis import AsyncSetListeNoireApi
+    from .apis.async_apis import AsyncSmsApi
+    from .async_api_client import AsyncApiClient
+
 from .configuration import Configuration
 
+# import helpers
+from .bulk import BulkSmsSender
+from .segments import OfflineComptageApi, count_sms
+from .hlr_cache import CachedHlrApi, HlrCache
+from .reports import CampagneReports, iter_report_rows
+from .coalesce import CoalescingSmsSender
+from .outbox import SmsOutbox, OutboxWorkers
+from .liste_noire import ListeNoire
+
 configuration = Configuration()
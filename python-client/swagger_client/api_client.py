@@ -27,12 +27,12 @@ import os
 import re
 import sys
 import urllib
-import json
 import mimetypes
 import random
 import tempfile
 import threading
 
+from collections import namedtuple
 from datetime import datetime
 from datetime import date
 
@@ -55,6 +55,19 @@ except NameError:
     long = int
 
 from .configuration import Configuration
+from .executor import BoundedExecutor
+from .deserializer import get_deserializer
+from .codec import get_codec
+from .streaming import StreamingBody
+from .retry import RetryPolicy
+from .rate_limit import request_keyid
+
+
+# request built by `ApiClient.prepare_request`; `body` is the encoded body
+# and `request_body` the one given to the API method
+PreparedRequest = namedtuple('PreparedRequest', ['resource_path', 'url', 'query_params',
+                                                 'header_params', 'post_params', 'body',
+                                                 'request_body', 'keyid'])
 
 
 class ApiClient(object):
@@ -73,13 +86,23 @@ class ApiClient(object):
     :param host: The base path for the server to call.
     :param header_name: a header to pass when making calls to the API.
     :param header_value: a header value to pass when making calls to the API.
+    :param pool: a `BoundedExecutor` for asynchronous requests, to share one
+        thread pool between several clients.
+    :param response_mode: what responses are deserialized into: 'model'
+        (generated models), 'compact' (slotted models, same attributes)
+        or 'raw' (the parsed JSON).
+    :param retry_policy: `RetryPolicy` of the requests, by default
+        `Configuration().retry_policy` or the default policy.
     """
-    def __init__(self, host=None, header_name=None, header_value=None, cookie=None):
+    def __init__(self, host=None, header_name=None, header_value=None, cookie=None,
+                 pool=None, response_mode='model', retry_policy=None):
 
         """
         Constructor of the class.
         """
         self.rest_client = RESTClientObject()
+        self._pool = pool
+        self._pool_lock = threading.Lock()
         self.default_headers = {}
         if header_name is not None:
             self.default_headers[header_name] = header_value
@@ -88,8 +111,14 @@ class ApiClient(object):
         else:
             self.host = host
         self.cookie = cookie
+        self.response_mode = response_mode
+        self.codec = get_codec(Configuration().json_codec)
+        self.retry_policy = retry_policy or Configuration().retry_policy or RetryPolicy()
+        self.rate_limiter = Configuration().rate_limiter
         # Set default User-Agent.
         self.user_agent = 'Swagger-Codegen/1.0.0/python'
+        if Configuration().warm_up_connections:
+            self.warm_up(Configuration().warm_up_connections)
 
     @property
     def user_agent(self):
@@ -108,11 +137,61 @@ class ApiClient(object):
     def set_default_header(self, header_name, header_value):
         self.default_headers[header_name] = header_value
 
-    def __call_api(self, resource_path, method,
-                   path_params=None, query_params=None, header_params=None,
-                   body=None, post_params=None, files=None,
-                   response_type=None, auth_settings=None, callback=None, _return_http_data_only=None):
+    @property
+    def response_mode(self):
+        """
+        Gets the response mode, 'model', 'compact' or 'raw'.
+        """
+        return self.deserializer.mode
+
+    @response_mode.setter
+    def response_mode(self, value):
+        """
+        Sets the response mode, 'model', 'compact' or 'raw'.
+        """
+        self.deserializer = get_deserializer(value)
+
+    @property
+    def pool(self):
+        """
+        Gets the thread pool running asynchronous requests,
+        creating it from the configuration on first use.
+        """
+        with self._pool_lock:
+            if self._pool is None:
+                config = Configuration()
+                self._pool = BoundedExecutor(max_workers=config.thread_pool_size,
+                                             queue_size=config.thread_pool_queue_size,
+                                             block=config.thread_pool_block)
+            return self._pool
+
+    def warm_up(self, connections):
+        """
+        Opens connections to `host` ahead of the first requests.
+
+        :param connections: number of connections to open.
+        :return: number of connections opened.
+        """
+        return self.rest_client.warm_up(self.host, connections)
+
+    def close(self):
+        """
+        Shuts down the thread pool, waiting for pending requests.
+        """
+        with self._pool_lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown()
+
+    def prepare_request(self, resource_path, path_params=None, query_params=None,
+                        header_params=None, body=None, post_params=None, files=None,
+                        auth_settings=None):
+        """
+        Builds the url, parameters, headers and body of a request, for the
+        synchronous and the asyncio clients.
 
+        :return: PreparedRequest.
+        """
         # headers parameters
         header_params = header_params or {}
         header_params.update(self.default_headers)
@@ -144,33 +223,78 @@ class ApiClient(object):
         self.update_params_for_auth(header_params, query_params, auth_settings)
 
         # body
+        request_body = body
         if body:
-            body = self.sanitize_for_serialization(body)
-
-        # request url
-        url = self.host + resource_path
+            body = self.prepare_body(body)
 
-        # perform request and return response
-        response_data = self.request(method, url,
-                                     query_params=query_params,
-                                     headers=header_params,
-                                     post_params=post_params, body=body)
+        return PreparedRequest(resource_path=resource_path,
+                               url=self.host + resource_path,
+                               query_params=query_params,
+                               header_params=header_params,
+                               post_params=post_params,
+                               body=body,
+                               request_body=request_body,
+                               keyid=request_keyid(query_params, request_body))
 
+    def handle_response(self, response_data, response_type=None, callback=None,
+                        _return_http_data_only=None, _preload_content=True):
+        """
+        Deserializes the response of a request, for the synchronous and
+        the asyncio clients, and passes the result to `callback`.
+        """
         self.last_response = response_data
 
         # deserialize response data
-        if response_type:
+        if not _preload_content:
+            # the caller reads the raw response itself
+            deserialized_data = response_data
+        elif response_type:
             deserialized_data = self.deserialize(response_data, response_type)
         else:
             deserialized_data = None
 
-        if callback:
-            callback(deserialized_data) if _return_http_data_only else callback((deserialized_data, response_data.status, response_data.getheaders()))
-        elif _return_http_data_only:
-            return ( deserialized_data );
+        if _return_http_data_only:
+            return_data = deserialized_data
         else:
-            return (deserialized_data, response_data.status, response_data.getheaders())
-        
+            return_data = (deserialized_data, response_data.status,
+                           self.response_headers(response_data))
+
+        if callback:
+            callback(return_data)
+        return return_data
+
+    def response_headers(self, response):
+        """
+        Returns the headers of a response.
+        """
+        return response.getheaders()
+
+    def __call_api(self, resource_path, method,
+                   path_params=None, query_params=None, header_params=None,
+                   body=None, post_params=None, files=None,
+                   response_type=None, auth_settings=None, callback=None, _return_http_data_only=None,
+                   _preload_content=True):
+
+        request = self.prepare_request(resource_path, path_params, query_params, header_params,
+                                       body, post_params, files, auth_settings)
+
+        def send():
+            # every attempt waits for its rate limiter token; the REST
+            # client alters the headers
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire(request.keyid, request.resource_path)
+            return self.request(method, request.url,
+                                query_params=request.query_params,
+                                headers=dict(request.header_params),
+                                post_params=request.post_params, body=request.body,
+                                _preload_content=_preload_content)
+
+        # perform request and return response, retrying transient failures
+        # as the retry policy allows
+        response_data = self.retry_policy.call(send, request.resource_path, request.request_body)
+
+        return self.handle_response(response_data, response_type, callback,
+                                    _return_http_data_only, _preload_content)
 
     def to_path_value(self, obj):
         """
@@ -244,9 +368,13 @@ class ApiClient(object):
         if "file" == response_type:
             return self.__deserialize_file(response)
 
-        # fetch data from response object
+        # fetch data from response object, parsing the undecoded body
+        # when the response keeps it
+        body = getattr(response, 'raw_data', None)
+        if body is None:
+            body = response.data
         try:
-            data = json.loads(response.data)
+            data = self.codec.loads(body)
         except ValueError:
             data = response.data
 
@@ -261,44 +389,13 @@ class ApiClient(object):
 
         :return: object.
         """
-        if data is None:
-            return None
-
-        if type(klass) == str:
-            if klass.startswith('list['):
-                sub_kls = re.match('list\[(.*)\]', klass).group(1)
-                return [self.__deserialize(sub_data, sub_kls)
-                        for sub_data in data]
-
-            if klass.startswith('dict('):
-                sub_kls = re.match('dict\(([^,]*), (.*)\)', klass).group(2)
-                return {k: self.__deserialize(v, sub_kls)
-                        for k, v in iteritems(data)}
-
-            # convert str to class
-            # for native types
-            if klass in ['int', 'long', 'float', 'str', 'bool',
-                         "date", 'datetime', "object"]:
-                klass = eval(klass)
-            # for model types
-            else:
-                klass = eval('models.' + klass)
-
-        if klass in [int, long, float, str, bool]:
-            return self.__deserialize_primitive(data, klass)
-        elif klass == object:
-            return self.__deserialize_object(data)
-        elif klass == date:
-            return self.__deserialize_date(data)
-        elif klass == datetime:
-            return self.__deserialize_datatime(data)
-        else:
-            return self.__deserialize_model(data, klass)
+        return self.deserializer.deserialize(data, klass)
 
     def call_api(self, resource_path, method,
                  path_params=None, query_params=None, header_params=None,
                  body=None, post_params=None, files=None,
-                 response_type=None, auth_settings=None, callback=None, _return_http_data_only=None):
+                 response_type=None, auth_settings=None, callback=None, _return_http_data_only=None,
+                 _preload_content=True):
         """
         Makes the HTTP request (synchronous) and return the deserialized data.
         To make an async request, define a function for callback.
@@ -320,10 +417,15 @@ class ApiClient(object):
             If provide this parameter,
             the request will be called asynchronously.
         :param _return_http_data_only: response data without head status code and headers
+        :param _preload_content: if False, the urllib3.HTTPResponse object is
+            returned without reading/decoding/deserializing its body, so that
+            it can be streamed by the caller. Default is True.
         :return:
             If provide parameter callback,
-            the request will be called asynchronously.
-            The method will return the request thread.
+            the request will be called asynchronously on the client
+            thread pool (see `pool`), the callback being invoked from a
+            worker thread. The method will return a
+            `concurrent.futures.Future` resolving to the response.
             If parameter callback is None,
             then the method will return the response directly.
         """
@@ -331,60 +433,66 @@ class ApiClient(object):
             return self.__call_api(resource_path, method,
                                    path_params, query_params, header_params,
                                    body, post_params, files,
-                                   response_type, auth_settings, callback, _return_http_data_only)
+                                   response_type, auth_settings, callback, _return_http_data_only,
+                                   _preload_content)
         else:
-            thread = threading.Thread(target=self.__call_api,
-                                      args=(resource_path, method,
-                                            path_params, query_params,
-                                            header_params, body,
-                                            post_params, files,
-                                            response_type, auth_settings,
-                                            callback,_return_http_data_only))
-        thread.start()
-        return thread
+            return self.pool.submit(self.__call_api, resource_path, method,
+                                    path_params, query_params,
+                                    header_params, body,
+                                    post_params, files,
+                                    response_type, auth_settings,
+                                    callback, _return_http_data_only,
+                                    _preload_content)
 
     def request(self, method, url, query_params=None, headers=None,
-                post_params=None, body=None):
+                post_params=None, body=None, _preload_content=True):
         """
         Makes the HTTP request using RESTClient.
         """
         if method == "GET":
             return self.rest_client.GET(url,
                                         query_params=query_params,
-                                        headers=headers)
+                                        headers=headers,
+                                        _preload_content=_preload_content)
         elif method == "HEAD":
             return self.rest_client.HEAD(url,
                                          query_params=query_params,
-                                         headers=headers)
+                                         headers=headers,
+                                         _preload_content=_preload_content)
         elif method == "OPTIONS":
             return self.rest_client.OPTIONS(url,
                                             query_params=query_params,
                                             headers=headers,
                                             post_params=post_params,
-                                            body=body)
+                                            body=body,
+                                            _preload_content=_preload_content)
         elif method == "POST":
             return self.rest_client.POST(url,
                                          query_params=query_params,
                                          headers=headers,
                                          post_params=post_params,
-                                         body=body)
+                                         body=body,
+                                         _preload_content=_preload_content)
         elif method == "PUT":
             return self.rest_client.PUT(url,
                                         query_params=query_params,
                                         headers=headers,
                                         post_params=post_params,
-                                        body=body)
+                                        body=body,
+                                        _preload_content=_preload_content)
         elif method == "PATCH":
             return self.rest_client.PATCH(url,
                                           query_params=query_params,
                                           headers=headers,
                                           post_params=post_params,
-                                          body=body)
+                                          body=body,
+                                          _preload_content=_preload_content)
         elif method == "DELETE":
             return self.rest_client.DELETE(url,
                                            query_params=query_params,
                                            headers=headers,
-                                           body=body)
+                                           body=body,
+                                           _preload_content=_preload_content)
         else:
             raise ValueError(
                 "http method must be `GET`, `HEAD`,"
@@ -419,6 +527,27 @@ class ApiClient(object):
 
         return params
 
+    def prepare_body(self, body):
+        """
+        Builds the request body.
+
+        Bodies with more list entries than
+        `Configuration().stream_body_threshold` are wrapped in a
+        `StreamingBody`, encoded while they are sent; others are
+        sanitized for serialization.
+
+        :param body: model, dict or list to send.
+        :return: sanitized body, or StreamingBody.
+        """
+        config = Configuration()
+        threshold = config.stream_body_threshold
+        if threshold is not None and not isinstance(body, (list, tuple)) \
+           and (isinstance(body, dict) or hasattr(body, 'swagger_types')) \
+           and StreamingBody.list_length(body) > threshold:
+            return StreamingBody(body, self.sanitize_for_serialization, self.codec,
+                                 chunked=config.stream_body_chunked)
+        return self.sanitize_for_serialization(body)
+
     def select_header_accept(self, accepts):
         """
         Returns `Accept` based on an array of accepts provided.
@@ -501,91 +630,12 @@ class ApiClient(object):
                 group(1)
             path = os.path.join(os.path.dirname(path), filename)
 
-        with open(path, "w") as f:
-            f.write(response.data)
+        body = getattr(response, 'raw_data', None)
+        if body is None:
+            body = response.data
+        if not isinstance(body, bytes):
+            body = body.encode('utf8')
+        with open(path, "wb") as f:
+            f.write(body)
 
         return path
-
-    def __deserialize_primitive(self, data, klass):
-        """
-        Deserializes string to primitive type.
-
-        :param data: str.
-        :param klass: class literal.
-
-        :return: int, long, float, str, bool.
-        """
-        try:
-            value = klass(data)
-        except UnicodeEncodeError:
-            value = unicode(data)
-        except TypeError:
-            value = data
-        return value
-
-    def __deserialize_object(self, value):
-        """
-        Return a original value.
-
-        :return: object.
-        """
-        return value
-
-    def __deserialize_date(self, string):
-        """
-        Deserializes string to date.
-
-        :param string: str.
-        :return: date.
-        """
-        try:
-            from dateutil.parser import parse
-            return parse(string).date()
-        except ImportError:
-            return string
-        except ValueError:
-            raise ApiException(
-                status=0,
-                reason="Failed to parse `{0}` into a date object"
-                .format(string)
-            )
-
-    def __deserialize_datatime(self, string):
-        """
-        Deserializes string to datetime.
-
-        The string should be in iso8601 datetime format.
-
-        :param string: str.
-        :return: datetime.
-        """
-        try:
-            from dateutil.parser import parse
-            return parse(string)
-        except ImportError:
-            return string
-        except ValueError:
-            raise ApiException(
-                status=0,
-                reason="Failed to parse `{0}` into a datetime object".
-                format(string)
-            )
-
-    def __deserialize_model(self, data, klass):
-        """
-        Deserializes list or dict to model.
-
-        :param data: dict, list.
-        :param klass: class literal.
-        :return: model object.
-        """
-        instance = klass()
-
-        for attr, attr_type in iteritems(instance.swagger_types):
-            if data is not None \
-               and instance.attribute_map[attr] in data\
-               and isinstance(data, (list, dict)):
-                value = data[instance.attribute_map[attr]]
-                setattr(instance, attr, self.__deserialize(value, attr_type))
-
-        return instance
@@ -1,5 +1,7 @@
 from __future__ import absolute_import
 
+import sys
+
 # import apis into api package
 from .campagne_api import CampagneApi
 from .comptage_api import ComptageApi
@@ -8,3 +10,8 @@ from .hlr_api import HlrApi
 from .repertoire_api import RepertoireApi
 from .set_liste_noire_api import SetListeNoireApi
 from .sms_api import SmsApi
+
+# the asyncio apis need python 3.6
+if sys.version_info >= (3, 6):
+    from .async_apis import AsyncCampagneApi, AsyncComptageApi, AsyncCreditApi, \
+        AsyncHlrApi, AsyncRepertoireApi, AsyncSetListeNoireApi, AsyncSmsApi
@@ -0,0 +1,121 @@
+# coding: utf-8
+
+"""
+    API iSendPro
+
+    Coroutine variants of the generated API classes.
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+"""
+
+from __future__ import absolute_import
+
+from ..configuration import Configuration
+from ..async_api_client import AsyncApiClient
+from .campagne_api import CampagneApi
+from .comptage_api import ComptageApi
+from .credit_api import CreditApi
+from .hlr_api import HlrApi
+from .repertoire_api import RepertoireApi
+from .set_liste_noire_api import SetListeNoireApi
+from .sms_api import SmsApi
+
+
+def _async_api_client(api_client):
+    """
+    Returns `api_client`, or the shared `AsyncApiClient` of the
+    configuration when none is given.
+    """
+    if api_client:
+        return api_client
+    config = Configuration()
+    if not config.async_api_client:
+        config.async_api_client = AsyncApiClient()
+    return config.async_api_client
+
+
+class AsyncCampagneApi(CampagneApi):
+    """
+    CampagneApi whose methods return coroutines.
+
+    >>> path = await AsyncCampagneApi().get_campagne(keyid, '1', date_deb, date_fin)
+    """
+
+    def __init__(self, api_client=None):
+        super(AsyncCampagneApi, self).__init__(_async_api_client(api_client))
+
+
+class AsyncComptageApi(ComptageApi):
+    """
+    ComptageApi whose methods return coroutines.
+
+    >>> response = await AsyncComptageApi().comptage(comptagerequest)
+    """
+
+    def __init__(self, api_client=None):
+        super(AsyncComptageApi, self).__init__(_async_api_client(api_client))
+
+
+class AsyncCreditApi(CreditApi):
+    """
+    CreditApi whose methods return coroutines.
+
+    >>> response = await AsyncCreditApi().get_credit(keyid, '1')
+    """
+
+    def __init__(self, api_client=None):
+        super(AsyncCreditApi, self).__init__(_async_api_client(api_client))
+
+
+class AsyncHlrApi(HlrApi):
+    """
+    HlrApi whose methods return coroutines.
+
+    >>> response = await AsyncHlrApi().get_hlr(hlrrequest)
+    """
+
+    def __init__(self, api_client=None):
+        super(AsyncHlrApi, self).__init__(_async_api_client(api_client))
+
+
+class AsyncRepertoireApi(RepertoireApi):
+    """
+    RepertoireApi whose methods return coroutines.
+
+    >>> response = await AsyncRepertoireApi().repertoire_crea(repertoirecreaterequest)
+    """
+
+    def __init__(self, api_client=None):
+        super(AsyncRepertoireApi, self).__init__(_async_api_client(api_client))
+
+
+class AsyncSetListeNoireApi(SetListeNoireApi):
+    """
+    SetListeNoireApi whose methods return coroutines.
+
+    >>> response = await AsyncSetListeNoireApi().set_liste_noire(keyid, '1', num)
+    """
+
+    def __init__(self, api_client=None):
+        super(AsyncSetListeNoireApi, self).__init__(_async_api_client(api_client))
+
+
+class AsyncSmsApi(SmsApi):
+    """
+    SmsApi whose methods return coroutines.
+
+    >>> response = await AsyncSmsApi().send_sms(smsrequest)
+    """
+
+    def __init__(self, api_client=None):
+        super(AsyncSmsApi, self).__init__(_async_api_client(api_client))
@@ -62,7 +62,7 @@ class CampagneApi(object):
         >>> def callback_function(response):
         >>>     pprint(response)
         >>>
-        >>> thread = api.get_campagne(keyid, rapport_campagne, date_deb, date_fin, callback=callback_function)
+        >>> future = api.get_campagne(keyid, rapport_campagne, date_deb, date_fin, callback=callback_function)
 
         :param callback function: The callback function
             for asynchronous request. (optional)
@@ -72,7 +72,7 @@ class CampagneApi(object):
         :param str date_fin: date de fin au format YYYY-MM-DD hh:mm (required)
         :return: file
                  If the method is called asynchronously,
-                 returns the request thread.
+                 returns a concurrent.futures.Future.
         """
         kwargs['_return_http_data_only'] = True
         if kwargs.get('callback'):
@@ -92,7 +92,7 @@ class CampagneApi(object):
         >>> def callback_function(response):
         >>>     pprint(response)
         >>>
-        >>> thread = api.get_campagne_with_http_info(keyid, rapport_campagne, date_deb, date_fin, callback=callback_function)
+        >>> future = api.get_campagne_with_http_info(keyid, rapport_campagne, date_deb, date_fin, callback=callback_function)
 
         :param callback function: The callback function
             for asynchronous request. (optional)
@@ -102,12 +102,13 @@ class CampagneApi(object):
         :param str date_fin: date de fin au format YYYY-MM-DD hh:mm (required)
         :return: file
                  If the method is called asynchronously,
-                 returns the request thread.
+                 returns a concurrent.futures.Future.
         """
 
         all_params = ['keyid', 'rapport_campagne', 'date_deb', 'date_fin']
         all_params.append('callback')
         all_params.append('_return_http_data_only')
+        all_params.append('_preload_content')
 
         params = locals()
         for key, val in iteritems(params['kwargs']):
@@ -174,4 +175,5 @@ class CampagneApi(object):
                                             response_type='file',
                                             auth_settings=auth_settings,
                                             callback=params.get('callback'),
-                                            _return_http_data_only=params.get('_return_http_data_only'))
+                                            _return_http_data_only=params.get('_return_http_data_only'),
+                                            _preload_content=params.get('_preload_content', True))
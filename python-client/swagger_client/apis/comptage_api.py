@@ -62,14 +62,14 @@ class ComptageApi(object):
         >>> def callback_function(response):
         >>>     pprint(response)
         >>>
-        >>> thread = api.comptage(comptagerequest, callback=callback_function)
+        >>> future = api.comptage(comptagerequest, callback=callback_function)
 
         :param callback function: The callback function
             for asynchronous request. (optional)
         :param ComptageRequest comptagerequest: sms request (required)
         :return: ComptageReponse
                  If the method is called asynchronously,
-                 returns the request thread.
+                 returns a concurrent.futures.Future.
         """
         kwargs['_return_http_data_only'] = True
         if kwargs.get('callback'):
@@ -89,19 +89,20 @@ class ComptageApi(object):
         >>> def callback_function(response):
         >>>     pprint(response)
         >>>
-        >>> thread = api.comptage_with_http_info(comptagerequest, callback=callback_function)
+        >>> future = api.comptage_with_http_info(comptagerequest, callback=callback_function)
 
         :param callback function: The callback function
             for asynchronous request. (optional)
         :param ComptageRequest comptagerequest: sms request (required)
         :return: ComptageReponse
                  If the method is called asynchronously,
-                 returns the request thread.
+                 returns a concurrent.futures.Future.
         """
 
         all_params = ['comptagerequest']
         all_params.append('callback')
         all_params.append('_return_http_data_only')
+        all_params.append('_preload_content')
 
         params = locals()
         for key, val in iteritems(params['kwargs']):
@@ -153,4 +154,5 @@ class ComptageApi(object):
                                             response_type='ComptageReponse',
                                             auth_settings=auth_settings,
                                             callback=params.get('callback'),
-                                            _return_http_data_only=params.get('_return_http_data_only'))
+                                            _return_http_data_only=params.get('_return_http_data_only'),
+                                            _preload_content=params.get('_preload_content', True))
@@ -62,7 +62,7 @@ class CreditApi(object):
         >>> def callback_function(response):
         >>>     pprint(response)
         >>>
-        >>> thread = api.get_credit(keyid, credit, callback=callback_function)
+        >>> future = api.get_credit(keyid, credit, callback=callback_function)
 
         :param callback function: The callback function
             for asynchronous request. (optional)
@@ -70,7 +70,7 @@ class CreditApi(object):
         :param str credit: Type de reponse demandée, 1 pour euro, 2 pour euro + estimation quantité (required)
         :return: CreditResponse
                  If the method is called asynchronously,
-                 returns the request thread.
+                 returns a concurrent.futures.Future.
         """
         kwargs['_return_http_data_only'] = True
         if kwargs.get('callback'):
@@ -90,7 +90,7 @@ class CreditApi(object):
         >>> def callback_function(response):
         >>>     pprint(response)
         >>>
-        >>> thread = api.get_credit_with_http_info(keyid, credit, callback=callback_function)
+        >>> future = api.get_credit_with_http_info(keyid, credit, callback=callback_function)
 
         :param callback function: The callback function
             for asynchronous request. (optional)
@@ -98,12 +98,13 @@ class CreditApi(object):
         :param str credit: Type de reponse demandée, 1 pour euro, 2 pour euro + estimation quantité (required)
         :return: CreditResponse
                  If the method is called asynchronously,
-                 returns the request thread.
+                 returns a concurrent.futures.Future.
         """
 
         all_params = ['keyid', 'credit']
         all_params.append('callback')
         all_params.append('_return_http_data_only')
+        all_params.append('_preload_content')
 
         params = locals()
         for key, val in iteritems(params['kwargs']):
@@ -160,4 +161,5 @@ class CreditApi(object):
                                             response_type='CreditResponse',
                                             auth_settings=auth_settings,
                                             callback=params.get('callback'),
-                                            _return_http_data_only=params.get('_return_http_data_only'))
+                                            _return_http_data_only=params.get('_return_http_data_only'),
+                                            _preload_content=params.get('_preload_content', True))
@@ -62,14 +62,14 @@ class HlrApi(object):
         >>> def callback_function(response):
         >>>     pprint(response)
         >>>
-        >>> thread = api.get_hlr(hlrrequest, callback=callback_function)
+        >>> future = api.get_hlr(hlrrequest, callback=callback_function)
 
         :param callback function: The callback function
             for asynchronous request. (optional)
         :param HLRrequest hlrrequest:  (required)
         :return: HLRReponse
                  If the method is called asynchronously,
-                 returns the request thread.
+                 returns a concurrent.futures.Future.
         """
         kwargs['_return_http_data_only'] = True
         if kwargs.get('callback'):
@@ -89,19 +89,20 @@ class HlrApi(object):
         >>> def callback_function(response):
         >>>     pprint(response)
         >>>
-        >>> thread = api.get_hlr_with_http_info(hlrrequest, callback=callback_function)
+        >>> future = api.get_hlr_with_http_info(hlrrequest, callback=callback_function)
 
         :param callback function: The callback function
             for asynchronous request. (optional)
         :param HLRrequest hlrrequest:  (required)
         :return: HLRReponse
                  If the method is called asynchronously,
-                 returns the request thread.
+                 returns a concurrent.futures.Future.
         """
 
         all_params = ['hlrrequest']
         all_params.append('callback')
         all_params.append('_return_http_data_only')
+        all_params.append('_preload_content')
 
         params = locals()
         for key, val in iteritems(params['kwargs']):
@@ -153,4 +154,5 @@ class HlrApi(object):
                                             response_type='HLRReponse',
                                             auth_settings=auth_settings,
                                             callback=params.get('callback'),
-                                            _return_http_data_only=params.get('_return_http_data_only'))
+                                            _return_http_data_only=params.get('_return_http_data_only'),
+                                            _preload_content=params.get('_preload_content', True))
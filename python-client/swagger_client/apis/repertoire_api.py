@@ -62,14 +62,14 @@ class RepertoireApi(object):
         >>> def callback_function(response):
         >>>     pprint(response)
         >>>
-        >>> thread = api.repertoire(repertoiremodifrequest, callback=callback_function)
+        >>> future = api.repertoire(repertoiremodifrequest, callback=callback_function)
 
         :param callback function: The callback function
             for asynchronous request. (optional)
         :param REPERTOIREmodifrequest repertoiremodifrequest: Requête de creation repertoire (required)
         :return: REPERTOIREmodifreponse
                  If the method is called asynchronously,
-                 returns the request thread.
+                 returns a concurrent.futures.Future.
         """
         kwargs['_return_http_data_only'] = True
         if kwargs.get('callback'):
@@ -89,19 +89,20 @@ class RepertoireApi(object):
         >>> def callback_function(response):
         >>>     pprint(response)
         >>>
-        >>> thread = api.repertoire_with_http_info(repertoiremodifrequest, callback=callback_function)
+        >>> future = api.repertoire_with_http_info(repertoiremodifrequest, callback=callback_function)
 
         :param callback function: The callback function
             for asynchronous request. (optional)
         :param REPERTOIREmodifrequest repertoiremodifrequest: Requête de creation repertoire (required)
         :return: REPERTOIREmodifreponse
                  If the method is called asynchronously,
-                 returns the request thread.
+                 returns a concurrent.futures.Future.
         """
 
         all_params = ['repertoiremodifrequest']
         all_params.append('callback')
         all_params.append('_return_http_data_only')
+        all_params.append('_preload_content')
 
         params = locals()
         for key, val in iteritems(params['kwargs']):
@@ -153,7 +154,8 @@ class RepertoireApi(object):
                                             response_type='REPERTOIREmodifreponse',
                                             auth_settings=auth_settings,
                                             callback=params.get('callback'),
-                                            _return_http_data_only=params.get('_return_http_data_only'))
+                                            _return_http_data_only=params.get('_return_http_data_only'),
+                                            _preload_content=params.get('_preload_content', True))
 
     def repertoire_crea(self, repertoirecreaterequest, **kwargs):
         """
@@ -166,14 +168,14 @@ class RepertoireApi(object):
         >>> def callback_function(response):
         >>>     pprint(response)
         >>>
-        >>> thread = api.repertoire_crea(repertoirecreaterequest, callback=callback_function)
+        >>> future = api.repertoire_crea(repertoirecreaterequest, callback=callback_function)
 
         :param callback function: The callback function
             for asynchronous request. (optional)
         :param REPERTOIREcreaterequest repertoirecreaterequest: Creation repertoire (required)
         :return: REPERTOIREcreatereponse
                  If the method is called asynchronously,
-                 returns the request thread.
+                 returns a concurrent.futures.Future.
         """
         kwargs['_return_http_data_only'] = True
         if kwargs.get('callback'):
@@ -193,19 +195,20 @@ class RepertoireApi(object):
         >>> def callback_function(response):
         >>>     pprint(response)
         >>>
-        >>> thread = api.repertoire_crea_with_http_info(repertoirecreaterequest, callback=callback_function)
+        >>> future = api.repertoire_crea_with_http_info(repertoirecreaterequest, callback=callback_function)
 
         :param callback function: The callback function
             for asynchronous request. (optional)
         :param REPERTOIREcreaterequest repertoirecreaterequest: Creation repertoire (required)
         :return: REPERTOIREcreatereponse
                  If the method is called asynchronously,
-                 returns the request thread.
+                 returns a concurrent.futures.Future.
         """
 
         all_params = ['repertoirecreaterequest']
         all_params.append('callback')
         all_params.append('_return_http_data_only')
+        all_params.append('_preload_content')
 
         params = locals()
         for key, val in iteritems(params['kwargs']):
@@ -257,4 +260,5 @@ class RepertoireApi(object):
                                             response_type='REPERTOIREcreatereponse',
                                             auth_settings=auth_settings,
                                             callback=params.get('callback'),
-                                            _return_http_data_only=params.get('_return_http_data_only'))
+                                            _return_http_data_only=params.get('_return_http_data_only'),
+                                            _preload_content=params.get('_preload_content', True))
@@ -62,7 +62,7 @@ class SetListeNoireApi(object):
         >>> def callback_function(response):
         >>>     pprint(response)
         >>>
-        >>> thread = api.set_liste_noire(keyid, setliste_noire, num, callback=callback_function)
+        >>> future = api.set_liste_noire(keyid, setliste_noire, num, callback=callback_function)
 
         :param callback function: The callback function
             for asynchronous request. (optional)
@@ -71,7 +71,7 @@ class SetListeNoireApi(object):
         :param str num: numéro de mobile à insérer en liste noire (required)
         :return: LISTENOIREReponse
                  If the method is called asynchronously,
-                 returns the request thread.
+                 returns a concurrent.futures.Future.
         """
         kwargs['_return_http_data_only'] = True
         if kwargs.get('callback'):
@@ -91,7 +91,7 @@ class SetListeNoireApi(object):
         >>> def callback_function(response):
         >>>     pprint(response)
         >>>
-        >>> thread = api.set_liste_noire_with_http_info(keyid, setliste_noire, num, callback=callback_function)
+        >>> future = api.set_liste_noire_with_http_info(keyid, setliste_noire, num, callback=callback_function)
 
         :param callback function: The callback function
             for asynchronous request. (optional)
@@ -100,12 +100,13 @@ class SetListeNoireApi(object):
         :param str num: numéro de mobile à insérer en liste noire (required)
         :return: LISTENOIREReponse
                  If the method is called asynchronously,
-                 returns the request thread.
+                 returns a concurrent.futures.Future.
         """
 
         all_params = ['keyid', 'setliste_noire', 'num']
         all_params.append('callback')
         all_params.append('_return_http_data_only')
+        all_params.append('_preload_content')
 
         params = locals()
         for key, val in iteritems(params['kwargs']):
@@ -167,4 +168,5 @@ class SetListeNoireApi(object):
                                             response_type='LISTENOIREReponse',
                                             auth_settings=auth_settings,
                                             callback=params.get('callback'),
-                                            _return_http_data_only=params.get('_return_http_data_only'))
+                                            _return_http_data_only=params.get('_return_http_data_only'),
+                                            _preload_content=params.get('_preload_content', True))
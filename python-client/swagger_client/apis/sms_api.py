@@ -62,14 +62,14 @@ class SmsApi(object):
         >>> def callback_function(response):
         >>>     pprint(response)
         >>>
-        >>> thread = api.send_sms(smsrequest, callback=callback_function)
+        >>> future = api.send_sms(smsrequest, callback=callback_function)
 
         :param callback function: The callback function
             for asynchronous request. (optional)
         :param SmsUniqueRequest smsrequest: sms request (required)
         :return: SMSReponse
                  If the method is called asynchronously,
-                 returns the request thread.
+                 returns a concurrent.futures.Future.
         """
         kwargs['_return_http_data_only'] = True
         if kwargs.get('callback'):
@@ -89,19 +89,20 @@ class SmsApi(object):
         >>> def callback_function(response):
         >>>     pprint(response)
         >>>
-        >>> thread = api.send_sms_with_http_info(smsrequest, callback=callback_function)
+        >>> future = api.send_sms_with_http_info(smsrequest, callback=callback_function)
 
         :param callback function: The callback function
             for asynchronous request. (optional)
         :param SmsUniqueRequest smsrequest: sms request (required)
         :return: SMSReponse
                  If the method is called asynchronously,
-                 returns the request thread.
+                 returns a concurrent.futures.Future.
         """
 
         all_params = ['smsrequest']
         all_params.append('callback')
         all_params.append('_return_http_data_only')
+        all_params.append('_preload_content')
 
         params = locals()
         for key, val in iteritems(params['kwargs']):
@@ -153,7 +154,8 @@ class SmsApi(object):
                                             response_type='SMSReponse',
                                             auth_settings=auth_settings,
                                             callback=params.get('callback'),
-                                            _return_http_data_only=params.get('_return_http_data_only'))
+                                            _return_http_data_only=params.get('_return_http_data_only'),
+                                            _preload_content=params.get('_preload_content', True))
 
     def send_sms_multi(self, smsrequest, **kwargs):
         """
@@ -166,14 +168,14 @@ class SmsApi(object):
         >>> def callback_function(response):
         >>>     pprint(response)
         >>>
-        >>> thread = api.send_sms_multi(smsrequest, callback=callback_function)
+        >>> future = api.send_sms_multi(smsrequest, callback=callback_function)
 
         :param callback function: The callback function
             for asynchronous request. (optional)
         :param SMSRequest smsrequest: sms request (required)
         :return: SMSReponse
                  If the method is called asynchronously,
-                 returns the request thread.
+                 returns a concurrent.futures.Future.
         """
         kwargs['_return_http_data_only'] = True
         if kwargs.get('callback'):
@@ -193,19 +195,20 @@ class SmsApi(object):
         >>> def callback_function(response):
         >>>     pprint(response)
         >>>
-        >>> thread = api.send_sms_multi_with_http_info(smsrequest, callback=callback_function)
+        >>> future = api.send_sms_multi_with_http_info(smsrequest, callback=callback_function)
 
         :param callback function: The callback function
             for asynchronous request. (optional)
         :param SMSRequest smsrequest: sms request (required)
         :return: SMSReponse
                  If the method is called asynchronously,
-                 returns the request thread.
+                 returns a concurrent.futures.Future.
         """
 
         all_params = ['smsrequest']
         all_params.append('callback')
         all_params.append('_return_http_data_only')
+        all_params.append('_preload_content')
 
         params = locals()
         for key, val in iteritems(params['kwargs']):
@@ -257,4 +260,5 @@ class SmsApi(object):
                                             response_type='SMSReponse',
                                             auth_settings=auth_settings,
                                             callback=params.get('callback'),
-                                            _return_http_data_only=params.get('_return_http_data_only'))
+                                            _return_http_data_only=params.get('_return_http_data_only'),
+                                            _preload_content=params.get('_preload_content', True))
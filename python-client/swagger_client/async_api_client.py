@@ -0,0 +1,169 @@
+# coding: utf-8
+
+"""
+Copyright 2016 SmartBear Software
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+
+   ref: https://github.com/swagger-api/swagger-codegen
+"""
+
+from __future__ import absolute_import
+
+import asyncio
+
+from .api_client import ApiClient
+from .async_rest import AsyncRESTClientObject
+
+
+class AsyncApiClient(ApiClient):
+    """
+    asyncio flavour of `ApiClient`.
+
+    Request building, `sanitize_for_serialization` and `deserialize` are
+    inherited unchanged from `ApiClient`, so the models returned are the
+    same as with the synchronous client. Only the transport differs:
+    `call_api` is a coroutine and many requests can be in flight on one
+    event loop.
+
+    >>> api_client = AsyncApiClient()
+    >>> sms_api = AsyncSmsApi(api_client)
+    >>> response = await sms_api.send_sms(smsrequest)
+    >>> await api_client.close()
+
+    :param host: The base path for the server to call.
+    :param header_name: a header to pass when making calls to the API.
+    :param header_value: a header value to pass when making calls to the API.
+    :param pools_size: maximum number of simultaneous connections.
+    :param response_mode: 'model', 'compact' or 'raw', see `ApiClient`.
+    :param retry_policy: `RetryPolicy` of the requests, see `ApiClient`.
+    """
+    def __init__(self, host=None, header_name=None, header_value=None, cookie=None,
+                 pools_size=100, response_mode='model', retry_policy=None):
+        super(AsyncApiClient, self).__init__(host, header_name, header_value, cookie,
+                                             response_mode=response_mode,
+                                             retry_policy=retry_policy)
+        self.rest_client = AsyncRESTClientObject(pools_size=pools_size)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    def warm_up(self, connections):
+        """
+        Not supported: aiohttp opens connections on demand, within the
+        `pools_size` limit.
+
+        :return: 0, no connection is opened.
+        """
+        return 0
+
+    async def close(self):
+        """
+        Closes the connection pool of this client.
+        """
+        await self.rest_client.close()
+
+    def response_headers(self, response):
+        """
+        Returns the headers of a response, read or raw aiohttp one.
+        """
+        if hasattr(response, 'getheaders'):
+            return response.getheaders()
+        return response.headers
+
+    async def __call_api(self, resource_path, method,
+                         path_params=None, query_params=None, header_params=None,
+                         body=None, post_params=None, files=None,
+                         response_type=None, auth_settings=None, callback=None, _return_http_data_only=None,
+                         _preload_content=True):
+
+        request = self.prepare_request(resource_path, path_params, query_params, header_params,
+                                       body, post_params, files, auth_settings)
+
+        # perform request and return response, retrying transient failures
+        # as the retry policy allows
+        attempt = 1
+        while True:
+            if self.rate_limiter is not None:
+                wait = self.rate_limiter.reserve(request.keyid, request.resource_path)
+                if wait > 0:
+                    await asyncio.sleep(wait)
+            try:
+                response_data = await self.request(method, request.url,
+                                                   query_params=request.query_params,
+                                                   headers=dict(request.header_params),
+                                                   post_params=request.post_params,
+                                                   body=request.body,
+                                                   _preload_content=_preload_content)
+                break
+            except Exception as e:
+                delay = self.retry_policy.on_failure(request.resource_path, request.request_body,
+                                                     attempt, e)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                attempt += 1
+
+        return self.handle_response(response_data, response_type, callback,
+                                    _return_http_data_only, _preload_content)
+
+    async def call_api(self, resource_path, method,
+                       path_params=None, query_params=None, header_params=None,
+                       body=None, post_params=None, files=None,
+                       response_type=None, auth_settings=None, callback=None, _return_http_data_only=None,
+                       _preload_content=True):
+        """
+        Makes the HTTP request without blocking the event loop and returns
+        the deserialized data.
+
+        Takes the same parameters as `ApiClient.call_api`. If a callback
+        is given it is invoked with the result once the request completes,
+        and the result is returned as well.
+        """
+        return await self.__call_api(resource_path, method,
+                                     path_params, query_params, header_params,
+                                     body, post_params, files,
+                                     response_type, auth_settings, callback, _return_http_data_only,
+                                     _preload_content)
+
+    async def request(self, method, url, query_params=None, headers=None,
+                      post_params=None, body=None, _preload_content=True):
+        """
+        Makes the HTTP request using AsyncRESTClient.
+        """
+        if method in ["GET", "HEAD"]:
+            return await self.rest_client.request(method, url,
+                                                  query_params=query_params,
+                                                  headers=headers,
+                                                  _preload_content=_preload_content)
+        elif method in ["OPTIONS", "POST", "PUT", "PATCH"]:
+            return await self.rest_client.request(method, url,
+                                                  query_params=query_params,
+                                                  headers=headers,
+                                                  post_params=post_params,
+                                                  body=body,
+                                                  _preload_content=_preload_content)
+        elif method == "DELETE":
+            return await self.rest_client.request(method, url,
+                                                  query_params=query_params,
+                                                  headers=headers,
+                                                  body=body,
+                                                  _preload_content=_preload_content)
+        else:
+            raise ValueError(
+                "http method must be `GET`, `HEAD`,"
+                " `POST`, `PATCH`, `PUT` or `DELETE`."
+            )
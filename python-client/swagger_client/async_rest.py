@@ -0,0 +1,258 @@
+# coding: utf-8
+
+"""
+    API iSendPro
+
+    asyncio transport for the iSendPro client, built on aiohttp.
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+"""
+
+from __future__ import absolute_import
+
+import asyncio
+import io
+import ssl
+import threading
+import certifi
+import logging
+import re
+
+from .configuration import Configuration
+from .codec import get_codec
+from .rest import ApiException, decode_body
+from .streaming import StreamingBody
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+try:
+    # for python3
+    from urllib.parse import urlencode
+except ImportError:
+    # for python2
+    from urllib import urlencode
+
+
+logger = logging.getLogger(__name__)
+
+
+async def _close_at_shutdown(session):
+    try:
+        await asyncio.get_event_loop().create_future()
+    finally:
+        await session.close()
+
+
+async def _aiter(iterable):
+    # aiohttp streams request bodies from asynchronous iterables only
+    for chunk in iterable:
+        yield chunk
+
+
+class AsyncRESTResponse(io.IOBase):
+
+    def __init__(self, resp, data):
+        self.aiohttp_response = resp
+        self.status = resp.status
+        self.reason = resp.reason
+        self.raw_data = data
+        self._data = None
+
+    @property
+    def data(self):
+        """
+        Gets the response body, decoded to str on first access.
+        `raw_data` holds the undecoded bytes.
+        """
+        if self._data is None:
+            self._data = decode_body(self.raw_data)
+        return self._data
+
+    @data.setter
+    def data(self, value):
+        """
+        Sets the decoded response body.
+        """
+        self._data = value
+
+    def getheaders(self):
+        """
+        Returns a dictionary of the response headers.
+        """
+        return self.aiohttp_response.headers
+
+    def getheader(self, name, default=None):
+        """
+        Returns a given response header.
+        """
+        return self.aiohttp_response.headers.get(name, default)
+
+
+class AsyncRESTClientObject(object):
+    """
+    Non-blocking counterpart of `RESTClientObject`.
+
+    An `aiohttp.ClientSession` is opened lazily on the first request, so
+    the object can be built outside of a running event loop. A session is
+    bound to its event loop: each loop gets its own, closed when the loop
+    shuts down (`asyncio.run` cancels the pending tasks before closing the
+    loop) or by `close`. All requests made through one instance on one
+    loop share its connection pool.
+
+    :param pools_size: maximum number of simultaneous connections.
+    """
+
+    def __init__(self, pools_size=100):
+        if aiohttp is None:
+            raise ImportError('Swagger python client asyncio support requires aiohttp.')
+
+        config = Configuration()
+
+        # ssl context
+        if config.verify_ssl:
+            ca_certs = config.ssl_ca_cert or certifi.where()
+            self.ssl_context = ssl.create_default_context(cafile=ca_certs)
+            if config.cert_file:
+                self.ssl_context.load_cert_chain(config.cert_file,
+                                                 keyfile=config.key_file)
+        else:
+            self.ssl_context = False
+
+        self.pools_size = pools_size
+        self.timeout = aiohttp.ClientTimeout(connect=config.connect_timeout,
+                                             sock_read=config.read_timeout)
+        # event loop -> its session and the task closing it at shutdown
+        self._sessions = {}
+        self._lock = threading.Lock()
+        # json codec of request bodies
+        self.codec = get_codec(config.json_codec)
+
+    def _get_session(self):
+        loop = asyncio.get_event_loop()
+        entry = self._sessions.get(loop)
+        if entry is not None and not entry[0].closed:
+            return entry[0]
+        connector = aiohttp.TCPConnector(limit=self.pools_size,
+                                         ssl=self.ssl_context)
+        session = aiohttp.ClientSession(connector=connector,
+                                        timeout=self.timeout)
+        task = loop.create_task(_close_at_shutdown(session))
+        with self._lock:
+            for old in [old for old in self._sessions if old.is_closed()]:
+                del self._sessions[old]
+            self._sessions[loop] = (session, task)
+        return session
+
+    async def close(self):
+        """
+        Closes the session of the running event loop and its connections.
+        """
+        with self._lock:
+            entry = self._sessions.pop(asyncio.get_event_loop(), None)
+        if entry is not None:
+            session, task = entry
+            task.cancel()
+            await session.close()
+
+    async def request(self, method, url, query_params=None, headers=None,
+                      body=None, post_params=None, _preload_content=True):
+        """
+        :param method: http request method
+        :param url: http request url
+        :param query_params: query parameters in the url
+        :param headers: http request headers
+        :param body: request json body, for `application/json`, or a
+                     `StreamingBody` encoded while it is sent
+        :param post_params: request post parameters,
+                            `application/x-www-form-urlencode`
+                            and `multipart/form-data`
+        :param _preload_content: if False, the aiohttp.ClientResponse object is
+                                 returned without reading its body; the caller
+                                 must release it.
+        """
+        method = method.upper()
+        assert method in ['GET', 'HEAD', 'DELETE', 'POST', 'PUT', 'PATCH', 'OPTIONS']
+
+        if post_params and body:
+            raise ValueError(
+                "body parameter cannot be used with post_params parameter."
+            )
+
+        post_params = post_params or {}
+        headers = headers or {}
+
+        if 'Content-Type' not in headers:
+            headers['Content-Type'] = 'application/json'
+
+        args = {
+            'method': method,
+            'url': url,
+            'headers': headers,
+        }
+
+        # For `POST`, `PUT`, `PATCH`, `OPTIONS`, `DELETE`
+        if method in ['POST', 'PUT', 'PATCH', 'OPTIONS', 'DELETE']:
+            if query_params:
+                args['url'] += '?' + urlencode(query_params)
+            if re.search('json', headers['Content-Type'], re.IGNORECASE) \
+               and isinstance(body, StreamingBody):
+                if not body.chunked:
+                    headers['Content-Length'] = str(body.content_length())
+                args['data'] = _aiter(body)
+            elif re.search('json', headers['Content-Type'], re.IGNORECASE):
+                if body:
+                    args['data'] = self.codec.dumps(body)
+            elif headers['Content-Type'] == 'application/x-www-form-urlencoded':
+                args['data'] = aiohttp.FormData(post_params)
+            elif headers['Content-Type'] == 'multipart/form-data':
+                # must del headers['Content-Type'], or the correct Content-Type
+                # which generated by aiohttp will be overwritten.
+                del headers['Content-Type']
+                data = aiohttp.FormData()
+                for k, v in post_params:
+                    if isinstance(v, tuple) and len(v) == 3:
+                        data.add_field(k, v[1], filename=v[0], content_type=v[2])
+                    else:
+                        data.add_field(k, v)
+                args['data'] = data
+        # For `GET`, `HEAD`
+        elif query_params:
+            args['params'] = query_params
+
+        try:
+            resp = await self._get_session().request(**args)
+        except aiohttp.ClientSSLError as e:
+            msg = "{0}\n{1}".format(type(e).__name__, str(e))
+            raise ApiException(status=0, reason=msg)
+
+        if not _preload_content and resp.status in range(200, 206):
+            return resp
+
+        try:
+            data = await resp.read()
+        finally:
+            resp.release()
+
+        r = AsyncRESTResponse(resp, data)
+
+        # log response body
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("response body: %s" % r.data)
+
+        if r.status not in range(200, 206):
+            raise ApiException(http_resp=r)
+
+        return r
@@ -0,0 +1,179 @@
+# coding: utf-8
+
+"""
+    API iSendPro
+
+    Bulk sending on top of /smsmulti.
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+"""
+
+from __future__ import absolute_import
+
+from collections import deque, OrderedDict
+from itertools import islice
+
+from .configuration import Configuration
+from .api_client import ApiClient
+from .apis.sms_api import SmsApi
+from .models.sms_request import SMSRequest
+from .numbers import normalize_num, unique_rows
+
+
+class BulkSmsSender(object):
+    """
+    Sends an arbitrarily long stream of recipients through /smsmulti.
+
+    Rows are read lazily, grouped into batches of `batch_size` recipients
+    and each batch is sent as one `SMSRequest` on the thread pool of the
+    api client, with at most `max_in_flight` batches outstanding. The
+    per-recipient `SMSReponseEtatEtat` entries are yielded in input order.
+
+    >>> sender = BulkSmsSender(batch_size=500)
+    >>> rows = ((num, 'Bonjour', tracker) for num, tracker in campaign)
+    >>> for etat in sender.send(rows, keyid, emetteur='iSendPro'):
+    >>>     print(etat.tel, etat.code)
+
+    :param api_client: ApiClient to send with, the configured default if None.
+    :param batch_size: maximum number of recipients per /smsmulti request.
+    :param max_in_flight: maximum number of batches sent concurrently,
+        defaults to the size of the api client thread pool.
+    :param liste_noire: `ListeNoire` mirror; blacklisted recipients are
+        dropped before the requests are built.
+    :param dedup: drop the invalid numbers and the numbers already sent
+        in the same `send` (see `numbers.unique_rows`).
+    """
+
+    def __init__(self, api_client=None, batch_size=500, max_in_flight=None, liste_noire=None,
+                 dedup=False):
+        if batch_size < 1:
+            raise ValueError("`batch_size` must be at least 1")
+        config = Configuration()
+        if api_client is None:
+            if not config.api_client:
+                config.api_client = ApiClient()
+            api_client = config.api_client
+        self.api_client = api_client
+        self.sms_api = SmsApi(api_client)
+        self.batch_size = batch_size
+        self.max_in_flight = max_in_flight or config.thread_pool_size
+        self.liste_noire = liste_noire
+        self.dedup = dedup
+
+    def batches(self, rows, **params):
+        """
+        Groups `rows` into `SMSRequest` objects of at most `batch_size`
+        recipients.
+
+        :param rows: iterable of (num, sms) or (num, sms, tracker) tuples.
+        :param params: the other `SMSRequest` fields (keyid, emetteur, ...).
+        :return: iterator of SMSRequest.
+        """
+        rows = iter(rows)
+        while True:
+            chunk = list(islice(rows, self.batch_size))
+            if not chunk:
+                return
+            yield self.build_request(chunk, **params)
+
+    def build_request(self, chunk, **params):
+        """
+        Builds the `SMSRequest` for one batch of rows.
+
+        When every row carries the same message it is sent once, which the
+        API applies to all recipients.
+        """
+        nums = [row[0] for row in chunk]
+        messages = [row[1] for row in chunk]
+        trackers = [row[2] if len(row) > 2 else None for row in chunk]
+
+        if all(message == messages[0] for message in messages):
+            messages = messages[:1]
+        if any(tracker is not None for tracker in trackers):
+            trackers = [tracker if tracker is not None else '' for tracker in trackers]
+        else:
+            trackers = None
+
+        return SMSRequest(num=nums, sms=messages, tracker=trackers, **params)
+
+    def send(self, rows, keyid, emetteur=None, smslong=None, nostop=None,
+             ucs2=None, date_envoi=None, dropped=None):
+        """
+        Sends `rows` and yields one `SMSReponseEtatEtat` per recipient,
+        in input order. Recipients found in `liste_noire`, and with `dedup`
+        invalid or duplicate numbers, are not sent and get no result.
+
+        Nothing is sent until the returned iterator is consumed. An
+        `ApiException` raised by a batch is re-raised when that batch is
+        reached in the result stream.
+
+        :param rows: iterable of (num, sms) or (num, sms, tracker) tuples.
+        :param str keyid: Clé API.
+        :param str emetteur: sender name.
+        :param str smslong: maximum number of concatenated sms.
+        :param str nostop: "1" to remove the STOP mention.
+        :param str ucs2: "1" to send in UCS-2.
+        :param str date_envoi: scheduled date, YYYY-MM-DD hh:mm.
+        :param dropped: list receiving the rows not sent, if given.
+        :return: iterator of SMSReponseEtatEtat.
+        """
+        if self.dedup:
+            rows = unique_rows(rows, dropped=dropped)
+        if self.liste_noire is not None:
+            rows = self.liste_noire.filter(rows, dropped)
+        requests = self.batches(rows, keyid=keyid, emetteur=emetteur, smslong=smslong,
+                                nostop=nostop, ucs2=ucs2, date_envoi=date_envoi)
+        pending = deque()
+        for request in requests:
+            if len(pending) >= self.max_in_flight:
+                for etat in self._results(pending.popleft()):
+                    yield etat
+            pending.append(self.api_client.pool.submit(self.sms_api.send_sms_multi, request))
+        while pending:
+            for etat in self._results(pending.popleft()):
+                yield etat
+
+    def _results(self, future):
+        return self.entries(future.result())
+
+    @staticmethod
+    def entries(response):
+        """
+        Returns the `SMSReponseEtatEtat` entries of an /smsmulti response.
+        """
+        if response is None or response.etat is None:
+            return []
+        return response.etat.etat or []
+
+    @staticmethod
+    def match(nums, results):
+        """
+        Associates /smsmulti results to the recipients of the request, by
+        number, or by position when none of the results carries a number.
+
+        :param nums: numbers of the request, in order.
+        :param results: `SMSReponseEtatEtat` entries of the response.
+        :return: list of the result of each number, None when the response
+            has none for it.
+        """
+        if len(results) == len(nums) and not any(result.tel for result in results):
+            return list(results)
+        waiting = OrderedDict()
+        for i, num in enumerate(nums):
+            waiting.setdefault(normalize_num(num), []).append(i)
+        matched = [None] * len(nums)
+        for result in results:
+            candidates = waiting.get(normalize_num(result.tel)) if result.tel else None
+            if candidates:
+                matched[candidates.pop(0)] = result
+        return matched
@@ -0,0 +1,180 @@
+# coding: utf-8
+
+"""
+    API iSendPro
+
+    Coalescing of single sms sends into /smsmulti requests.
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+"""
+
+from __future__ import absolute_import
+
+import threading
+import time
+
+from concurrent.futures import Future
+
+from .bulk import BulkSmsSender
+from .models.sms_reponse import SMSReponse
+from .models.sms_reponse_etat import SMSReponseEtat
+
+# SmsUniqueRequest fields which must be equal to share a /smsmulti request
+GROUP_FIELDS = ('keyid', 'emetteur', 'smslong', 'nostop', 'ucs2', 'date_envoi')
+
+
+class CoalescingSmsSender(object):
+    """
+    Merges concurrent single sends into /smsmulti requests.
+
+    `send_sms` calls, from any number of threads, are buffered for at most
+    `max_delay` seconds or until `max_batch` of them accumulate. Requests
+    sharing keyid, emetteur, smslong, nostop, ucs2 and date_envoi are sent
+    together as one `SMSRequest`, on the thread pool of the api client,
+    and each caller gets back an `SMSReponse` holding its own
+    `SMSReponseEtatEtat`, as `SmsApi.send_sms` would return, matched by
+    number; it is empty when the response has no result for the number.
+
+    >>> sender = CoalescingSmsSender(max_delay=0.01)
+    >>> response = sender.send_sms(SmsUniqueRequest(keyid=keyid, num=num, sms='Bonjour'))
+    >>> sender.close()
+
+    :param api_client: ApiClient to send with, the configured default if None.
+    :param max_delay: maximum time a send waits for others, in seconds.
+    :param max_batch: maximum number of recipients per /smsmulti request.
+    """
+
+    def __init__(self, api_client=None, max_delay=0.005, max_batch=500):
+        self.bulk = BulkSmsSender(api_client, batch_size=max_batch)
+        self.api_client = self.bulk.api_client
+        self.sms_api = self.bulk.sms_api
+        self.max_delay = max_delay
+        self.max_batch = max_batch
+        self._condition = threading.Condition()
+        self._groups = {}
+        self._closed = False
+        self._flusher = threading.Thread(target=self._run, name='sms-coalescer')
+        self._flusher.daemon = True
+        self._flusher.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def submit(self, smsrequest):
+        """
+        Queues a single send.
+
+        :param SmsUniqueRequest smsrequest: sms request (required)
+        :return: concurrent.futures.Future of the SMSReponse.
+        """
+        if smsrequest is None:
+            raise ValueError("Missing the required parameter `smsrequest` when calling `send_sms`")
+        future = Future()
+        key = tuple(getattr(smsrequest, field) for field in GROUP_FIELDS)
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("cannot send after close()")
+            group = self._groups.get(key)
+            if group is None:
+                group = self._groups[key] = (time.time() + self.max_delay, [])
+                self._condition.notify()
+            group[1].append((smsrequest, future))
+            if len(group[1]) >= self.max_batch:
+                del self._groups[key]
+            else:
+                group = None
+        if group is not None:
+            self._send(key, group[1])
+        return future
+
+    def send_sms(self, smsrequest, **kwargs):
+        """
+        Envoyer un sms, coalesced with the other concurrent sends
+
+        :param callback function: The callback function
+            for asynchronous request. (optional)
+        :param SmsUniqueRequest smsrequest: sms request (required)
+        :return: SMSReponse
+                 If the method is called asynchronously,
+                 returns a concurrent.futures.Future.
+        """
+        future = self.submit(smsrequest)
+        callback = kwargs.get('callback')
+        if callback:
+            def done(f):
+                if f.exception() is None:
+                    callback(f.result())
+            future.add_done_callback(done)
+            return future
+        return future.result()
+
+    def flush(self):
+        """
+        Sends every buffered request now.
+        """
+        with self._condition:
+            groups, self._groups = self._groups, {}
+        for key, (_, entries) in groups.items():
+            self._send(key, entries)
+
+    def close(self):
+        """
+        Sends the buffered requests and stops the background flusher.
+        """
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        self._flusher.join()
+        self.flush()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                if self._closed:
+                    return
+                now = time.time()
+                due = [key for key, (deadline, _) in self._groups.items() if deadline <= now]
+                ready = [(key, self._groups.pop(key)[1]) for key in due]
+                if not ready:
+                    deadlines = [deadline for deadline, _ in self._groups.values()]
+                    self._condition.wait(min(deadlines) - now if deadlines else None)
+                    continue
+            for key, entries in ready:
+                self._send(key, entries)
+
+    def _send(self, key, entries):
+        params = dict(zip(GROUP_FIELDS, key))
+        rows = [(request.num, request.sms, request.tracker) for request, _ in entries]
+        request = self.bulk.build_request(rows, **params)
+        try:
+            multi = self.api_client.pool.submit(self.sms_api.send_sms_multi, request)
+        except Exception as e:
+            for _, future in entries:
+                future.set_exception(e)
+            return
+        multi.add_done_callback(lambda f: self._dispatch(f, entries))
+
+    def _dispatch(self, multi, entries):
+        error = multi.exception()
+        if error is not None:
+            for _, future in entries:
+                future.set_exception(error)
+            return
+        response = multi.result()
+        matched = self.bulk.match([request.num for request, _ in entries],
+                                  self.bulk.entries(response))
+        for (_, future), result in zip(entries, matched):
+            future.set_result(SMSReponse(etat=SMSReponseEtat(etat=[result] if result else [])))
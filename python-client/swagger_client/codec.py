@@ -0,0 +1,122 @@
+# coding: utf-8
+
+"""
+    API iSendPro
+
+    JSON codecs for request and response bodies.
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+"""
+
+from __future__ import absolute_import
+
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+# backends tried, in order, when no codec is configured
+PREFERRED_CODECS = ('orjson', 'ujson', 'json')
+
+
+class JsonCodec(object):
+    """
+    JSON codec of the standard library.
+
+    `dumps` returns UTF-8 encoded bytes, ready to be sent as a request
+    body; `loads` accepts the raw response bytes as well as str.
+    """
+    name = 'json'
+
+    def dumps(self, obj):
+        """
+        Serializes `obj` to UTF-8 encoded JSON bytes.
+        """
+        return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+    def loads(self, data):
+        """
+        Parses JSON from bytes or str. Raises ValueError on invalid JSON.
+        """
+        if isinstance(data, bytes) and not isinstance(data, str):
+            data = data.decode('utf-8')
+        return json.loads(data)
+
+
+class OrjsonCodec(JsonCodec):
+    """
+    JSON codec backed by orjson, which works on bytes natively.
+    """
+    name = 'orjson'
+
+    def dumps(self, obj):
+        return orjson.dumps(obj)
+
+    def loads(self, data):
+        return orjson.loads(data)
+
+
+class UjsonCodec(JsonCodec):
+    """
+    JSON codec backed by ujson.
+    """
+    name = 'ujson'
+
+    def dumps(self, obj):
+        return ujson.dumps(obj, ensure_ascii=False).encode('utf-8')
+
+    def loads(self, data):
+        return ujson.loads(data)
+
+
+CODECS = {
+    'json': JsonCodec,
+    'orjson': OrjsonCodec,
+    'ujson': UjsonCodec,
+}
+
+_MODULES = {
+    'json': json,
+    'orjson': orjson,
+    'ujson': ujson,
+}
+
+_codecs = {}
+
+
+def get_codec(name=None):
+    """
+    Returns a JSON codec.
+
+    :param name: 'orjson', 'ujson' or 'json'; if None, the first one
+        installed in `PREFERRED_CODECS` order.
+    :raise ImportError: if the requested backend is not installed.
+    """
+    if name is None:
+        name = next(codec for codec in PREFERRED_CODECS if _MODULES[codec] is not None)
+    if name not in CODECS:
+        raise ValueError("Invalid JSON codec `{0}`, must be one of {1}"
+                         .format(name, sorted(CODECS)))
+    if _MODULES[name] is None:
+        raise ImportError("JSON codec `{0}` requires the {0} package.".format(name))
+    try:
+        return _codecs[name]
+    except KeyError:
+        return _codecs.setdefault(name, CODECS[name]())
@@ -0,0 +1,129 @@
+# coding: utf-8
+
+"""
+    API iSendPro
+
+    Compact, slotted counterparts of the generated models.
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+"""
+
+from __future__ import absolute_import
+
+import threading
+
+from pprint import pformat
+from six import iteritems
+
+_classes = {}
+_lock = threading.Lock()
+
+
+class CompactModel(object):
+    """
+    Base class of the compact models.
+
+    A compact model has the attributes of its generated model as
+    `__slots__`, and `swagger_types` / `attribute_map` as class
+    attributes: an instance holds its values and nothing else, and reads
+    them without property indirection. Setters do no validation.
+    """
+    __slots__ = ()
+
+    swagger_types = {}
+    attribute_map = {}
+
+    def to_dict(self):
+        """
+        Returns the model properties as a dict
+        """
+        result = {}
+
+        for attr, _ in iteritems(self.swagger_types):
+            value = getattr(self, attr)
+            if isinstance(value, list):
+                result[attr] = [x.to_dict() if hasattr(x, "to_dict") else x
+                                for x in value]
+            elif hasattr(value, "to_dict"):
+                result[attr] = value.to_dict()
+            elif isinstance(value, dict):
+                result[attr] = {k: v.to_dict() if hasattr(v, "to_dict") else v
+                                for k, v in iteritems(value)}
+            else:
+                result[attr] = value
+
+        return result
+
+    def to_str(self):
+        """
+        Returns the string representation of the model
+        """
+        return pformat(self.to_dict())
+
+    def __repr__(self):
+        """
+        For `print` and `pprint`
+        """
+        return self.to_str()
+
+    def __eq__(self, other):
+        """
+        Returns true if both objects are equal
+        """
+        if type(self) is not type(other):
+            return False
+        return all(getattr(self, attr) == getattr(other, attr) for attr in self.__slots__)
+
+    def __ne__(self, other):
+        """
+        Returns true if both objects are not equal
+        """
+        return not self == other
+
+
+def compact_class(klass):
+    """
+    Returns the compact class of a generated model class, creating it on
+    first use. The compact class has the same name and attribute names as
+    the model, so existing attribute reads keep working.
+
+    :param klass: generated model class.
+    """
+    try:
+        return _classes[klass]
+    except KeyError:
+        pass
+    with _lock:
+        if klass not in _classes:
+            instance = klass()
+            attrs = tuple(instance.swagger_types)
+            _classes[klass] = type(klass.__name__, (CompactModel,), {
+                '__slots__': attrs,
+                '__init__': _make_init(attrs),
+                '__module__': __name__,
+                '__doc__': "Compact form of `%s.%s`." % (klass.__module__, klass.__name__),
+                'swagger_types': dict(instance.swagger_types),
+                'attribute_map': dict(instance.attribute_map),
+            })
+    return _classes[klass]
+
+
+def _make_init(attrs):
+    # a plain `__init__(self, a=None, b=None)` assigning the slots, as
+    # collections.namedtuple does, is much faster than a **kwargs loop
+    source = "def __init__(self%s):\n    %s\n" % (
+        ''.join(', %s=None' % attr for attr in attrs),
+        '\n    '.join('self.%s = %s' % (attr, attr) for attr in attrs) or 'pass')
+    namespace = {}
+    exec(source, namespace)
+    return namespace['__init__']
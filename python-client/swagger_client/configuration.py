@@ -64,9 +64,52 @@ class Configuration(object):
         self.host = "https://apirest.isendpro.com/cgi-bin"
         # Default api client
         self.api_client = None
+        # Default asyncio api client
+        self.async_api_client = None
         # Temp file folder for downloading files
         self.temp_folder_path = None
 
+        # Thread pool for asynchronous (callback) requests
+        # Number of worker threads
+        self.thread_pool_size = 8
+        # Number of requests allowed to wait for a worker
+        self.thread_pool_queue_size = 64
+        # Block callers when the queue is full, instead of raising `queue.Full`
+        self.thread_pool_block = True
+
+        # Connection pool
+        # Connections kept open per host; requests beyond it open extra
+        # connections which are discarded afterwards (or wait, see below).
+        # None keeps one per worker of the thread pool, `thread_pool_size`
+        self.connection_pool_maxsize = None
+        # Make requests wait for a free connection instead of opening extra ones
+        self.connection_pool_block = False
+        # Connect and read timeouts, in seconds (None waits forever)
+        self.connect_timeout = None
+        self.read_timeout = None
+        # Enable TCP keep-alive probes on the connections
+        self.tcp_keepalive = True
+        # Connections opened to `host` when an ApiClient is created
+        self.warm_up_connections = 0
+
+        # RetryPolicy of the API calls (see retry.py); None uses the default
+        # policy, retrying read-only endpoints and tracked /sms, /smsmulti
+        self.retry_policy = None
+
+        # RateLimiter shaping the API calls per keyid and resource path
+        # (see rate_limit.py); None sends requests as soon as possible
+        self.rate_limiter = None
+
+        # JSON codec of request and response bodies: 'orjson', 'ujson' or
+        # 'json'; None picks the fastest one installed
+        self.json_codec = None
+        # JSON bodies whose list fields hold more entries than this are
+        # encoded while they are sent (see `StreamingBody`); None disables
+        self.stream_body_threshold = 10000
+        # Send streamed bodies with `Transfer-Encoding: chunked` instead of
+        # computing their Content-Length with an extra encoding pass
+        self.stream_body_chunked = False
+
         # Authentication Settings
         # dict to store API key(s)
         self.api_key = {}
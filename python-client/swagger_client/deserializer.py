@@ -0,0 +1,265 @@
+# coding: utf-8
+
+"""
+    API iSendPro
+
+    Precompiled deserialization of JSON data into models.
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+"""
+
+from __future__ import absolute_import
+
+from datetime import date, datetime
+
+from six import iteritems
+
+from . import models
+from .compact import compact_class
+from .rest import ApiException
+
+# special handling of `long` (python2 only)
+try:
+    # Python 2
+    long
+except NameError:
+    # Python 3
+    long = int
+
+try:
+    # Python 2
+    unicode
+except NameError:
+    # Python 3
+    unicode = str
+
+# response modes
+MODEL = 'model'
+COMPACT = 'compact'
+RAW = 'raw'
+RESPONSE_MODES = (MODEL, COMPACT, RAW)
+
+PRIMITIVE_TYPES = {
+    'int': int,
+    'long': long,
+    'float': float,
+    'str': str,
+    'bool': bool,
+}
+
+
+def _primitive_converter(klass):
+    def convert(data):
+        if data is None or data.__class__ is klass:
+            return data
+        try:
+            return klass(data)
+        except UnicodeEncodeError:
+            return unicode(data)
+        except TypeError:
+            return data
+    return convert
+
+
+def _object_converter(data):
+    return data
+
+
+def _date_converter(string):
+    if string is None:
+        return None
+    try:
+        from dateutil.parser import parse
+        return parse(string).date()
+    except ImportError:
+        return string
+    except ValueError:
+        raise ApiException(
+            status=0,
+            reason="Failed to parse `{0}` into a date object"
+            .format(string)
+        )
+
+
+def _datetime_converter(string):
+    if string is None:
+        return None
+    try:
+        from dateutil.parser import parse
+        return parse(string)
+    except ImportError:
+        return string
+    except ValueError:
+        raise ApiException(
+            status=0,
+            reason="Failed to parse `{0}` into a datetime object".
+            format(string)
+        )
+
+
+class Deserializer(object):
+    """
+    Deserializes JSON data into models with precompiled plans.
+
+    A type, given as a swagger type string ('str', 'list[SMSReponseEtatEtat]',
+    'dict(str, int)', 'SMSReponse'...) or as a class, is compiled once into
+    a converter function. For a model the converter follows a plan of
+    (json key, attribute, converter) tuples built from its `swagger_types`
+    and `attribute_map`, so no `eval`, regular expression or type dispatch
+    happens while a response is parsed.
+
+    Converters and plans are cached on the instance; `get_deserializer`
+    returns one instance per response mode, shared between all clients.
+
+    The response mode selects what models are deserialized into:
+
+    - 'model': the generated model classes.
+    - 'compact': slotted classes with class-level metadata (see
+      `compact.compact_class`), with the same attribute names; much
+      lighter for large responses.
+    - 'raw': nothing is converted, the parsed JSON is returned as is.
+
+    :param models_module: module where model classes are looked up.
+    :param mode: response mode, 'model', 'compact' or 'raw'.
+    """
+
+    def __init__(self, models_module=models, mode=MODEL):
+        if mode not in RESPONSE_MODES:
+            raise ValueError("Invalid response mode `{0}`, must be one of {1}"
+                             .format(mode, RESPONSE_MODES))
+        self.models = models_module
+        self.mode = mode
+        self._converters = {}
+        self._plans = {}
+
+    def deserialize(self, data, klass):
+        """
+        Deserializes dict, list, str into an object.
+
+        :param data: dict, list or str.
+        :param klass: class literal, or string of class name.
+        :return: object.
+        """
+        if self.mode == RAW:
+            return data
+        return self.converter(klass)(data)
+
+    def converter(self, klass):
+        """
+        Returns the cached converter function of a type, compiling it on
+        first use.
+
+        :param klass: class literal, or string of class name.
+        """
+        try:
+            return self._converters[klass]
+        except KeyError:
+            convert = self._converters[klass] = self._compile(klass)
+            return convert
+
+    def plan(self, klass):
+        """
+        Returns the cached plan of a model class: a tuple of
+        (json key, attribute, converter) tuples.
+
+        :param klass: model class.
+        """
+        try:
+            return self._plans[klass]
+        except KeyError:
+            pass
+        instance = klass()
+        plan = tuple((instance.attribute_map[attr], attr, self.converter(attr_type))
+                     for attr, attr_type in iteritems(instance.swagger_types))
+        self._plans[klass] = plan
+        return plan
+
+    def _compile(self, klass):
+        if isinstance(klass, str):
+            if klass.startswith('list['):
+                return self._list_converter(self.converter(klass[5:-1]))
+            if klass.startswith('dict('):
+                return self._dict_converter(self.converter(klass[5:-1].split(',', 1)[1].strip()))
+            if klass in PRIMITIVE_TYPES:
+                klass = PRIMITIVE_TYPES[klass]
+            elif klass == 'object':
+                klass = object
+            elif klass == 'date':
+                klass = date
+            elif klass == 'datetime':
+                klass = datetime
+            else:
+                klass = getattr(self.models, klass)
+
+        if klass in (int, long, float, str, bool):
+            return _primitive_converter(klass)
+        elif klass == object:
+            return _object_converter
+        elif klass == date:
+            return _date_converter
+        elif klass == datetime:
+            return _datetime_converter
+        else:
+            return self._model_converter(klass)
+
+    @staticmethod
+    def _list_converter(convert_item):
+        def convert(data):
+            if data is None:
+                return None
+            return [convert_item(item) for item in data]
+        return convert
+
+    @staticmethod
+    def _dict_converter(convert_value):
+        def convert(data):
+            if data is None:
+                return None
+            return {k: convert_value(v) for k, v in iteritems(data)}
+        return convert
+
+    def _model_converter(self, klass):
+        # the plan is resolved on first call, so that models referring to
+        # each other can be compiled
+        resolved = []
+        if self.mode == COMPACT:
+            build = compact_class(klass)
+        else:
+            build = klass
+
+        def convert(data):
+            if data is None:
+                return None
+            if not resolved:
+                resolved.append(self.plan(klass))
+            if not isinstance(data, dict):
+                return build()
+            return build(**{attr: convert_value(data[key])
+                            for key, attr, convert_value in resolved[0]
+                            if key in data})
+        return convert
+
+
+_deserializers = {}
+
+
+def get_deserializer(mode=MODEL):
+    """
+    Returns the shared `Deserializer` of a response mode.
+
+    :param mode: response mode, 'model', 'compact' or 'raw'.
+    """
+    try:
+        return _deserializers[mode]
+    except KeyError:
+        return _deserializers.setdefault(mode, Deserializer(mode=mode))
@@ -0,0 +1,97 @@
+# coding: utf-8
+
+"""
+    API iSendPro
+
+    Bounded thread pool used for the `callback=` asynchronous mode.
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+"""
+
+from __future__ import absolute_import
+
+import sys
+import threading
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+from six.moves.queue import Full
+
+
+class BoundedExecutor(object):
+    """
+    Thread pool whose backlog is bounded.
+
+    At most `max_workers` tasks run at once and at most `queue_size` more
+    wait for a worker. Once that limit is reached `submit` applies
+    backpressure: it blocks until a slot frees up, or raises
+    `queue.Full` when `block` is False or `timeout` expires.
+
+    :param max_workers: number of worker threads.
+    :param queue_size: number of tasks allowed to wait for a worker.
+    :param block: whether `submit` waits for a free slot.
+    :param timeout: maximum number of seconds `submit` waits, None for no limit.
+    """
+
+    def __init__(self, max_workers=8, queue_size=64, block=True, timeout=None):
+        self.max_workers = max_workers
+        self.queue_size = queue_size
+        self.block = block
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(max_workers + queue_size)
+        if sys.version_info >= (3, 6):
+            self._executor = ThreadPoolExecutor(max_workers=max_workers,
+                                                thread_name_prefix='swagger_client')
+        else:
+            self._executor = ThreadPoolExecutor(max_workers=max_workers)
+
+    def submit(self, fn, *args, **kwargs):
+        """
+        Schedules `fn(*args, **kwargs)` and returns its
+        `concurrent.futures.Future`.
+        """
+        if self.block:
+            acquired = self._acquire(self.timeout) \
+                if self.timeout is not None else self._slots.acquire()
+        else:
+            acquired = self._slots.acquire(False)
+        if not acquired:
+            raise Full("executor backlog is full ({0} tasks)".format(
+                self.max_workers + self.queue_size))
+
+        try:
+            future = self._executor.submit(fn, *args, **kwargs)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def _acquire(self, timeout):
+        if sys.version_info >= (3, 2):
+            return self._slots.acquire(timeout=timeout)
+        # python 2 semaphores have no timeout
+        deadline = time.time() + timeout
+        while not self._slots.acquire(False):
+            if time.time() >= deadline:
+                return False
+            time.sleep(0.005)
+        return True
+
+    def shutdown(self, wait=True):
+        """
+        Stops accepting tasks and releases the worker threads.
+
+        :param wait: wait for pending tasks to complete.
+        """
+        self._executor.shutdown(wait=wait)
@@ -0,0 +1,246 @@
+# coding: utf-8
+
+"""
+    API iSendPro
+
+    Result cache for HLR lookups.
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+"""
+
+from __future__ import absolute_import
+
+import sqlite3
+import threading
+import time
+
+from collections import OrderedDict
+
+from .apis.hlr_api import HlrApi
+from .models.hl_rrequest import HLRrequest
+from .models.hlr_reponse import HLRReponse
+from .models.hlr_reponse_etat import HLRReponseEtat
+from .models.hlr_reponse_etat_etat import HLRReponseEtatEtat
+from .numbers import normalize_num, num_keys
+
+
+class HlrCache(object):
+    """
+    Two-tier cache of HLR results keyed by normalised number.
+
+    Entries live `ttl` seconds. Recently used entries are kept in an
+    in-memory LRU of `maxsize` entries; when `path` is given every entry
+    is also written to a SQLite database so that the cache survives
+    restarts. The cache is safe to share between threads.
+
+    :param ttl: lifetime of an entry, in seconds.
+    :param maxsize: number of entries kept in memory.
+    :param path: SQLite database file, None for a memory-only cache.
+    """
+
+    def __init__(self, ttl=86400, maxsize=10000, path=None):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.path = path
+        self._lock = threading.Lock()
+        self._memory = OrderedDict()
+        self._db = None
+        if path:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute("CREATE TABLE IF NOT EXISTS hlr ("
+                             "num TEXT PRIMARY KEY, tel TEXT, operateur TEXT, expires REAL)")
+            self._db.commit()
+
+    def get_many(self, nums):
+        """
+        Looks up several normalised numbers.
+
+        :param nums: list of normalised numbers.
+        :return: dict of number -> HLRReponseEtatEtat for the hits.
+        """
+        now = time.time()
+        found = {}
+        with self._lock:
+            for num in nums:
+                item = self._memory.get(num)
+                if item is None:
+                    continue
+                if item[0] <= now:
+                    del self._memory[num]
+                    continue
+                # most recently used last (move_to_end is not on py27)
+                del self._memory[num]
+                self._memory[num] = item
+                found[num] = item[1]
+
+            missing = [num for num in set(nums) if num not in found]
+            if self._db is not None and missing:
+                for start in range(0, len(missing), 500):
+                    chunk = missing[start:start + 500]
+                    rows = self._db.execute(
+                        "SELECT num, tel, operateur, expires FROM hlr "
+                        "WHERE expires > ? AND num IN (%s)" % ','.join('?' * len(chunk)),
+                        [now] + chunk)
+                    for num, tel, operateur, expires in rows:
+                        entry = HLRReponseEtatEtat(tel=tel, operateur=operateur)
+                        self._remember(num, expires, entry)
+                        found[num] = entry
+        return found
+
+    def get(self, num):
+        """
+        Looks up one normalised number.
+
+        :return: HLRReponseEtatEtat, or None when absent or expired.
+        """
+        return self.get_many([num]).get(num)
+
+    def set_many(self, entries):
+        """
+        Stores results.
+
+        :param entries: dict of normalised number -> HLRReponseEtatEtat.
+        """
+        expires = time.time() + self.ttl
+        with self._lock:
+            for num, entry in entries.items():
+                self._remember(num, expires, entry)
+            if self._db is not None:
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO hlr (num, tel, operateur, expires) VALUES (?, ?, ?, ?)",
+                    [(num, entry.tel, entry.operateur, expires) for num, entry in entries.items()])
+                self._db.commit()
+
+    def set(self, num, entry):
+        """
+        Stores the result of one normalised number.
+        """
+        self.set_many({num: entry})
+
+    def purge(self):
+        """
+        Removes the expired entries from both tiers.
+        """
+        now = time.time()
+        with self._lock:
+            for num in [num for num, item in self._memory.items() if item[0] <= now]:
+                del self._memory[num]
+            if self._db is not None:
+                self._db.execute("DELETE FROM hlr WHERE expires <= ?", (now,))
+                self._db.commit()
+
+    def clear(self):
+        """
+        Removes every entry from both tiers.
+        """
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM hlr")
+                self._db.commit()
+
+    def close(self):
+        """
+        Closes the SQLite database.
+        """
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def _remember(self, num, expires, entry):
+        self._memory.pop(num, None)
+        self._memory[num] = (expires, entry)
+        while len(self._memory) > self.maxsize:
+            self._memory.popitem(last=False)
+
+
+class CachedHlrApi(HlrApi):
+    """
+    HlrApi answering from an `HlrCache` when possible.
+
+    Only the numbers missing from the cache are sent to /hlr; fresh and
+    cached `HLRReponseEtatEtat` entries are returned in the order of
+    `hlrrequest.num`, one per requested number, None for the numbers the
+    API did not answer for.
+
+    >>> api = CachedHlrApi(cache=HlrCache(ttl=7 * 86400, path='hlr.sqlite'))
+    >>> response = api.get_hlr(hlrrequest)
+
+    :param api_client: ApiClient to send with.
+    :param cache: HlrCache, an in-memory one with default settings if None.
+    """
+
+    def __init__(self, api_client=None, cache=None):
+        super(CachedHlrApi, self).__init__(api_client)
+        self.cache = cache if cache is not None else HlrCache()
+
+    def get_hlr(self, hlrrequest, **kwargs):
+        """
+        Vérifier la validité d'un numéro, en utilisant le cache
+
+        :param callback function: The callback function
+            for asynchronous request. (optional)
+        :param HLRrequest hlrrequest: (required)
+        :return: HLRReponse
+                 If the method is called asynchronously,
+                 returns a concurrent.futures.Future.
+        """
+        callback = kwargs.pop('callback', None)
+        if callback:
+            def run():
+                response = self.get_hlr(hlrrequest, **kwargs)
+                callback(response)
+                return response
+            return self.api_client.pool.submit(run)
+
+        if hlrrequest is None:
+            raise ValueError("Missing the required parameter `hlrrequest` when calling `get_hlr`")
+
+        nums = list(hlrrequest.num or [])
+        keys = num_keys(nums)
+        entries = self.cache.get_many(keys)
+
+        misses = OrderedDict()
+        for num, key in zip(nums, keys):
+            if key not in entries and key not in misses:
+                misses[key] = num
+
+        if misses:
+            request = HLRrequest(get_hlr=hlrrequest.get_hlr, keyid=hlrrequest.keyid,
+                                 num=list(misses.values()))
+            response = super(CachedHlrApi, self).get_hlr(request, **kwargs)
+            fresh = response.etat.etat if response and response.etat else None
+            fresh = self._match(list(misses), fresh or [])
+            self.cache.set_many(fresh)
+            entries.update(fresh)
+
+        return HLRReponse(etat=HLRReponseEtat(etat=[entries.get(key) for key in keys]))
+
+    def _match(self, keys, results):
+        """
+        Associates /hlr results to the requested keys, by number when the
+        results carry one. Results are only matched by position when none
+        carries a number and there is one per key; keys left unmatched are
+        not cached.
+        """
+        if len(results) == len(keys) and not any(result.tel for result in results):
+            return dict(zip(keys, results))
+        requested = set(keys)
+        matched = {}
+        for result in results:
+            if result.tel:
+                key = normalize_num(result.tel)
+                if key in requested:
+                    matched[key] = result
+        return matched
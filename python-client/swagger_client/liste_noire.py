@@ -0,0 +1,290 @@
+# coding: utf-8
+
+"""
+    API iSendPro
+
+    Local mirror of the liste noire.
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+"""
+
+from __future__ import absolute_import
+
+import hashlib
+import math
+import os
+import re
+import struct
+import tempfile
+import threading
+import time
+
+from itertools import islice
+
+from .configuration import Configuration
+from .apis.set_liste_noire_api import SetListeNoireApi
+from .numbers import normalize_num, num_keys
+from .reports import iter_report_rows
+
+# a cell holding a phone number: 9 digits or more, with optional +, spaces
+# or dots (but no dashes, which would also match dates)
+_NUM_CELL = re.compile(r'^\+?(?:\d[ .]?){8,}\d$')
+
+
+class BloomFilter(object):
+    """
+    Bloom filter of strings, sized for `capacity` entries with a false
+    positive rate of `error_rate`: about 1.2 bytes per entry at 1%.
+
+    :param capacity: expected number of entries.
+    :param error_rate: probability that an absent entry is reported present.
+    """
+
+    def __init__(self, capacity, error_rate=0.001):
+        capacity = max(1, capacity)
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, int(round(self.size / float(capacity) * math.log(2))))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, value):
+        digest = hashlib.md5(value.encode('utf-8')).digest()
+        h1, h2 = struct.unpack('<QQ', digest)
+        return [(h1 + i * h2) % self.size for i in range(self.hashes)]
+
+    def add(self, value):
+        for position in self._positions(value):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, value):
+        bits = self.bits
+        for position in self._positions(value):
+            if not bits[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
+
+
+class ListeNoire(object):
+    """
+    Local mirror of the liste noire of an account, to drop blacklisted
+    recipients before sending instead of paying a round trip and an
+    error code for each of them.
+
+    `sync` downloads the whole list from /getlistenoire; `add` and
+    `remove` call /setlistenoire and /dellistenoire and update the mirror
+    at once. Numbers are normalised (see `numbers.num_keys`), so
+    0680010203 and +33680010203 are the same entry. Lookups are O(1) and
+    the mirror is safe to share between threads.
+
+    The numbers are kept in a set. With `bloom_error_rate`, they are only
+    kept in a `BloomFilter`, about 1.8 bytes per number at 0.1% instead
+    of around 100 for the set, for lists too large to hold in memory.
+    The filter has false positives: that share of the recipients which
+    are not blacklisted is dropped as well. Numbers removed since the
+    last `sync` are kept in a set aside, the filter can not forget them.
+
+    >>> liste_noire = ListeNoire()
+    >>> liste_noire.sync(keyid)
+    >>> sender = BulkSmsSender(liste_noire=liste_noire)
+
+    :param api_client: ApiClient to call the API with.
+    :param bloom_error_rate: false positive rate of the Bloom filter
+        replacing the set, that is the share of the recipients dropped
+        by mistake; None keeps the exact set.
+    :param chunk_size: size of the chunks written to disk while
+        downloading, in bytes.
+    """
+
+    def __init__(self, api_client=None, bloom_error_rate=None, chunk_size=64 * 1024):
+        self.set_liste_noire_api = SetListeNoireApi(api_client)
+        self.api_client = self.set_liste_noire_api.api_client
+        self.bloom_error_rate = bloom_error_rate
+        self.chunk_size = chunk_size
+        self.synced_at = None
+        self._lock = threading.Lock()
+        self._nums = set()
+        self._bloom = None
+        self._bloom_count = 0
+        self._removed = set()
+
+    def __len__(self):
+        """
+        Number of blacklisted numbers, approximate with a Bloom filter.
+        """
+        if self._bloom is not None:
+            return self._bloom_count
+        return len(self._nums)
+
+    def __contains__(self, num):
+        return self.contains(normalize_num(num))
+
+    def contains(self, num):
+        """
+        Tells whether a normalised number is blacklisted.
+        """
+        bloom = self._bloom
+        if bloom is not None:
+            return num in bloom and num not in self._removed
+        return num in self._nums
+
+    def load(self, nums):
+        """
+        Replaces the mirror with `nums`.
+
+        :param nums: iterable of numbers, in any format.
+        """
+        nums = set(num_keys(list(nums)))
+        count = len(nums)
+        bloom = None
+        if self.bloom_error_rate is not None:
+            # only the filter is kept
+            bloom = BloomFilter(count, self.bloom_error_rate)
+            for num in nums:
+                bloom.add(num)
+            nums = set()
+        with self._lock:
+            self._nums = nums
+            self._bloom = bloom
+            self._bloom_count = count
+            self._removed = set()
+            self.synced_at = time.time()
+
+    def sync(self, keyid):
+        """
+        Downloads the liste noire and replaces the mirror with it.
+
+        The zipped CSV returned by /getlistenoire is streamed to a
+        temporary file and read lazily; every cell looking like a phone
+        number is taken.
+
+        :param str keyid: Clé API.
+        :return: number of blacklisted numbers.
+        """
+        path = self.download(keyid)
+        try:
+            self.load(self._numbers(path))
+        finally:
+            os.remove(path)
+        return len(self)
+
+    def download(self, keyid, path=None):
+        """
+        Downloads the liste noire to `path`.
+
+        :param str keyid: Clé API.
+        :param path: destination file, a temporary file if None.
+        :return: path of the downloaded file.
+        """
+        if path is None:
+            fd, path = tempfile.mkstemp(suffix='.zip', dir=Configuration().temp_folder_path)
+            os.close(fd)
+
+        header_params = {
+            'Accept': self.api_client.select_header_accept(['application/json']),
+            'Content-Type': self.api_client.select_header_content_type(
+                ['application/x-www-form-urlencoded']),
+        }
+        response = self.api_client.call_api('/getlistenoire', 'POST', {},
+                                            {'keyid': keyid, 'getListeNoire': '1'},
+                                            header_params, post_params=[], files={},
+                                            response_type='file', auth_settings=[],
+                                            _return_http_data_only=True,
+                                            _preload_content=False)
+        try:
+            with open(path, 'wb') as f:
+                for chunk in response.stream(self.chunk_size):
+                    f.write(chunk)
+        except Exception:
+            os.remove(path)
+            raise
+        finally:
+            response.release_conn()
+        return path
+
+    def add(self, keyid, num):
+        """
+        Blacklists a number, through /setlistenoire and in the mirror.
+
+        :param str keyid: Clé API.
+        :param str num: numéro de mobile à insérer en liste noire.
+        :return: LISTENOIREReponse
+        """
+        response = self.set_liste_noire_api.set_liste_noire(keyid, '1', num)
+        num = normalize_num(num)
+        with self._lock:
+            if self._bloom is not None:
+                if num in self._removed or num not in self._bloom:
+                    self._removed.discard(num)
+                    self._bloom.add(num)
+                    self._bloom_count += 1
+            else:
+                self._nums.add(num)
+        return response
+
+    def remove(self, keyid, num):
+        """
+        Removes a number from the liste noire, through /dellistenoire and
+        in the mirror.
+
+        :param str keyid: Clé API.
+        :param str num: numéro de mobile à supprimer.
+        :return: LISTENOIREReponse
+        """
+        header_params = {
+            'Accept': self.api_client.select_header_accept(['application/json']),
+            'Content-Type': self.api_client.select_header_content_type(
+                ['application/x-www-form-urlencoded']),
+        }
+        response = self.api_client.call_api('/dellistenoire', 'POST', {},
+                                            {'keyid': keyid, 'delListeNoire': '1', 'num': num},
+                                            header_params, post_params=[], files={},
+                                            response_type='LISTENOIREReponse',
+                                            auth_settings=[], _return_http_data_only=True)
+        num = normalize_num(num)
+        with self._lock:
+            if self._bloom is not None:
+                if num in self._bloom and num not in self._removed:
+                    self._removed.add(num)
+                    self._bloom_count -= 1
+            else:
+                self._nums.discard(num)
+        return response
+
+    def filter(self, rows, dropped=None, chunk_size=10000):
+        """
+        Yields the rows whose recipient is not blacklisted, normalising
+        `chunk_size` numbers at a time.
+
+        :param rows: iterable of (num, ...) tuples.
+        :param dropped: list receiving the dropped rows, if given.
+        :return: iterator of rows.
+        """
+        contains = self.contains
+        rows = iter(rows)
+        while True:
+            chunk = list(islice(rows, chunk_size))
+            if not chunk:
+                return
+            for row, num in zip(chunk, num_keys([row[0] for row in chunk])):
+                if contains(num):
+                    if dropped is not None:
+                        dropped.append(row)
+                else:
+                    yield row
+
+    @staticmethod
+    def _numbers(path):
+        for row in iter_report_rows(path):
+            for cell in row:
+                cell = cell.strip()
+                if _NUM_CELL.match(cell):
+                    yield cell
@@ -0,0 +1,207 @@
+# coding: utf-8
+
+"""
+    API iSendPro
+
+    Normalisation, validation and deduplication of phone numbers.
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+"""
+
+from __future__ import absolute_import
+
+import re
+
+from itertools import islice
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# characters allowed between the digits of a number
+SEPARATORS = (' ', '.', '-', '(', ')', '/', '+', '\t')
+
+_DIGITS = re.compile(r'^[0-9]+$')
+
+# lists shorter than this are normalised in pure python
+VECTORIZE_THRESHOLD = 128
+
+
+def normalize_num(num):
+    """
+    Returns the international form of a french or international number,
+    used as canonical key: 0680010203, +33 6 80 01 02 03 and
+    0033680010203 all give 33680010203.
+    """
+    digits = re.sub(r'\D', '', str(num))
+    if digits.startswith('00'):
+        return digits[2:]
+    if len(digits) == 10 and digits.startswith('0'):
+        return '33' + digits[1:]
+    return digits
+
+
+def is_valid_num(num):
+    """
+    Tells whether a normalised number can be sent to: 8 to 15 digits
+    (E.164) not starting with 0, and 9 digits after a french 33 prefix.
+    """
+    if not _DIGITS.match(num) or not 8 <= len(num) <= 15 or num[0] == '0':
+        return False
+    if num.startswith('33'):
+        return len(num) == 11 and num[2] != '0'
+    return True
+
+
+def canonical_num(num):
+    """
+    Returns the normalised form of a number, or None if it is not valid.
+    """
+    num = str(num)
+    for separator in SEPARATORS:
+        num = num.replace(separator, '')
+    if not _DIGITS.match(num):
+        return None
+    num = normalize_num(num)
+    return num if is_valid_num(num) else None
+
+
+def normalize_nums(nums):
+    """
+    Normalises a whole column of numbers.
+
+    Numbers are stripped of their separators, converted to their
+    international form like `normalize_num`, and validated like
+    `is_valid_num`. NumPy arrays, and lists when NumPy is installed, are
+    processed with vectorized string operations.
+
+    :param nums: list or numpy array of numbers, in any format.
+    :return: list of normalised numbers, None for the invalid ones; or,
+        for an array, an array with '' for the invalid ones.
+    """
+    if numpy is not None and isinstance(nums, numpy.ndarray):
+        return _normalize_array(nums)
+    if numpy is not None and len(nums) >= VECTORIZE_THRESHOLD:
+        return [num or None for num in _normalize_array(numpy.asarray(nums, dtype=str)).tolist()]
+    return [canonical_num(num) for num in nums]
+
+
+def num_keys(nums):
+    """
+    Returns the keys under which numbers are cached, blacklisted or
+    deduplicated: their normalised form, computed like `normalize_nums`,
+    or `normalize_num` of the invalid ones.
+
+    :param nums: list of numbers, in any format.
+    :return: list of str.
+    """
+    return [key or normalize_num(num) for num, key in zip(nums, normalize_nums(nums))]
+
+
+def unique_nums(nums):
+    """
+    Normalises a column of numbers and drops the invalid ones and the
+    duplicates, keeping the first occurrence of each number.
+
+    :param nums: list or numpy array of numbers, in any format.
+    :return: (numbers, indexes) where `numbers` are the unique normalised
+        numbers, a list or an array like `nums`, and `indexes` their
+        positions in `nums`.
+    """
+    canonical = normalize_nums(nums)
+    if numpy is not None and isinstance(canonical, numpy.ndarray):
+        valid = numpy.flatnonzero(canonical != '')
+        _, first = numpy.unique(canonical[valid], return_index=True)
+        indexes = valid[numpy.sort(first)]
+        return canonical[indexes], indexes
+    seen = set()
+    numbers = []
+    indexes = []
+    for i, num in enumerate(canonical):
+        if num is not None and num not in seen:
+            seen.add(num)
+            numbers.append(num)
+            indexes.append(i)
+    return numbers, indexes
+
+
+def unique_rows(rows, seen=None, dropped=None, chunk_size=10000):
+    """
+    Yields the rows of a (possibly lazy) stream whose number is valid and
+    was not seen before, normalising `chunk_size` numbers at a time.
+
+    :param rows: iterable of (num, ...) tuples.
+    :param seen: set of the normalised numbers already sent, updated.
+    :param dropped: list receiving the invalid and duplicate rows, if given.
+    :return: iterator of rows.
+    """
+    seen = set() if seen is None else seen
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return
+        for row, num in zip(chunk, normalize_nums([row[0] for row in chunk])):
+            if num is None or num in seen:
+                if dropped is not None:
+                    dropped.append(row)
+                continue
+            seen.add(num)
+            yield row
+
+
+def _normalize_array(nums):
+    # works on the matrix of the code points of the numbers, one row per
+    # number, NUL padded
+    nums = numpy.ascontiguousarray(numpy.asarray(nums, dtype=str).ravel())
+    count = len(nums)
+    width = nums.dtype.itemsize // numpy.dtype('U1').itemsize
+    if width < 3:
+        nums, width = nums.astype('U3'), 3
+    codes = nums.view(numpy.uint32).reshape(count, width)
+
+    # classify the characters: 1 for digits, 2 for separators and padding,
+    # 0 for junk, which makes the number invalid
+    table = numpy.zeros(129, dtype=numpy.uint8)
+    table[ord('0'):ord('9') + 1] = 1
+    table[[ord(c) for c in SEPARATORS] + [0]] = 2
+    kinds = table[numpy.minimum(codes, 128)]
+    clean = kinds.all(axis=1)
+    digits = kinds == 1
+    lengths = digits.sum(axis=1)
+
+    # pack the digits of each row to the left
+    values = codes[digits]
+    offsets = numpy.arange(count) * width - (numpy.cumsum(lengths) - lengths)
+    packed = numpy.zeros((count, width), dtype=numpy.uint32)
+    packed.ravel()[numpy.arange(len(values)) + numpy.repeat(offsets, lengths)] = values
+
+    # rewrite the prefixes
+    zero, three = ord('0'), ord('3')
+    international = (packed[:, 0] == zero) & (packed[:, 1] == zero)
+    national = (lengths == 10) & (packed[:, 0] == zero) & ~international
+    plain = ~(international | national)
+    out = numpy.zeros((count, width + 1), dtype=numpy.uint32)
+    out[plain, :width] = packed[plain]
+    out[international, :width - 2] = packed[international, 2:]
+    out[national, 0] = three
+    out[national, 1] = three
+    out[national, 2:width + 1] = packed[national, 1:]
+    lengths = lengths - 2 * international + national
+
+    valid = clean & (lengths >= 8) & (lengths <= 15) & (out[:, 0] != zero)
+    french = (out[:, 0] == three) & (out[:, 1] == three)
+    valid &= ~french | ((lengths == 11) & (out[:, 2] != zero))
+    out[~valid] = 0
+    return out.view('U%d' % (width + 1)).reshape(count)
@@ -0,0 +1,483 @@
+# coding: utf-8
+
+"""
+    API iSendPro
+
+    Durable outbound sms queue.
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+"""
+
+from __future__ import absolute_import
+
+import copy
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+
+from collections import namedtuple, OrderedDict
+
+from .bulk import BulkSmsSender
+from .coalesce import GROUP_FIELDS
+from .retry import CONNECT, REJECTED, STATUS, classify
+
+logger = logging.getLogger(__name__)
+
+# message states
+PENDING = 'pending'    # waiting to be sent
+LEASED = 'leased'      # taken by a worker, not sent yet
+INFLIGHT = 'inflight'  # being sent, the outcome is not known yet
+SENT = 'sent'          # accepted by the API
+DEAD = 'dead'          # given up, see `error`
+
+FIELDS = ('tracker', 'num', 'sms') + GROUP_FIELDS
+
+OutboxMessage = namedtuple('OutboxMessage', ('id', 'attempts', 'lease_token') + FIELDS)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    id INTEGER PRIMARY KEY,
+    tracker TEXT NOT NULL UNIQUE,
+    num TEXT NOT NULL,
+    sms TEXT NOT NULL,
+    keyid TEXT,
+    emetteur TEXT,
+    smslong TEXT,
+    nostop TEXT,
+    ucs2 TEXT,
+    date_envoi TEXT,
+    state TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    available_at REAL NOT NULL DEFAULT 0,
+    lease_until REAL,
+    lease_token TEXT,
+    code INTEGER,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS outbox_state ON outbox (state, available_at);
+"""
+
+
+class SmsOutbox(object):
+    """
+    Persistent queue of sms to send, stored in a SQLite database in WAL
+    mode, so that sends survive process restarts.
+
+    Messages go from `pending` to `leased` when a worker takes them, to
+    `inflight` just before the request is sent, then to `sent` (ack) or
+    back to `pending` after a failure, until `max_attempts` is reached and
+    they are dead-lettered. The `tracker` of a message is its
+    deduplication key: enqueueing a tracker twice keeps the first one, and
+    it is sent to the API so that results can be reconciled.
+
+    After a crash, `recover` puts leased messages back in the queue and
+    resolves in-flight ones, whose request may have reached the API,
+    without sending them twice.
+
+    >>> outbox = SmsOutbox('outbox.sqlite')
+    >>> outbox.enqueue_many(rows, keyid, emetteur='iSendPro')
+    >>> OutboxWorkers(outbox, workers=4).start()
+
+    :param path: SQLite database file.
+    :param lease_seconds: time a worker may hold leased messages before
+        they are handed to another worker.
+    :param max_attempts: number of send attempts before dead-lettering.
+    :param retry_delay: delay before a failed message is sent again, in
+        seconds.
+    """
+
+    def __init__(self, path, lease_seconds=60, max_attempts=5, retry_delay=30):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self._local = threading.local()
+        self._connections = []
+        self._connections_lock = threading.Lock()
+        db = self._db()
+        db.executescript(_SCHEMA)
+        columns = [row[1] for row in db.execute("PRAGMA table_info(outbox)")]
+        if 'lease_token' not in columns:
+            # databases created before leases had a token
+            try:
+                db.execute("ALTER TABLE outbox ADD COLUMN lease_token TEXT")
+            except sqlite3.OperationalError:
+                # added by another process in the meantime
+                pass
+
+    def _db(self):
+        # sqlite3 connections can not be shared between threads
+        db = getattr(self._local, 'db', None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=30, isolation_level=None,
+                                 check_same_thread=False)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            self._local.db = db
+            with self._connections_lock:
+                self._connections.append(db)
+        return db
+
+    def enqueue(self, num, sms, keyid, tracker=None, **params):
+        """
+        Queues one sms.
+
+        :param str num: recipient.
+        :param str sms: message.
+        :param str keyid: Clé API.
+        :param tracker: deduplication key, a random one if None.
+        :param params: emetteur, smslong, nostop, ucs2, date_envoi.
+        :return: the tracker of the message.
+        """
+        return self.enqueue_many([(num, sms, tracker)], keyid, **params)[0]
+
+    def enqueue_many(self, rows, keyid, emetteur=None, smslong=None, nostop=None,
+                     ucs2=None, date_envoi=None):
+        """
+        Queues many sms in one transaction. Rows whose tracker is already
+        queued are ignored.
+
+        :param rows: iterable of (num, sms) or (num, sms, tracker) tuples.
+        :param str keyid: Clé API.
+        :return: list of the trackers of the rows.
+        """
+        trackers = []
+
+        def values():
+            for row in rows:
+                tracker = row[2] if len(row) > 2 and row[2] else uuid.uuid4().hex
+                trackers.append(tracker)
+                yield (tracker, row[0], row[1], keyid, emetteur, smslong, nostop, ucs2,
+                       date_envoi)
+
+        db = self._db()
+        with _transaction(db):
+            db.executemany("INSERT OR IGNORE INTO outbox (%s) VALUES (%s)"
+                           % (', '.join(FIELDS), ', '.join('?' * len(FIELDS))), values())
+        return trackers
+
+    def lease(self, limit=500):
+        """
+        Takes up to `limit` messages ready to be sent, oldest first. They
+        share a new `lease_token`, which `mark_inflight` checks.
+
+        :return: list of OutboxMessage.
+        """
+        now = time.time()
+        token = uuid.uuid4().hex
+        db = self._db()
+        with _transaction(db):
+            rows = db.execute(
+                "SELECT id, attempts, %s FROM outbox "
+                "WHERE (state = ? AND available_at <= ?) OR (state = ? AND lease_until < ?) "
+                "ORDER BY id LIMIT ?" % ', '.join(FIELDS),
+                (PENDING, now, LEASED, now, limit)).fetchall()
+            db.executemany("UPDATE outbox SET state = ?, lease_until = ?, lease_token = ? "
+                           "WHERE id = ?",
+                           [(LEASED, now + self.lease_seconds, token, row[0]) for row in rows])
+        return [OutboxMessage(row[0], row[1], token, *row[2:]) for row in rows]
+
+    def mark_inflight(self, trackers, lease_token):
+        """
+        Records that the messages are about to be sent, if they are still
+        held by the lease: once it expired, they may have been leased by
+        another worker.
+
+        :param trackers: list of trackers.
+        :param lease_token: `lease_token` of the messages.
+        :return: list of the trackers claimed, which may be sent.
+        """
+        claimed = []
+        db = self._db()
+        with _transaction(db):
+            for tracker in trackers:
+                if db.execute("UPDATE outbox SET state = ?, attempts = attempts + 1 "
+                              "WHERE tracker = ? AND state = ? AND lease_token = ?",
+                              (INFLIGHT, tracker, LEASED, lease_token)).rowcount:
+                    claimed.append(tracker)
+        return claimed
+
+    def ack(self, trackers, codes=None):
+        """
+        Records that the messages were accepted by the API.
+
+        :param trackers: list of trackers.
+        :param codes: list of the API return codes, if known.
+        """
+        codes = codes or [None] * len(trackers)
+        self._update("UPDATE outbox SET state = ?, code = ?, error = NULL WHERE tracker = ?",
+                     [(SENT, code, tracker) for tracker, code in zip(trackers, codes)])
+
+    def fail(self, trackers, error):
+        """
+        Records a failed attempt: the messages are sent again after
+        `retry_delay`, or dead-lettered after `max_attempts`.
+        """
+        db = self._db()
+        with _transaction(db):
+            db.executemany(
+                "UPDATE outbox SET state = CASE WHEN attempts >= ? THEN ? ELSE ? END, "
+                "available_at = ?, error = ? WHERE tracker = ?",
+                [(self.max_attempts, DEAD, PENDING, time.time() + self.retry_delay,
+                  str(error), tracker) for tracker in trackers])
+
+    def dead_letter(self, trackers, error, codes=None):
+        """
+        Gives up the messages.
+        """
+        codes = codes or [None] * len(trackers)
+        self._update("UPDATE outbox SET state = ?, code = ?, error = ? WHERE tracker = ?",
+                     [(DEAD, code, str(error), tracker) for tracker, code in zip(trackers, codes)])
+
+    def recover(self, reconcile=None, resend_unknown=False):
+        """
+        Recovers the messages of a crashed process. Call it at startup,
+        before starting the workers.
+
+        Leased messages were not sent and go back to the queue. In-flight
+        ones may have reached the API: `reconcile`, given their list,
+        returns the trackers known to be sent (from a campaign report for
+        instance), which are acked. The others are queued again if
+        `resend_unknown` is set, dead-lettered otherwise, so that nothing
+        is sent twice.
+
+        :param reconcile: function of a list of OutboxMessage returning
+            the trackers which were sent.
+        :param resend_unknown: queue again the in-flight messages which
+            could not be reconciled.
+        :return: dict with the number of `requeued`, `reconciled` and
+            `unknown` messages.
+        """
+        db = self._db()
+        with _transaction(db):
+            requeued = db.execute("UPDATE outbox SET state = ? WHERE state = ?",
+                                  (PENDING, LEASED)).rowcount
+            inflight = [OutboxMessage(*row) for row in db.execute(
+                "SELECT id, attempts, lease_token, %s FROM outbox WHERE state = ? ORDER BY id"
+                % ', '.join(FIELDS), (INFLIGHT,))]
+
+        sent = set(reconcile(inflight)) if reconcile and inflight else set()
+        unknown = [message.tracker for message in inflight if message.tracker not in sent]
+        self.ack([message.tracker for message in inflight if message.tracker in sent])
+        if resend_unknown:
+            self._update("UPDATE outbox SET state = ? WHERE tracker = ?",
+                         [(PENDING, tracker) for tracker in unknown])
+        else:
+            self.dead_letter(unknown, 'outcome unknown after a crash')
+        return {'requeued': requeued, 'reconciled': len(inflight) - len(unknown),
+                'unknown': len(unknown)}
+
+    def stats(self):
+        """
+        Returns the number of messages per state.
+        """
+        counts = dict.fromkeys((PENDING, LEASED, INFLIGHT, SENT, DEAD), 0)
+        counts.update(self._db().execute("SELECT state, COUNT(*) FROM outbox GROUP BY state"))
+        return counts
+
+    def dead_letters(self, limit=100):
+        """
+        Returns dead-lettered messages with their error.
+
+        :return: list of (OutboxMessage, code, error).
+        """
+        rows = self._db().execute(
+            "SELECT id, attempts, lease_token, %s, code, error FROM outbox "
+            "WHERE state = ? ORDER BY id LIMIT ?" % ', '.join(FIELDS), (DEAD, limit))
+        return [(OutboxMessage(*row[:-2]), row[-2], row[-1]) for row in rows]
+
+    def close(self):
+        """
+        Closes the database connections of every thread.
+        """
+        with self._connections_lock:
+            for db in self._connections:
+                db.close()
+            self._connections = []
+        self._local = threading.local()
+
+    def _update(self, sql, params):
+        if not params:
+            return
+        db = self._db()
+        with _transaction(db):
+            db.executemany(sql, params)
+
+
+class _transaction(object):
+    # explicit BEGIN IMMEDIATE: the write lock is taken upfront, so
+    # concurrent leases never pick the same messages
+
+    def __init__(self, db):
+        self.db = db
+
+    def __enter__(self):
+        self.db.execute("BEGIN IMMEDIATE")
+        return self.db
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.db.execute("COMMIT" if exc_type is None else "ROLLBACK")
+
+
+class OutboxWorkers(object):
+    """
+    Pool of threads draining an `SmsOutbox` through /smsmulti.
+
+    Each worker leases up to `batch_size` messages, groups them by
+    keyid, emetteur, smslong, nostop, ucs2 and date_envoi, and sends each
+    group with the api client (rate limiting and connection pooling
+    included), once the messages are marked in flight; those whose lease
+    expired meanwhile are left to the worker which took them again.
+    Results are matched to the messages by number:
+    messages answered with code 0 are acked, others dead-lettered with the
+    API message. A request which failed before reaching the API (connection
+    error, 4xx status) is retried later by the outbox; one which may have
+    been processed (read timeout, 5xx status), like a message without a
+    result, is dead-lettered as 'outcome unknown' rather than sent twice,
+    as `SmsOutbox.recover` does; the retry policy of the api client is
+    restricted accordingly for /smsmulti.
+
+    :param outbox: SmsOutbox to drain.
+    :param api_client: ApiClient to send with, the configured default if None.
+    :param workers: number of worker threads.
+    :param batch_size: maximum number of messages per /smsmulti request.
+    :param poll_interval: wait when the outbox is empty, in seconds.
+    :param liste_noire: `ListeNoire` mirror; blacklisted messages are
+        dead-lettered without being sent.
+    """
+
+    def __init__(self, outbox, api_client=None, workers=4, batch_size=500, poll_interval=0.5,
+                 liste_noire=None):
+        self.outbox = outbox
+        # the outbox decides what is sent again: a copy of the client,
+        # sharing its connections, never resends a request that may have
+        # been processed, even if its retry policy allows it
+        api_client = copy.copy(BulkSmsSender(api_client).api_client)
+        api_client.retry_policy = api_client.retry_policy.without_resending('/smsmulti')
+        self.bulk = BulkSmsSender(api_client, batch_size=batch_size)
+        self.liste_noire = liste_noire
+        self.workers = workers
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self._stop = threading.Event()
+        self._threads = []
+
+    def start(self):
+        """
+        Starts the worker threads.
+        """
+        self._stop.clear()
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._run, name='sms-outbox-%d' % i)
+            thread.daemon = True
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, wait=True):
+        """
+        Stops the workers once their current batch is done.
+        """
+        self._stop.set()
+        if wait:
+            for thread in self._threads:
+                thread.join()
+        self._threads = []
+
+    def run_once(self):
+        """
+        Leases and sends one batch.
+
+        :return: number of messages processed.
+        """
+        messages = self.outbox.lease(self.batch_size)
+        groups = OrderedDict()
+        for message in messages:
+            key = tuple(getattr(message, field) for field in GROUP_FIELDS)
+            groups.setdefault(key, []).append(message)
+        for key, group in groups.items():
+            self._send(dict(zip(GROUP_FIELDS, key)), group)
+        return len(messages)
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                if not self.run_once():
+                    self._stop.wait(self.poll_interval)
+            except Exception:
+                logger.exception("sms outbox worker failed")
+                self._stop.wait(self.poll_interval)
+
+    def _send(self, params, messages):
+        # messages whose lease expired may have been taken by another worker
+        claimed = set(self.outbox.mark_inflight([message.tracker for message in messages],
+                                                messages[0].lease_token))
+        messages = [message for message in messages if message.tracker in claimed]
+        if self.liste_noire is not None:
+            blacklisted = [message for message in messages if message.num in self.liste_noire]
+            if blacklisted:
+                ids = set(message.id for message in blacklisted)
+                messages = [message for message in messages if message.id not in ids]
+                self.outbox.dead_letter([message.tracker for message in blacklisted],
+                                        'liste noire')
+        if not messages:
+            return
+        trackers = [message.tracker for message in messages]
+        request = self.bulk.build_request(
+            [(message.num, message.sms, message.tracker) for message in messages], **params)
+        try:
+            response = self.bulk.sms_api.send_sms_multi(request)
+        except Exception as e:
+            logger.warning("sending %d messages failed: %r", len(messages), e)
+            if _not_sent(e):
+                self.outbox.fail(trackers, e)
+            else:
+                # the request may have been processed, it is not sent twice
+                self.outbox.dead_letter(trackers, 'outcome unknown: %s' % e)
+            return
+
+        pairs, unmatched = _match(messages, self.bulk.entries(response))
+        sent = [(message.tracker, result.code) for message, result in pairs if not result.code]
+        rejected = [(message.tracker, result.code, result.message)
+                    for message, result in pairs if result.code]
+        self.outbox.ack([tracker for tracker, _ in sent], [code for _, code in sent])
+        for tracker, code, error in rejected:
+            self.outbox.dead_letter([tracker], error or 'code %s' % code, [code])
+        if unmatched:
+            self.outbox.dead_letter([message.tracker for message in unmatched],
+                                    'outcome unknown: no result in the response')
+
+
+def _not_sent(error):
+    """
+    Tells whether a failed /smsmulti request is known not to have been
+    processed: the connection failed, or the API refused it with a 4xx
+    status.
+    """
+    kind = classify(error)
+    if kind in (CONNECT, REJECTED):
+        return True
+    return kind == STATUS and 400 <= error.status < 500
+
+
+def _match(messages, results):
+    """
+    Pairs messages with their /smsmulti results.
+
+    :return: list of (message, result) pairs, and list of the messages
+        left without a result.
+    """
+    matched = BulkSmsSender.match([message.num for message in messages], results)
+    pairs = [(message, result) for message, result in zip(messages, matched) if result]
+    return pairs, [message for message, result in zip(messages, matched) if not result]
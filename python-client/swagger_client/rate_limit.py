@@ -0,0 +1,197 @@
+# coding: utf-8
+
+"""
+    API iSendPro
+
+    Client-side rate limiting of the API calls.
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+"""
+
+from __future__ import absolute_import
+
+import json
+import os
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+
+def reserve(state, rate, capacity, tokens, now):
+    """
+    Takes `tokens` from a token bucket, and returns its new state and
+    the time to wait before the tokens are really available.
+
+    The bucket refills at `rate` tokens per second up to `capacity`. It
+    may go below zero: a caller reserves tokens which are not there yet
+    and waits for them, so that concurrent callers are served in order.
+
+    :param state: (tokens, timestamp) of the bucket, None for a full one.
+    :return: ((tokens, timestamp), seconds to wait).
+    """
+    if state is None:
+        available = capacity
+    else:
+        available = min(capacity, state[0] + (now - state[1]) * rate)
+    available -= tokens
+    wait = -available / rate if available < 0 else 0.0
+    return (available, now), wait
+
+
+class MemoryBackend(object):
+    """
+    Bucket states kept in memory, shared by the threads of a process.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._states = {}
+
+    def reserve(self, requests, now):
+        """
+        Reserves tokens in several buckets at once.
+
+        :param requests: list of (key, rate, capacity, tokens).
+        :param now: current time.
+        :return: time to wait, in seconds.
+        """
+        wait = 0.0
+        with self._lock:
+            for key, rate, capacity, tokens in requests:
+                self._states[key], delay = reserve(self._states.get(key), rate, capacity,
+                                                   tokens, now)
+                wait = max(wait, delay)
+        return wait
+
+
+class FileBackend(object):
+    """
+    Bucket states kept in a JSON file locked with `fcntl.flock`, shared
+    by the processes of a host using the same `path`.
+
+    :param path: state file, created if missing.
+    """
+
+    def __init__(self, path):
+        if fcntl is None:
+            raise ImportError('FileBackend requires fcntl (POSIX).')
+        self.path = path
+        self._lock = threading.Lock()
+
+    def reserve(self, requests, now):
+        """
+        Reserves tokens in several buckets at once.
+
+        :param requests: list of (key, rate, capacity, tokens).
+        :param now: current time.
+        :return: time to wait, in seconds.
+        """
+        wait = 0.0
+        with self._lock:
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+                with os.fdopen(os.dup(fd), 'r+') as f:
+                    content = f.read()
+                    states = json.loads(content) if content else {}
+                    for key, rate, capacity, tokens in requests:
+                        name = json.dumps(key)
+                        states[name], delay = reserve(states.get(name), rate, capacity,
+                                                      tokens, now)
+                        wait = max(wait, delay)
+                    f.seek(0)
+                    f.truncate()
+                    f.write(json.dumps(states))
+            finally:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+                os.close(fd)
+        return wait
+
+
+class RateLimiter(object):
+    """
+    Token-bucket rate limiter of the API calls, per keyid and per
+    resource path.
+
+    Every request takes a token from the bucket of its keyid, refilled at
+    `rate` requests per second up to `burst`, and from the bucket of its
+    (keyid, resource path) when `paths` gives a rate for that path.
+    Requests wait for their tokens instead of bursting past the provider
+    limits. Buckets are shared between the threads of a process, or
+    between processes with a `FileBackend`.
+
+    >>> Configuration().rate_limiter = RateLimiter(
+    >>>     rate=20, paths={'/smsmulti': (2, 4), '/hlr': 5},
+    >>>     backend=FileBackend('/tmp/isendpro-rate'))
+
+    :param rate: requests per second per keyid, None for no limit.
+    :param burst: bucket capacity, `rate` if None.
+    :param paths: dict of resource path -> rate or (rate, burst).
+    :param backend: MemoryBackend (default) or FileBackend.
+    """
+
+    def __init__(self, rate=None, burst=None, paths=None, backend=None):
+        self.rate = rate
+        self.burst = burst if burst is not None else rate
+        self.paths = {}
+        for path, limit in (paths or {}).items():
+            if not isinstance(limit, (list, tuple)):
+                limit = (limit, limit)
+            self.paths[path] = tuple(limit)
+        self.backend = backend if backend is not None else MemoryBackend()
+
+    def reserve(self, keyid, resource_path, tokens=1):
+        """
+        Reserves the tokens of a request.
+
+        :param keyid: API key of the request, or None.
+        :param resource_path: resource path of the request.
+        :return: time to wait before sending the request, in seconds.
+        """
+        requests = []
+        if self.rate:
+            requests.append((('keyid', keyid), self.rate, self.burst, tokens))
+        if resource_path in self.paths:
+            rate, burst = self.paths[resource_path]
+            requests.append((('path', keyid, resource_path), rate, burst, tokens))
+        if not requests:
+            return 0.0
+        return self.backend.reserve(requests, time.time())
+
+    def acquire(self, keyid, resource_path, tokens=1):
+        """
+        Waits until a request can be sent.
+
+        :param keyid: API key of the request, or None.
+        :param resource_path: resource path of the request.
+        :return: time waited, in seconds.
+        """
+        wait = self.reserve(keyid, resource_path, tokens)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+def request_keyid(query_params, body):
+    """
+    Returns the keyid of a request, from its query parameters or body.
+    """
+    if query_params and query_params.get('keyid'):
+        return query_params['keyid']
+    if isinstance(body, dict):
+        return body.get('keyid')
+    return getattr(body, 'keyid', None)
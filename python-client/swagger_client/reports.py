@@ -0,0 +1,264 @@
+# coding: utf-8
+
+"""
+    API iSendPro
+
+    Streaming download and lazy parsing of /campagne reports.
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+"""
+
+from __future__ import absolute_import
+
+import csv
+import io
+import os
+import re
+import tempfile
+import zipfile
+
+from collections import Counter, deque
+from datetime import datetime, timedelta
+from itertools import chain
+
+from .configuration import Configuration
+from .apis.campagne_api import CampagneApi
+from .executor import BoundedExecutor
+
+# Date format of the /campagne `date_deb` and `date_fin` parameters
+DATE_FORMAT = '%Y-%m-%d %H:%M'
+
+# a cell starting with a date and time: YYYY-MM-DD hh:mm or DD/MM/YYYY hh:mm
+_MINUTE = re.compile(r'^(?:(\d{4}-\d{2}-\d{2})[ T]|(\d{2})/(\d{2})/(\d{4}) )(\d{2}:\d{2})')
+
+
+def iter_report_rows(path, delimiter=None, encoding='utf-8'):
+    """
+    Lazily yields the CSV rows of a downloaded report.
+
+    The report may be a zip archive, in which case the CSV members are
+    read one after the other straight from the archive, or a plain CSV
+    file. Rows are parsed as they are read, the file is never loaded
+    whole in memory.
+
+    :param path: path of the report.
+    :param delimiter: CSV delimiter, guessed from the first line if None.
+    :param encoding: text encoding of the CSV.
+    :return: iterator of rows (lists of str).
+    """
+    if zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as archive:
+            for member in archive.infolist():
+                if member.filename.endswith('/'):
+                    continue
+                with archive.open(member) as raw:
+                    text = io.TextIOWrapper(raw, encoding=encoding, newline='')
+                    for row in _iter_csv(text, delimiter):
+                        yield row
+    else:
+        with io.open(path, encoding=encoding, newline='') as text:
+            for row in _iter_csv(text, delimiter):
+                yield row
+
+
+def split_period(date_deb, date_fin, window):
+    """
+    Splits a period into consecutive sub-periods of at most `window`.
+
+    Consecutive sub-periods share their boundary minute, so that no row
+    is lost whether the API treats `date_fin` as inclusive or not; see
+    `CampagneReports.rows_parallel` for the rows of these minutes.
+
+    :param str date_deb: date de debut au format YYYY-MM-DD hh:mm.
+    :param str date_fin: date de fin au format YYYY-MM-DD hh:mm.
+    :param timedelta window: maximum length of a sub-period.
+    :return: list of (date_deb, date_fin) strings.
+    """
+    if window < timedelta(minutes=1):
+        raise ValueError("`window` must be at least one minute")
+    start = datetime.strptime(date_deb, DATE_FORMAT)
+    end = datetime.strptime(date_fin, DATE_FORMAT)
+    if end < start:
+        raise ValueError("`date_fin` is before `date_deb`")
+
+    periods = []
+    while True:
+        stop = min(start + window, end)
+        periods.append((start.strftime(DATE_FORMAT), stop.strftime(DATE_FORMAT)))
+        if stop >= end:
+            return periods
+        start = stop
+
+
+def row_minute(row):
+    """
+    Returns the minute of a report row, as YYYY-MM-DD hh:mm, taken from its
+    first cell holding a date and time (YYYY-MM-DD hh:mm[:ss] or
+    DD/MM/YYYY hh:mm[:ss]); None if it has none.
+    """
+    for cell in row:
+        match = _MINUTE.match(cell.strip())
+        if match:
+            iso, day, month, year, time = match.groups()
+            return '%s %s' % (iso or '%s-%s-%s' % (year, month, day), time)
+    return None
+
+
+def _iter_csv(text, delimiter):
+    first = text.readline()
+    if not first:
+        return
+    if delimiter is None:
+        try:
+            delimiter = csv.Sniffer().sniff(first, delimiters=';,\t|').delimiter
+        except csv.Error:
+            delimiter = ';'
+    for row in csv.reader(chain([first], text), delimiter=delimiter):
+        if row:
+            yield row
+
+
+class CampagneReports(object):
+    """
+    Streams /campagne reports to disk and parses them lazily.
+
+    `CampagneApi.get_campagne` reads the whole report in memory before
+    writing it to a temporary file; here the response body is copied to
+    disk in chunks of `chunk_size` bytes as it arrives.
+
+    >>> reports = CampagneReports()
+    >>> for row in reports.rows(keyid, '2016-07-01 00:00', '2016-07-31 23:59'):
+    >>>     print(row)
+
+    :param api_client: ApiClient to download with.
+    :param chunk_size: size of the chunks written to disk, in bytes.
+    """
+
+    def __init__(self, api_client=None, chunk_size=64 * 1024):
+        self.campagne_api = CampagneApi(api_client)
+        self.api_client = self.campagne_api.api_client
+        self.chunk_size = chunk_size
+
+    def download(self, keyid, date_deb, date_fin, path=None):
+        """
+        Downloads the report of a period to `path`.
+
+        :param str keyid: Clé API.
+        :param str date_deb: date de debut au format YYYY-MM-DD hh:mm.
+        :param str date_fin: date de fin au format YYYY-MM-DD hh:mm.
+        :param path: destination file, a temporary file if None.
+        :return: path of the downloaded report.
+        """
+        if path is None:
+            fd, path = tempfile.mkstemp(suffix='.zip', dir=Configuration().temp_folder_path)
+            os.close(fd)
+
+        response = self.campagne_api.get_campagne(keyid, '1', date_deb, date_fin,
+                                                  _preload_content=False)
+        try:
+            with open(path, 'wb') as f:
+                for chunk in response.stream(self.chunk_size):
+                    f.write(chunk)
+        except Exception:
+            os.remove(path)
+            raise
+        finally:
+            response.release_conn()
+        return path
+
+    def rows(self, keyid, date_deb, date_fin, delimiter=None, encoding='utf-8'):
+        """
+        Downloads the report of a period and yields its CSV rows lazily.
+        The downloaded file is removed once the rows are consumed.
+
+        :param str keyid: Clé API.
+        :param str date_deb: date de debut au format YYYY-MM-DD hh:mm.
+        :param str date_fin: date de fin au format YYYY-MM-DD hh:mm.
+        :param delimiter: CSV delimiter, guessed if None.
+        :param encoding: text encoding of the CSV.
+        :return: iterator of rows (lists of str).
+        """
+        path = self.download(keyid, date_deb, date_fin)
+        try:
+            for row in iter_report_rows(path, delimiter, encoding):
+                yield row
+        finally:
+            os.remove(path)
+
+    def rows_parallel(self, keyid, date_deb, date_fin, window=timedelta(days=7),
+                      max_workers=4, minute=row_minute, delimiter=None, encoding='utf-8'):
+        """
+        Downloads the report of a long period as several sub-periods in
+        parallel and yields the merged CSV rows.
+
+        The period is split with `split_period`, at most `max_workers`
+        sub-reports are downloaded at once, and rows are yielded in
+        sub-period order, then file order. Consecutive sub-periods share
+        their boundary minute: the rows of that minute (`minute(row)`) are
+        kept from the first sub-report, and skipped in the next one when
+        they are repeated, so only the rows of one minute are kept in
+        memory. The header line is yielded once. Downloaded files are
+        removed once consumed.
+
+        :param str keyid: Clé API.
+        :param str date_deb: date de debut au format YYYY-MM-DD hh:mm.
+        :param str date_fin: date de fin au format YYYY-MM-DD hh:mm.
+        :param timedelta window: maximum length of a sub-period.
+        :param max_workers: number of concurrent downloads.
+        :param minute: function returning the YYYY-MM-DD hh:mm minute of
+            a row, None if it has none.
+        :param delimiter: CSV delimiter, guessed if None.
+        :param encoding: text encoding of the CSV.
+        :return: iterator of rows (lists of str).
+        """
+        periods = iter(split_period(date_deb, date_fin, window))
+        executor = BoundedExecutor(max_workers=max_workers, queue_size=max_workers)
+        pending = deque()
+        header = None
+        # rows of the boundary minute yielded from the previous sub-report
+        boundary = Counter()
+
+        def schedule():
+            for deb, fin in periods:
+                pending.append((executor.submit(self.download, keyid, deb, fin), deb, fin))
+                if len(pending) >= 2 * max_workers:
+                    return
+
+        try:
+            schedule()
+            while pending:
+                future, deb, fin = pending.popleft()
+                path = future.result()
+                schedule()
+                previous, boundary = boundary, Counter()
+                try:
+                    for i, row in enumerate(iter_report_rows(path, delimiter, encoding)):
+                        # the sub-reports after the first repeat its header line
+                        if i == 0 and header is not None and row == header:
+                            continue
+                        if header is None:
+                            header = row
+                        row_minute = minute(row)
+                        if row_minute == deb and previous[tuple(row)] > 0:
+                            previous[tuple(row)] -= 1
+                            continue
+                        if row_minute == fin:
+                            boundary[tuple(row)] += 1
+                        yield row
+                finally:
+                    os.remove(path)
+        finally:
+            executor.shutdown(wait=True)
+            for future, _, _ in pending:
+                if not future.exception():
+                    os.remove(future.result())
@@ -26,7 +26,7 @@ from __future__ import absolute_import
 
 import sys
 import io
-import json
+import socket
 import ssl
 import certifi
 import logging
@@ -35,7 +35,11 @@ import re
 # python 2 and python 3 compatibility library
 from six import iteritems
 
+from concurrent.futures import ThreadPoolExecutor
+
 from .configuration import Configuration
+from .codec import get_codec
+from .streaming import StreamingBody
 
 try:
     import urllib3
@@ -53,13 +57,40 @@ except ImportError:
 logger = logging.getLogger(__name__)
 
 
+def decode_body(data):
+    """
+    Decodes a response body to str. In python 3 the body is bytes.
+    """
+    if sys.version_info > (3,) and isinstance(data, bytes):
+        return data.decode('utf8')
+    return data
+
+
 class RESTResponse(io.IOBase):
 
     def __init__(self, resp):
         self.urllib3_response = resp
         self.status = resp.status
         self.reason = resp.reason
-        self.data = resp.data
+        self.raw_data = resp.data
+        self._data = None
+
+    @property
+    def data(self):
+        """
+        Gets the response body, decoded to str on first access.
+        `raw_data` holds the undecoded bytes.
+        """
+        if self._data is None:
+            self._data = decode_body(self.raw_data)
+        return self._data
+
+    @data.setter
+    def data(self, value):
+        """
+        Sets the decoded response body.
+        """
+        self._data = value
 
     def getheaders(self):
         """
@@ -102,26 +133,77 @@ class RESTClientObject(object):
         # key file
         key_file = Configuration().key_file
 
+        # json codec of request bodies
+        self.codec = get_codec(Configuration().json_codec)
+
+        config = Configuration()
+
+        # keep-alive probes on top of urllib3 default socket options
+        socket_options = list(urllib3.connection.HTTPConnection.default_socket_options)
+        if config.tcp_keepalive:
+            socket_options.append((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1))
+
         # https pool manager
         self.pool_manager = urllib3.PoolManager(
             num_pools=pools_size,
+            maxsize=config.connection_pool_maxsize or config.thread_pool_size,
+            block=config.connection_pool_block,
+            timeout=urllib3.Timeout(connect=config.connect_timeout,
+                                    read=config.read_timeout),
+            socket_options=socket_options,
             cert_reqs=cert_reqs,
             ca_certs=ca_certs,
             cert_file=cert_file,
             key_file=key_file
         )
 
+    def warm_up(self, url, connections):
+        """
+        Opens connections to the host of `url` ahead of the first requests,
+        so that they do not pay the TCP and TLS handshakes. The connections
+        are opened by HEAD requests on `url`, sent in parallel and all held
+        until the last one is answered, so each gets its own connection;
+        at most the pool maxsize are kept. Failures are logged, not raised.
+
+        :param url: url of the host, e.g. `Configuration().host`.
+        :param connections: number of connections to open.
+        :return: number of connections opened.
+        """
+        connections = min(connections, self.pool_manager.connection_pool_kw['maxsize'])
+        if connections <= 0:
+            return 0
+
+        def head(_):
+            try:
+                return self.pool_manager.request('HEAD', url, preload_content=False,
+                                                 retries=False)
+            except Exception as e:
+                logger.warning("warm-up connection to %s failed: %s", url, e)
+                return None
+
+        with ThreadPoolExecutor(max_workers=connections) as executor:
+            responses = list(executor.map(head, range(connections)))
+        opened = 0
+        for response in responses:
+            if response is not None:
+                response.release_conn()
+                opened += 1
+        return opened
+
     def request(self, method, url, query_params=None, headers=None,
-                body=None, post_params=None):
+                body=None, post_params=None, _preload_content=True):
         """
         :param method: http request method
         :param url: http request url
         :param query_params: query parameters in the url
         :param headers: http request headers
-        :param body: request json body, for `application/json`
+        :param body: request json body, for `application/json`, or a
+                     `StreamingBody` encoded while it is sent
         :param post_params: request post parameters,
                             `application/x-www-form-urlencode`
                             and `multipart/form-data`
+        :param _preload_content: if False, the urllib3.HTTPResponse object is
+                                 returned without reading its body.
         """
         method = method.upper()
         assert method in ['GET', 'HEAD', 'DELETE', 'POST', 'PUT', 'PATCH', 'OPTIONS']
@@ -142,18 +224,29 @@ class RESTClientObject(object):
             if method in ['POST', 'PUT', 'PATCH', 'OPTIONS', 'DELETE']:
                 if query_params:
                     url += '?' + urlencode(query_params)
-                if re.search('json', headers['Content-Type'], re.IGNORECASE):
+                if re.search('json', headers['Content-Type'], re.IGNORECASE) \
+                   and isinstance(body, StreamingBody):
+                    if not body.chunked:
+                        headers['Content-Length'] = str(body.content_length())
+                    r = self.pool_manager.request(method, url,
+                                                  body=iter(body),
+                                                  headers=headers,
+                                                  chunked=body.chunked,
+                                                  preload_content=_preload_content)
+                elif re.search('json', headers['Content-Type'], re.IGNORECASE):
                     request_body = None
                     if body:
-                        request_body = json.dumps(body)
+                        request_body = self.codec.dumps(body)
                     r = self.pool_manager.request(method, url,
                                                   body=request_body,
-                                                  headers=headers)
+                                                  headers=headers,
+                                                  preload_content=_preload_content)
                 if headers['Content-Type'] == 'application/x-www-form-urlencoded':
                     r = self.pool_manager.request(method, url,
                                                   fields=post_params,
                                                   encode_multipart=False,
-                                                  headers=headers)
+                                                  headers=headers,
+                                                  preload_content=_preload_content)
                 if headers['Content-Type'] == 'multipart/form-data':
                     # must del headers['Content-Type'], or the correct Content-Type
                     # which generated by urllib3 will be overwritten.
@@ -161,74 +254,90 @@ class RESTClientObject(object):
                     r = self.pool_manager.request(method, url,
                                                   fields=post_params,
                                                   encode_multipart=True,
-                                                  headers=headers)
+                                                  headers=headers,
+                                                  preload_content=_preload_content)
             # For `GET`, `HEAD`
             else:
                 r = self.pool_manager.request(method, url,
                                               fields=query_params,
-                                              headers=headers)
+                                              headers=headers,
+                                              preload_content=_preload_content)
         except urllib3.exceptions.SSLError as e:
             msg = "{0}\n{1}".format(type(e).__name__, str(e))
             raise ApiException(status=0, reason=msg)
 
-        r = RESTResponse(r)
+        if not _preload_content:
+            if r.status not in range(200, 206):
+                raise ApiException(http_resp=RESTResponse(r))
+            return r
 
-        # In the python 3, the response.data is bytes.
-        # we need to decode it to string.
-        if sys.version_info > (3,):
-            r.data = r.data.decode('utf8')
+        r = RESTResponse(r)
 
-        # log response body
-        logger.debug("response body: %s" % r.data)
+        # log response body; the body is only decoded when logged or
+        # read through `data`, the deserializer parses `raw_data`
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("response body: %s" % r.data)
 
         if r.status not in range(200, 206):
             raise ApiException(http_resp=r)
 
         return r
 
-    def GET(self, url, headers=None, query_params=None):
+    def GET(self, url, headers=None, query_params=None, _preload_content=True):
         return self.request("GET", url,
                             headers=headers,
-                            query_params=query_params)
+                            query_params=query_params,
+                            _preload_content=_preload_content)
 
-    def HEAD(self, url, headers=None, query_params=None):
+    def HEAD(self, url, headers=None, query_params=None, _preload_content=True):
         return self.request("HEAD", url,
                             headers=headers,
-                            query_params=query_params)
+                            query_params=query_params,
+                            _preload_content=_preload_content)
 
-    def OPTIONS(self, url, headers=None, query_params=None, post_params=None, body=None):
+    def OPTIONS(self, url, headers=None, query_params=None, post_params=None, body=None,
+                _preload_content=True):
         return self.request("OPTIONS", url,
                             headers=headers,
                             query_params=query_params,
                             post_params=post_params,
-                            body=body)
+                            body=body,
+                            _preload_content=_preload_content)
 
-    def DELETE(self, url, headers=None, query_params=None, body=None):
+    def DELETE(self, url, headers=None, query_params=None, body=None,
+               _preload_content=True):
         return self.request("DELETE", url,
                             headers=headers,
                             query_params=query_params,
-                            body=body)
+                            body=body,
+                            _preload_content=_preload_content)
 
-    def POST(self, url, headers=None, query_params=None, post_params=None, body=None):
+    def POST(self, url, headers=None, query_params=None, post_params=None, body=None,
+             _preload_content=True):
         return self.request("POST", url,
                             headers=headers,
                             query_params=query_params,
                             post_params=post_params,
-                            body=body)
+                            body=body,
+                            _preload_content=_preload_content)
 
-    def PUT(self, url, headers=None, query_params=None, post_params=None, body=None):
+    def PUT(self, url, headers=None, query_params=None, post_params=None, body=None,
+            _preload_content=True):
         return self.request("PUT", url,
                             headers=headers,
                             query_params=query_params,
                             post_params=post_params,
-                            body=body)
+                            body=body,
+                            _preload_content=_preload_content)
 
-    def PATCH(self, url, headers=None, query_params=None, post_params=None, body=None):
+    def PATCH(self, url, headers=None, query_params=None, post_params=None, body=None,
+              _preload_content=True):
         return self.request("PATCH", url,
                             headers=headers,
                             query_params=query_params,
                             post_params=post_params,
-                            body=body)
+                            body=body,
+                            _preload_content=_preload_content)
 
 
 class ApiException(Exception):
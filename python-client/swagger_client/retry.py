@@ -0,0 +1,290 @@
+# coding: utf-8
+
+"""
+    API iSendPro
+
+    Retry policy of the API calls.
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+"""
+
+from __future__ import absolute_import
+
+import copy
+import logging
+import random
+import time
+
+from email.utils import parsedate_tz, mktime_tz
+
+import urllib3
+
+from .rest import ApiException
+
+try:
+    import asyncio
+except ImportError:
+    asyncio = None
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+logger = logging.getLogger(__name__)
+
+# kinds of failures
+CONNECT = 'connect'      # the request was not sent
+REJECTED = 'rejected'    # the request was refused before being processed (429)
+STATUS = 'status'        # error status, the request may have been processed
+TRANSPORT = 'transport'  # the connection failed after the request was sent
+
+# endpoints which do not change anything
+READ_ONLY_PATHS = ('/credit', '/comptage', '/hlr', '/campagne', '/getlistenoire')
+
+_CONNECT_ERRORS = (urllib3.exceptions.NewConnectionError,
+                   urllib3.exceptions.ConnectTimeoutError)
+_TRANSPORT_ERRORS = (urllib3.exceptions.HTTPError,)
+if aiohttp is not None:
+    _CONNECT_ERRORS += (aiohttp.ClientConnectorError,)
+    _TRANSPORT_ERRORS += (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError)
+if asyncio is not None:
+    _TRANSPORT_ERRORS += (asyncio.TimeoutError,)
+
+
+def classify(error):
+    """
+    Returns the kind of failure of an exception raised by a request:
+    CONNECT, REJECTED, STATUS, TRANSPORT, or None if it is not a
+    transient failure.
+    """
+    if isinstance(error, ApiException):
+        if error.status == 429:
+            return REJECTED
+        if error.status:
+            return STATUS
+        return None
+    if isinstance(error, urllib3.exceptions.MaxRetryError):
+        error = error.reason
+    if isinstance(error, _CONNECT_ERRORS):
+        return CONNECT
+    if isinstance(error, _TRANSPORT_ERRORS):
+        return TRANSPORT
+    return None
+
+
+def has_trackers(body):
+    """
+    Tells whether a /sms or /smsmulti body carries a tracker for every
+    message. The API does not deduplicate trackers, but callers which
+    reconcile duplicates by tracker can opt in to resending such requests
+    with `RetryRule('/smsmulti', idempotent=has_trackers)`.
+
+    :param body: SMSRequest, SmsUniqueRequest, or their dict form.
+    """
+    if isinstance(body, dict):
+        tracker = body.get('tracker')
+    else:
+        tracker = getattr(body, 'tracker', None)
+    if isinstance(tracker, (list, tuple)):
+        return bool(tracker) and all(tracker)
+    return bool(tracker)
+
+
+class RetryRule(object):
+    """
+    Retry rule of an endpoint.
+
+    Requests which were not sent (connection failures) or were rejected
+    with 429 are always retried. Other failures, 5xx statuses and
+    connections lost after the request was sent, are retried only if the
+    request is `idempotent`.
+
+    :param path: resource path, e.g. '/credit'; None for the default rule.
+    :param idempotent: True, False, or a function of the request body
+        telling whether this request can be sent twice.
+    :param max_attempts: number of attempts, the first one included;
+        None uses the policy's.
+    :param statuses: HTTP statuses to retry.
+    """
+
+    def __init__(self, path=None, idempotent=False, max_attempts=None,
+                 statuses=(429, 500, 502, 503, 504)):
+        self.path = path
+        self.idempotent = idempotent
+        self.max_attempts = max_attempts
+        self.statuses = frozenset(statuses)
+
+    def is_idempotent(self, body):
+        """
+        Tells whether the request with this body can be sent twice.
+        """
+        if callable(self.idempotent):
+            return bool(self.idempotent(body))
+        return bool(self.idempotent)
+
+
+def default_rules():
+    """
+    Returns the default rules: read-only endpoints are retried, /sms and
+    /smsmulti only when the request was not sent or was rejected with 429,
+    since a message may have been delivered before a 5xx or a timeout.
+    """
+    rules = [RetryRule(path, idempotent=True) for path in READ_ONLY_PATHS]
+    rules += [RetryRule('/sms'), RetryRule('/smsmulti')]
+    return rules
+
+
+class RetryPolicy(object):
+    """
+    Decides whether and when failed API calls are retried.
+
+    The delay before attempt n + 1 is drawn uniformly between 0 and
+    `backoff_factor * 2 ** (n - 1)` seconds, capped to `max_backoff`
+    ("full jitter"), or without jitter the upper bound itself. A
+    `Retry-After` header, in seconds or as an HTTP date, takes precedence
+    when `respect_retry_after` is set, up to `max_retry_after` seconds.
+
+    >>> Configuration().retry_policy = RetryPolicy(max_attempts=5, backoff_factor=1)
+
+    :param rules: list of `RetryRule`, `default_rules()` if None.
+    :param default: rule of the endpoints without one, only retrying
+        requests which were not sent or were rejected.
+    :param max_attempts: number of attempts, the first one included;
+        1 disables retries.
+    :param backoff_factor: base of the exponential backoff, in seconds.
+    :param max_backoff: maximum delay between attempts, in seconds.
+    :param jitter: randomize the delays.
+    :param respect_retry_after: follow the `Retry-After` header.
+    :param max_retry_after: maximum delay accepted from `Retry-After`.
+    """
+
+    def __init__(self, rules=None, default=None, max_attempts=3, backoff_factor=0.5,
+                 max_backoff=30.0, jitter=True, respect_retry_after=True,
+                 max_retry_after=120.0):
+        self.rules = {rule.path: rule for rule in (default_rules() if rules is None else rules)}
+        self.default = default or RetryRule()
+        self.max_attempts = max_attempts
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.respect_retry_after = respect_retry_after
+        self.max_retry_after = max_retry_after
+
+    def rule(self, resource_path):
+        """
+        Returns the rule of a resource path.
+        """
+        return self.rules.get(resource_path, self.default)
+
+    def without_resending(self, *paths):
+        """
+        Returns a copy of the policy retrying the requests to `paths` only
+        when they were not sent or were rejected with 429, whatever their
+        rules say.
+        """
+        policy = copy.copy(self)
+        policy.rules = dict(self.rules)
+        for path in paths:
+            rule = self.rule(path)
+            policy.rules[path] = RetryRule(path, max_attempts=rule.max_attempts,
+                                           statuses=rule.statuses)
+        return policy
+
+    def retry_delay(self, resource_path, body, attempt, error):
+        """
+        Returns the delay in seconds before retrying a failed attempt, or
+        None if it must not be retried.
+
+        :param resource_path: resource path of the request.
+        :param body: request body, as given to the API method.
+        :param attempt: number of the failed attempt, starting at 1.
+        :param error: exception raised by the attempt.
+        """
+        rule = self.rule(resource_path)
+        max_attempts = rule.max_attempts or self.max_attempts
+        if attempt >= max_attempts:
+            return None
+
+        kind = classify(error)
+        if kind in (STATUS, REJECTED) and error.status not in rule.statuses:
+            return None
+        if kind in (STATUS, TRANSPORT) and not rule.is_idempotent(body):
+            return None
+        if kind is None:
+            return None
+
+        if self.respect_retry_after and isinstance(error, ApiException):
+            retry_after = self.retry_after(error)
+            if retry_after is not None:
+                return min(retry_after, self.max_retry_after)
+
+        backoff = min(self.max_backoff, self.backoff_factor * 2 ** (attempt - 1))
+        if self.jitter:
+            return random.uniform(0, backoff)
+        return backoff
+
+    @staticmethod
+    def retry_after(error):
+        """
+        Returns the delay requested by the `Retry-After` header of an
+        error response, in seconds, or None.
+        """
+        value = None
+        if error.headers:
+            value = error.headers.get('Retry-After')
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        date = parsedate_tz(value)
+        if date is None:
+            return None
+        return max(0.0, mktime_tz(date) - time.time())
+
+    def call(self, func, resource_path, body=None, sleep=time.sleep):
+        """
+        Calls `func` until it succeeds or the failure must not be retried.
+
+        :param func: function making the request.
+        :param resource_path: resource path of the request.
+        :param body: request body, as given to the API method.
+        :param sleep: function waiting between attempts.
+        :return: the result of `func`.
+        """
+        attempt = 1
+        while True:
+            try:
+                return func()
+            except Exception as e:
+                delay = self.on_failure(resource_path, body, attempt, e)
+                if delay is None:
+                    raise
+                sleep(delay)
+                attempt += 1
+
+    def on_failure(self, resource_path, body, attempt, error):
+        """
+        Decides what to do after a failed attempt, for `call` and the
+        asyncio client: returns the delay before the next attempt, logging
+        it, or None if the error must be raised.
+
+        Takes the parameters of `retry_delay`.
+        """
+        delay = self.retry_delay(resource_path, body, attempt, error)
+        if delay is not None:
+            logger.warning("%s failed (attempt %d): %r, retrying in %.2fs",
+                           resource_path, attempt, error, delay)
+        return delay
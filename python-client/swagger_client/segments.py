@@ -0,0 +1,233 @@
+# coding: utf-8
+
+"""
+    API iSendPro
+
+    Offline SMS segment counting, equivalent to the /comptage endpoint.
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+"""
+
+from __future__ import absolute_import
+
+from collections import namedtuple
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from .models.comptage_reponse import ComptageReponse
+from .models.comptage_reponse_etat import ComptageReponseEtat
+from .models.comptage_reponse_etat_etat import ComptageReponseEtatEtat
+
+# GSM 03.38 basic character set (the escape character 0x1B excluded)
+GSM7_BASIC = frozenset(
+    u"@£$¥èéùìòÇ\nØø\rÅåΔ_ΦΓΛΩΠΨΣΘΞÆæßÉ !\"#¤%&'()*+,-./0123456789:;<=>?"
+    u"¡ABCDEFGHIJKLMNOPQRSTUVWXYZÄÖÑÜ§¿abcdefghijklmnopqrstuvwxyzäöñüà"
+)
+# GSM 03.38 extension table, each character costs an escape plus itself
+GSM7_EXTENSION = frozenset(u"\f^{}\\[~]|€")
+GSM7_CHARSET = GSM7_BASIC | GSM7_EXTENSION
+
+GSM7 = 'GSM7'
+UCS2 = 'UCS2'
+
+# (single sms, part of a concatenated sms) limits per encoding
+LIMITS = {
+    GSM7: (160, 153),
+    UCS2: (70, 67),
+}
+
+# Length of the "STOP SMS" mention added when the sender is customised
+STOP_LENGTH = 12
+
+SmsCount = namedtuple('SmsCount', ['encoding', 'nb_caractere', 'nb_sms'])
+SmsCountBatch = namedtuple('SmsCountBatch', ['encoding', 'nb_caractere', 'nb_sms'])
+
+# Number of messages classified at once by `count_sms_batch`
+BATCH_CHUNK_SIZE = 65536
+
+
+def is_set(value):
+    """
+    Returns whether an API flag such as `nostop` or `ucs2` is enabled.
+    """
+    return value is not None and str(value) not in ('', '0')
+
+
+def stop_length(emetteur=None, nostop=None):
+    """
+    Returns the number of characters the platform appends for the
+    STOP mention: added when `emetteur` is set, unless `nostop` is.
+    """
+    if emetteur and not is_set(nostop):
+        return STOP_LENGTH
+    return 0
+
+
+def nb_sms(encoding, nb_caractere):
+    """
+    Returns the number of sms billed for `nb_caractere` characters
+    (septets in GSM7, 16-bit units in UCS2).
+    """
+    single, part = LIMITS[encoding]
+    if nb_caractere <= 0:
+        return 0
+    if nb_caractere <= single:
+        return 1
+    return -(-nb_caractere // part)
+
+
+def count_sms(sms, emetteur=None, nostop=None, ucs2=None):
+    """
+    Counts the characters and sms of a message.
+
+    The message is encoded in GSM7 when every character belongs to the
+    GSM 03.38 basic or extension table (extension characters count
+    twice), and in UCS2 otherwise or when `ucs2` is set. The STOP mention
+    is included in the count when applicable.
+
+    :param str sms: message to send.
+    :param str emetteur: customised sender, if any.
+    :param str nostop: "1" if the STOP mention is removed.
+    :param str ucs2: "1" to force UCS2.
+    :return: SmsCount(encoding, nb_caractere, nb_sms).
+    """
+    sms = sms or u''
+    chars = set(sms)
+    if not is_set(ucs2) and chars <= GSM7_CHARSET:
+        encoding = GSM7
+        nb_caractere = len(sms)
+        extended = chars & GSM7_EXTENSION
+        if extended:
+            nb_caractere += sum(map(sms.count, extended))
+    else:
+        encoding = UCS2
+        nb_caractere = len(sms.encode('utf-16-le')) // 2
+
+    nb_caractere += stop_length(emetteur, nostop)
+    return SmsCount(encoding, nb_caractere, nb_sms(encoding, nb_caractere))
+
+
+def _cost_table():
+    """
+    Builds the septet cost of every BMP code point: 1 for the basic
+    table, 2 for the extension table, 0 outside GSM7.
+    """
+    table = numpy.zeros(0x10000, dtype=numpy.int8)
+    table[[ord(char) for char in GSM7_BASIC]] = 1
+    table[[ord(char) for char in GSM7_EXTENSION]] = 2
+    return table
+
+
+_COST_TABLE = _cost_table() if numpy is not None else None
+
+
+def _count_chunk(messages, force_ucs2):
+    """
+    Classifies a chunk of messages at once and returns the arrays
+    (is_gsm7, nb_caractere) before the STOP mention.
+    """
+    lengths = numpy.fromiter(map(len, messages), dtype=numpy.int64, count=len(messages))
+    bounds = numpy.zeros(len(messages) + 1, dtype=numpy.int64)
+    numpy.cumsum(lengths, out=bounds[1:])
+
+    code_points = numpy.frombuffer(u''.join(messages).encode('utf-32-le'), dtype='<u4')
+    costs = _COST_TABLE[numpy.minimum(code_points, 0xFFFF)]
+
+    def per_message(values):
+        totals = numpy.zeros(len(values) + 1, dtype=numpy.int64)
+        numpy.cumsum(values, out=totals[1:])
+        return totals[bounds[1:]] - totals[bounds[:-1]]
+
+    septets = per_message(costs)
+    outside = per_message(costs == 0)
+    astral = per_message(code_points > 0xFFFF)
+
+    is_gsm7 = outside == 0
+    if force_ucs2:
+        is_gsm7[:] = False
+    return is_gsm7, numpy.where(is_gsm7, septets, lengths + astral)
+
+
+def count_sms_batch(messages, emetteur=None, nostop=None, ucs2=None):
+    """
+    Counts the characters and sms of a whole column of messages.
+
+    Gives the same figures as `count_sms` for each message. When NumPy is
+    installed, characters are classified through a lookup table over the
+    code points of the column and the results are NumPy arrays; otherwise
+    it falls back to `count_sms` and returns lists.
+
+    :param messages: list or NumPy array of messages.
+    :param str emetteur: customised sender, if any.
+    :param str nostop: "1" if the STOP mention is removed.
+    :param str ucs2: "1" to force UCS2.
+    :return: SmsCountBatch(encoding, nb_caractere, nb_sms).
+    """
+    if numpy is None:
+        counts = [count_sms(sms, emetteur, nostop, ucs2) for sms in messages]
+        return SmsCountBatch([count.encoding for count in counts],
+                             [count.nb_caractere for count in counts],
+                             [count.nb_sms for count in counts])
+
+    if isinstance(messages, numpy.ndarray):
+        messages = messages.tolist()
+    messages = [sms or u'' for sms in messages]
+
+    is_gsm7 = numpy.zeros(len(messages), dtype=bool)
+    nb_caractere = numpy.zeros(len(messages), dtype=numpy.int64)
+    for start in range(0, len(messages), BATCH_CHUNK_SIZE):
+        end = start + BATCH_CHUNK_SIZE
+        is_gsm7[start:end], nb_caractere[start:end] = \
+            _count_chunk(messages[start:end], is_set(ucs2))
+    nb_caractere += stop_length(emetteur, nostop)
+
+    single = numpy.where(is_gsm7, LIMITS[GSM7][0], LIMITS[UCS2][0])
+    part = numpy.where(is_gsm7, LIMITS[GSM7][1], LIMITS[UCS2][1])
+    nb_sms = numpy.where(nb_caractere <= single, 1, -(-nb_caractere // part))
+    nb_sms[nb_caractere <= 0] = 0
+
+    return SmsCountBatch(numpy.where(is_gsm7, GSM7, UCS2), nb_caractere, nb_sms)
+
+
+class OfflineComptageApi(object):
+    """
+    Drop-in replacement for `ComptageApi` computing the counts locally,
+    without calling /comptage.
+
+    >>> api = OfflineComptageApi()
+    >>> response = api.comptage(comptagerequest)
+    >>> response.etat.etat[0].nb_sms
+    '1'
+    """
+
+    def comptage(self, comptagerequest, **kwargs):
+        """
+        Compter le nombre de caractère
+
+        :param ComptageRequest comptagerequest: comptage request (required)
+        :return: ComptageReponse
+        """
+        if comptagerequest is None:
+            raise ValueError("Missing the required parameter `comptagerequest` when calling `comptage`")
+
+        count = count_sms(comptagerequest.sms,
+                          emetteur=comptagerequest.emetteur,
+                          nostop=comptagerequest.nostop,
+                          ucs2=comptagerequest.ucs2)
+        etat = ComptageReponseEtatEtat(tel=comptagerequest.num,
+                                       nb_sms=str(count.nb_sms),
+                                       nb_caractere=str(count.nb_caractere))
+        return ComptageReponse(etat=ComptageReponseEtat(etat=[etat]))
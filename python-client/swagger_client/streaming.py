@@ -0,0 +1,130 @@
+# coding: utf-8
+
+"""
+    API iSendPro
+
+    Streaming JSON encoding of large request bodies.
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+"""
+
+from __future__ import absolute_import
+
+from six import iteritems
+
+
+class StreamingBody(object):
+    """
+    JSON request body encoded incrementally while it is sent.
+
+    The body, a model or a dict, is never sanitized or serialized as a
+    whole: its fields are encoded one after the other, and list fields
+    (`num`, `sms`, `tracker` of an `SMSRequest`...) `chunk_items` entries
+    at a time. Pieces are grouped in chunks of about `chunk_size` bytes.
+    Peak memory is a few chunks, whatever the number of recipients.
+
+    Iterating the object again encodes the body again, so it can be
+    resent. Unless `chunked` is set, `content_length` runs one encoding
+    pass to compute the Content-Length header, for servers which do not
+    accept `Transfer-Encoding: chunked` request bodies.
+
+    :param body: model or dict to send.
+    :param sanitize: function turning a value into JSON compatible data,
+        `ApiClient.sanitize_for_serialization`.
+    :param codec: JSON codec, see `codec.get_codec`.
+    :param chunked: send with `Transfer-Encoding: chunked`.
+    :param chunk_items: number of list entries encoded at once.
+    :param chunk_size: approximate size of the chunks yielded, in bytes.
+    """
+
+    def __init__(self, body, sanitize, codec, chunked=False, chunk_items=1000,
+                 chunk_size=64 * 1024):
+        self.body = body
+        self.sanitize = sanitize
+        self.codec = codec
+        self.chunked = chunked
+        self.chunk_items = chunk_items
+        self.chunk_size = chunk_size
+        self._content_length = None
+
+    @staticmethod
+    def list_length(body):
+        """
+        Returns the total number of entries of the list fields of a model
+        or dict, used to decide whether a body is worth streaming.
+        """
+        return sum(len(value) for _, value in StreamingBody._fields(body)
+                   if isinstance(value, (list, tuple)))
+
+    def content_length(self):
+        """
+        Returns the size of the encoded body in bytes, computed once by
+        encoding the body without keeping it.
+        """
+        if self._content_length is None:
+            self._content_length = sum(len(chunk) for chunk in self)
+        return self._content_length
+
+    def __iter__(self):
+        buffered = []
+        size = 0
+        for piece in self._pieces():
+            buffered.append(piece)
+            size += len(piece)
+            if size >= self.chunk_size:
+                yield b''.join(buffered)
+                buffered = []
+                size = 0
+        if buffered:
+            yield b''.join(buffered)
+
+    def _pieces(self):
+        dumps = self.codec.dumps
+        separator = b'{'
+        for key, value in self._fields(self.body):
+            yield separator + dumps(key) + b':'
+            separator = b','
+            if isinstance(value, (list, tuple)):
+                for piece in self._list_pieces(value):
+                    yield piece
+            else:
+                yield dumps(self.sanitize(value))
+        yield b'}' if separator == b',' else b'{}'
+
+    def _list_pieces(self, values):
+        if not values:
+            yield b'[]'
+            return
+        separator = b'['
+        for start in range(0, len(values), self.chunk_items):
+            chunk = self.codec.dumps(self.sanitize(values[start:start + self.chunk_items]))
+            # strip the brackets of the encoded slice
+            yield separator + chunk[1:-1]
+            separator = b','
+        yield b']'
+
+    @staticmethod
+    def _fields(body):
+        """
+        Yields the (json key, value) pairs of a model or dict. As with
+        `sanitize_for_serialization`, None attributes of a model are
+        skipped.
+        """
+        if isinstance(body, dict):
+            for key, value in iteritems(body):
+                yield key, value
+        else:
+            for attr in body.swagger_types:
+                value = getattr(body, attr)
+                if value is not None:
+                    yield body.attribute_map[attr], value
@@ -0,0 +1,86 @@
+# coding: utf-8
+
+"""
+    API iSendPro
+
+    Fake responses and api clients shared by the tests.
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+"""
+
+from __future__ import absolute_import
+
+import json
+import random
+import threading
+import time
+
+import swagger_client
+from swagger_client.rest import ApiException
+
+
+class FakeResponse(object):
+    """ read response of the REST client """
+
+    def __init__(self, data, status=200, headers=None):
+        self.status = status
+        self.data = data
+        self.headers = headers or {}
+
+    def getheaders(self):
+        return self.headers
+
+
+class FakeApiClient(swagger_client.ApiClient):
+    """
+    ApiClient answering every request with `answer`, without network.
+    The request bodies are recorded in `bodies`.
+
+    :param fail: raise a 500 ApiException instead of answering, or this
+        exception.
+    :param delay: maximum random delay of the answers, in seconds.
+    """
+
+    def __init__(self, fail=False, delay=0, **kwargs):
+        super(FakeApiClient, self).__init__(**kwargs)
+        self.fail = fail
+        self.delay = delay
+        self.bodies = []
+        self.lock = threading.Lock()
+
+    def request(self, method, url, query_params=None, headers=None,
+                post_params=None, body=None, **kwargs):
+        with self.lock:
+            self.bodies.append(body)
+        if self.delay:
+            time.sleep(random.random() * self.delay)
+        if isinstance(self.fail, Exception):
+            raise self.fail
+        if self.fail:
+            raise ApiException(status=500, reason='boom')
+        return FakeResponse(json.dumps(self.answer(method, url, query_params, body)))
+
+    def answer(self, method, url, query_params, body):
+        return {"etat": {"credit": 3.5, "quantite": "10"}}
+
+
+class EchoApiClient(FakeApiClient):
+    """ answers /smsmulti with one entry per number, see `entry` """
+
+    def answer(self, method, url, query_params, body):
+        return {"etat": {"etat": [self.entry(i, num, body) for i, num in enumerate(body['num'])]}}
+
+    def entry(self, i, num, body):
+        sms = body['sms']
+        return {"code": 0, "tel": num, "smslong": "1",
+                "message": sms[i] if len(sms) > 1 else sms[0]}
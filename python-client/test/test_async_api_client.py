@@ -0,0 +1,165 @@
+# coding: utf-8
+
+"""
+    API iSendPro
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+"""
+
+from __future__ import absolute_import
+
+import asyncio
+import json
+import threading
+import unittest
+
+import swagger_client
+from swagger_client.rest import ApiException
+from swagger_client.async_rest import aiohttp
+
+from .fakes import FakeResponse
+
+try:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+except ImportError:
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+
+
+class CreditHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        body = json.dumps({"etat": {"credit": 12.5, "quantite": "100"}}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+SMS_REPONSE = {
+    "etat": {
+        "etat": [
+            {"code": 0, "tel": "33680010203", "smslong": "1", "message": "OK"},
+            {"code": 0, "tel": "33680010204", "smslong": "1", "message": "OK"},
+        ]
+    }
+}
+
+
+@unittest.skipIf(aiohttp is None, "aiohttp is not installed")
+class TestAsyncApiClient(unittest.TestCase):
+    """ AsyncApiClient unit test """
+
+    def run_with_server(self, handler, scenario):
+        from aiohttp import web
+
+        async def main():
+            app = web.Application()
+            app.router.add_route('*', '/{tail:.*}', handler)
+            runner = web.AppRunner(app)
+            await runner.setup()
+            site = web.TCPSite(runner, '127.0.0.1', 0)
+            await site.start()
+            port = runner.addresses[0][1]
+            api_client = swagger_client.AsyncApiClient(host='http://127.0.0.1:%d' % port)
+            try:
+                return await scenario(api_client)
+            finally:
+                await api_client.close()
+                await runner.cleanup()
+
+        return asyncio.run(main())
+
+    def test_send_sms_multi_matches_sync_deserialization(self):
+        from aiohttp import web
+        seen = {}
+
+        async def handler(request):
+            seen['path'] = request.path
+            seen['body'] = await request.json()
+            return web.json_response(SMS_REPONSE)
+
+        async def scenario(api_client):
+            api = swagger_client.AsyncSmsApi(api_client)
+            request = swagger_client.SMSRequest(keyid='k', num=['0680010203', '0680010204'],
+                                                sms=['hello'])
+            return await api.send_sms_multi(request)
+
+        result = self.run_with_server(handler, scenario)
+
+        expected = swagger_client.ApiClient().deserialize(
+            FakeResponse(json.dumps(SMS_REPONSE)), 'SMSReponse')
+        self.assertEqual(result.to_dict(), expected.to_dict())
+        self.assertEqual(seen['path'], '/smsmulti')
+        self.assertEqual(seen['body'], {'keyid': 'k', 'num': ['0680010203', '0680010204'],
+                                        'sms': ['hello']})
+
+    def test_concurrent_requests(self):
+        from aiohttp import web
+
+        async def handler(request):
+            await asyncio.sleep(0.05)
+            return web.json_response({"etat": {"credit": 12.5, "quantite": "100"}})
+
+        async def scenario(api_client):
+            api = swagger_client.AsyncCreditApi(api_client)
+            return await asyncio.gather(*[api.get_credit('k', '2') for _ in range(20)])
+
+        results = self.run_with_server(handler, scenario)
+        self.assertEqual(len(results), 20)
+        self.assertEqual(results[0].etat.credit, 12.5)
+
+    def test_http_error_raises_api_exception(self):
+        from aiohttp import web
+
+        async def handler(request):
+            return web.Response(status=500, text='boom')
+
+        async def scenario(api_client):
+            with self.assertRaises(ApiException) as ctx:
+                await swagger_client.AsyncCreditApi(api_client).get_credit('k', '1')
+            return ctx.exception
+
+        exc = self.run_with_server(handler, scenario)
+        self.assertEqual(exc.status, 500)
+        self.assertEqual(exc.body, 'boom')
+
+    def test_client_outlives_event_loops(self):
+        server = HTTPServer(('127.0.0.1', 0), CreditHandler)
+        thread = threading.Thread(target=server.serve_forever, args=(0.05,))
+        thread.daemon = True
+        thread.start()
+        try:
+            api_client = swagger_client.AsyncApiClient(host='http://127.0.0.1:%d' % server.server_address[1])
+            api = swagger_client.AsyncCreditApi(api_client)
+            sessions = []
+
+            async def get_credit():
+                result = await api.get_credit('k', '2')
+                sessions.append(api_client.rest_client._get_session())
+                return result.etat.credit
+
+            # each asyncio.run has its own loop, closing the session at its end
+            self.assertEqual([asyncio.run(get_credit()) for _ in range(2)], [12.5, 12.5])
+            self.assertIsNot(sessions[0], sessions[1])
+            self.assertTrue(all(session.closed for session in sessions))
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+# coding: utf-8
+
+"""
+    API iSendPro
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+"""
+
+from __future__ import absolute_import
+
+import unittest
+
+import swagger_client
+from swagger_client.bulk import BulkSmsSender
+from swagger_client.executor import BoundedExecutor
+
+from .fakes import EchoApiClient
+
+
+class TestBulkSmsSender(unittest.TestCase):
+    """ BulkSmsSender unit test """
+
+    def setUp(self):
+        self.pool = BoundedExecutor(max_workers=4, queue_size=4)
+        self.api_client = EchoApiClient(pool=self.pool, delay=0.01)
+
+    def tearDown(self):
+        self.pool.shutdown()
+
+    def test_results_in_input_order(self):
+        nums = ['06%08d' % i for i in range(1050)]
+        rows = ((num, 'Bonjour', 't%s' % num) for num in nums)
+        sender = BulkSmsSender(self.api_client, batch_size=100)
+
+        results = list(sender.send(rows, 'k', emetteur='iSendPro'))
+
+        self.assertEqual([etat.tel for etat in results], nums)
+        self.assertEqual(len(self.api_client.bodies), 11)
+        self.assertTrue(all(len(body['num']) <= 100 for body in self.api_client.bodies))
+
+    def test_shared_message_is_sent_once(self):
+        sender = BulkSmsSender(self.api_client, batch_size=10)
+        request = sender.build_request([('0601', 'a'), ('0602', 'a')], keyid='k')
+        self.assertEqual(request.sms, ['a'])
+        self.assertIsNone(request.tracker)
+
+        request = sender.build_request([('0601', 'a', 't1'), ('0602', 'b')], keyid='k')
+        self.assertEqual(request.sms, ['a', 'b'])
+        self.assertEqual(request.tracker, ['t1', ''])
+
+    def test_dedup(self):
+        sender = BulkSmsSender(self.api_client, batch_size=10, dedup=True)
+        dropped = []
+        rows = [('0680010203', 'a'), ('+33 6 80 01 02 03', 'a'), ('junk', 'a'), ('0680010204', 'a')]
+        results = list(sender.send(rows, 'k', dropped=dropped))
+        self.assertEqual([etat.tel for etat in results], ['0680010203', '0680010204'])
+        self.assertEqual(dropped, rows[1:3])
+
+    def test_lazy(self):
+        sender = BulkSmsSender(self.api_client, batch_size=10)
+        results = sender.send([('0601', 'a')], 'k')
+        self.assertEqual(self.api_client.bodies, [])
+        self.assertEqual(len(list(results)), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
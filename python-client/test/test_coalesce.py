@@ -0,0 +1,107 @@
+# coding: utf-8
+
+"""
+    API iSendPro
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+"""
+
+from __future__ import absolute_import
+
+import threading
+import unittest
+
+import swagger_client
+from swagger_client.coalesce import CoalescingSmsSender
+from swagger_client.models.sms_unique_request import SmsUniqueRequest
+from swagger_client.rest import ApiException
+from swagger_client.retry import RetryPolicy
+
+from .fakes import EchoApiClient
+
+
+class TestCoalescingSmsSender(unittest.TestCase):
+    """ CoalescingSmsSender unit test """
+
+    def test_concurrent_sends_are_merged(self):
+        api_client = EchoApiClient()
+        results = {}
+        with CoalescingSmsSender(api_client, max_delay=0.2, max_batch=1000) as sender:
+            def send(i):
+                request = SmsUniqueRequest(keyid='k', emetteur='iSendPro',
+                                           num='0680%06d' % i, sms='message %d' % i)
+                results[i] = sender.send_sms(request)
+            threads = [threading.Thread(target=send, args=(i,)) for i in range(50)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(len(api_client.bodies), 1)
+        for i in range(50):
+            etat = results[i].etat.etat
+            self.assertEqual(len(etat), 1)
+            self.assertEqual((etat[0].tel, etat[0].message), ('0680%06d' % i, 'message %d' % i))
+
+    def test_groups_by_shared_parameters(self):
+        api_client = EchoApiClient()
+        with CoalescingSmsSender(api_client, max_delay=10) as sender:
+            futures = [sender.submit(SmsUniqueRequest(keyid='k', num='068000000%d' % i, sms='a',
+                                                      emetteur='A' if i % 2 else 'B'))
+                       for i in range(6)]
+        for future in futures:
+            self.assertEqual(future.result(timeout=5).etat.etat[0].code, 0)
+        self.assertEqual(sorted(body['emetteur'] for body in api_client.bodies), ['A', 'B'])
+        for body in api_client.bodies:
+            self.assertEqual(len(body['num']), 3)
+            self.assertEqual(body['sms'], ['a'])
+
+    def test_full_batch_is_sent_at_once(self):
+        api_client = EchoApiClient()
+        sender = CoalescingSmsSender(api_client, max_delay=10, max_batch=3)
+        try:
+            futures = [sender.submit(SmsUniqueRequest(keyid='k', num='068000000%d' % i, sms='a'))
+                       for i in range(3)]
+            self.assertEqual([f.result(timeout=5).etat.etat[0].tel for f in futures],
+                             ['0680000000', '0680000001', '0680000002'])
+        finally:
+            sender.close()
+
+    def test_results_are_matched_by_number(self):
+        class ReversedApiClient(EchoApiClient):
+            def answer(self, method, url, query_params, body):
+                # one result per number in reverse order, the first one for another number
+                entries = [self.entry(i, num, body) for i, num in enumerate(body['num'])]
+                entries[0]['tel'] = '0690000000'
+                return {"etat": {"etat": entries[::-1]}}
+
+        with CoalescingSmsSender(ReversedApiClient(), max_delay=10) as sender:
+            futures = [sender.submit(SmsUniqueRequest(keyid='k', num=num, sms='a'))
+                       for num in ['0680000000', '0680000001', '+33 6 80 00 00 02']]
+        self.assertEqual([[etat.tel for etat in f.result(timeout=5).etat.etat] for f in futures],
+                         [[], ['0680000001'], ['+33 6 80 00 00 02']])
+
+    def test_errors_reach_every_caller(self):
+        sender = CoalescingSmsSender(EchoApiClient(fail=True, retry_policy=RetryPolicy(max_attempts=1)), max_delay=0.01)
+        try:
+            futures = [sender.submit(SmsUniqueRequest(keyid='k', num='068000000%d' % i, sms='a'))
+                       for i in range(2)]
+            for future in futures:
+                with self.assertRaises(ApiException):
+                    future.result(timeout=5)
+        finally:
+            sender.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
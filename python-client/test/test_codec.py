@@ -0,0 +1,109 @@
+# coding: utf-8
+
+"""
+    API iSendPro
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+"""
+
+from __future__ import absolute_import
+
+import json
+import unittest
+
+import swagger_client
+from swagger_client import codec
+from swagger_client.rest import RESTClientObject, RESTResponse
+
+
+class FakeUrllib3Response(object):
+
+    def __init__(self, data, status=200):
+        self.status = status
+        self.reason = 'OK'
+        self.data = data
+
+    def getheaders(self):
+        return {}
+
+    def getheader(self, name, default=None):
+        return default
+
+
+class RecordingPoolManager(object):
+
+    def __init__(self, response):
+        self.response = response
+        self.calls = []
+
+    def request(self, method, url, **kwargs):
+        self.calls.append((method, url, kwargs))
+        return self.response
+
+
+class TestCodec(unittest.TestCase):
+    """ JSON codecs unit test """
+
+    payload = {"keyid": "k", "num": ["33680010203"], "sms": [u"Déjà vu €"]}
+
+    def installed_codecs(self):
+        return [codec.get_codec(name) for name in codec.PREFERRED_CODECS
+                if codec._MODULES[name] is not None]
+
+    def test_round_trip_bytes(self):
+        for json_codec in self.installed_codecs():
+            body = json_codec.dumps(self.payload)
+            self.assertIsInstance(body, bytes, json_codec.name)
+            self.assertEqual(json.loads(body.decode('utf-8')), self.payload)
+            self.assertEqual(json_codec.loads(body), self.payload)
+            self.assertEqual(json_codec.loads(body.decode('utf-8')), self.payload)
+
+    def test_invalid_json_raises_value_error(self):
+        for json_codec in self.installed_codecs():
+            with self.assertRaises(ValueError):
+                json_codec.loads(b'<html>')
+
+    def test_default_is_first_installed(self):
+        expected = [name for name in codec.PREFERRED_CODECS if codec._MODULES[name] is not None][0]
+        self.assertEqual(codec.get_codec().name, expected)
+        self.assertIs(codec.get_codec('json'), codec.get_codec('json'))
+        with self.assertRaises(ValueError):
+            codec.get_codec('yaml')
+
+
+class TestRestBodies(unittest.TestCase):
+    """ RESTClientObject and ApiClient bodies unit test """
+
+    def test_response_decoded_lazily(self):
+        response = RESTResponse(FakeUrllib3Response(b'{"etat": {"credit": 3.5}}'))
+        self.assertIsNone(response._data)
+        self.assertEqual(response.raw_data, b'{"etat": {"credit": 3.5}}')
+        self.assertEqual(response.data, '{"etat": {"credit": 3.5}}')
+
+    def test_deserialize_parses_raw_bytes(self):
+        response = RESTResponse(FakeUrllib3Response(b'{"etat": {"credit": 3.5, "quantite": "10"}}'))
+        credit = swagger_client.ApiClient().deserialize(response, 'CreditResponse')
+        self.assertEqual(credit.etat.credit, 3.5)
+        self.assertIsNone(response._data)
+
+    def test_request_body_is_encoded_bytes(self):
+        rest_client = RESTClientObject()
+        rest_client.pool_manager = RecordingPoolManager(FakeUrllib3Response(b'{}'))
+        rest_client.POST('http://localhost/sms', body={"sms": [u"€"]})
+        method, url, kwargs = rest_client.pool_manager.calls[0]
+        self.assertIsInstance(kwargs['body'], bytes)
+        self.assertEqual(json.loads(kwargs['body'].decode('utf-8')), {"sms": [u"€"]})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+# coding: utf-8
+
+"""
+    API iSendPro
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+"""
+
+from __future__ import absolute_import
+
+import json
+import unittest
+
+from datetime import date, datetime
+
+import swagger_client
+from swagger_client.compact import CompactModel
+from swagger_client.deserializer import Deserializer, get_deserializer
+from swagger_client.models.sms_reponse import SMSReponse
+from swagger_client.models.sms_reponse_etat_etat import SMSReponseEtatEtat
+
+from .fakes import FakeResponse
+
+
+class TestDeserializer(unittest.TestCase):
+    """ Deserializer unit test """
+
+    def setUp(self):
+        self.deserializer = Deserializer()
+
+    def test_sms_reponse(self):
+        data = {"etat": {"etat": [{"code": "0", "tel": "33680010203", "message": "Envoi OK"},
+                                  {"code": 2, "tel": "33680010204", "smslong": None}]}}
+        response = self.deserializer.deserialize(data, 'SMSReponse')
+        self.assertIsInstance(response, SMSReponse)
+        entries = response.etat.etat
+        self.assertEqual(entries[0], SMSReponseEtatEtat(code=0, tel='33680010203',
+                                                        message='Envoi OK'))
+        self.assertEqual(entries[1], SMSReponseEtatEtat(code=2, tel='33680010204'))
+
+    def test_plan_is_compiled_once(self):
+        self.deserializer.deserialize({"etat": {"etat": []}}, 'SMSReponse')
+        plan = self.deserializer.plan(SMSReponseEtatEtat)
+        self.assertIs(self.deserializer.plan(SMSReponseEtatEtat), plan)
+        self.assertIn(('code', 'code', self.deserializer.converter('int')), plan)
+        self.assertIs(self.deserializer.converter('list[SMSReponseEtatEtat]'),
+                      self.deserializer.converter('list[SMSReponseEtatEtat]'))
+
+    def test_containers_and_primitives(self):
+        self.assertEqual(self.deserializer.deserialize(['1', 2], 'list[int]'), [1, 2])
+        self.assertEqual(self.deserializer.deserialize({'a': '1.5'}, 'dict(str, float)'),
+                         {'a': 1.5})
+        self.assertEqual(self.deserializer.deserialize({'a': [1]}, 'object'), {'a': [1]})
+        self.assertEqual(self.deserializer.deserialize('2016-07-01', 'date'), date(2016, 7, 1))
+        self.assertEqual(self.deserializer.deserialize('2016-07-01T10:00:00', datetime),
+                         datetime(2016, 7, 1, 10))
+        self.assertIsNone(self.deserializer.deserialize(None, 'SMSReponse'))
+
+    def test_api_client_uses_shared_deserializer(self):
+        api_client = swagger_client.ApiClient()
+        response = FakeResponse(json.dumps({"etat": {"credit": "3.5", "quantite": "10"}}))
+        credit = api_client.deserialize(response, 'CreditResponse')
+        self.assertEqual(credit.etat.credit, 3.5)
+        self.assertIs(api_client.deserializer, swagger_client.ApiClient().deserializer)
+
+
+class TestResponseModes(unittest.TestCase):
+    """ compact and raw response modes unit test """
+
+    data = {"etat": {"etat": [{"code": 0, "tel": "33680010203", "message": "Envoi OK"}]}}
+
+    def test_compact_models_keep_attributes(self):
+        response = get_deserializer('compact').deserialize(self.data, 'SMSReponse')
+        self.assertIsInstance(response, CompactModel)
+        self.assertEqual(type(response).__name__, 'SMSReponse')
+        entry = response.etat.etat[0]
+        self.assertEqual((entry.code, entry.tel, entry.smslong), (0, '33680010203', None))
+        self.assertFalse(hasattr(entry, '__dict__'))
+        self.assertEqual(entry.swagger_types, SMSReponseEtatEtat().swagger_types)
+        self.assertEqual(response.to_dict(),
+                         Deserializer().deserialize(self.data, 'SMSReponse').to_dict())
+
+    def test_compact_models_serialize_back(self):
+        response = get_deserializer('compact').deserialize(self.data, 'SMSReponse')
+        self.assertEqual(swagger_client.ApiClient().sanitize_for_serialization(response),
+                         self.data)
+
+    def test_raw_mode_returns_parsed_json(self):
+        api_client = swagger_client.ApiClient(response_mode='raw')
+        response = api_client.deserialize(FakeResponse(json.dumps(self.data)), 'SMSReponse')
+        self.assertEqual(response, self.data)
+        api_client.response_mode = 'model'
+        response = api_client.deserialize(FakeResponse(json.dumps(self.data)), 'SMSReponse')
+        self.assertIsInstance(response, SMSReponse)
+
+    def test_invalid_mode(self):
+        with self.assertRaises(ValueError):
+            swagger_client.ApiClient(response_mode='fast')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+# coding: utf-8
+
+"""
+    API iSendPro
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+"""
+
+from __future__ import absolute_import
+
+import threading
+import unittest
+
+from concurrent.futures import Future
+from six.moves.queue import Full
+
+import swagger_client
+from swagger_client.executor import BoundedExecutor
+
+from .fakes import FakeApiClient
+
+
+class TestBoundedExecutor(unittest.TestCase):
+    """ BoundedExecutor unit test """
+
+    def test_submit_returns_future(self):
+        executor = BoundedExecutor(max_workers=2, queue_size=2)
+        try:
+            future = executor.submit(lambda x: x * 2, 21)
+            self.assertIsInstance(future, Future)
+            self.assertEqual(future.result(timeout=5), 42)
+        finally:
+            executor.shutdown()
+
+    def test_backpressure_when_full(self):
+        executor = BoundedExecutor(max_workers=1, queue_size=1, block=False)
+        release = threading.Event()
+        try:
+            executor.submit(release.wait)
+            executor.submit(release.wait)
+            with self.assertRaises(Full):
+                executor.submit(release.wait)
+            release.set()
+        finally:
+            release.set()
+            executor.shutdown()
+
+    def test_slot_freed_after_completion(self):
+        executor = BoundedExecutor(max_workers=1, queue_size=0, timeout=5)
+        try:
+            for i in range(10):
+                self.assertEqual(executor.submit(lambda: i).result(timeout=5), i)
+        finally:
+            executor.shutdown()
+
+
+class TestApiClientCallback(unittest.TestCase):
+    """ ApiClient.call_api asynchronous mode unit test """
+
+    def test_callback_runs_on_pool_and_returns_future(self):
+        pool = BoundedExecutor(max_workers=2, queue_size=4)
+        api = swagger_client.CreditApi(FakeApiClient(pool=pool))
+        received = []
+        try:
+            future = api.get_credit('k', '1', callback=received.append)
+            self.assertIsInstance(future, Future)
+            result = future.result(timeout=5)
+        finally:
+            pool.shutdown()
+        self.assertEqual(result.etat.credit, 3.5)
+        self.assertEqual(received, [result])
+
+    def test_callback_errors_are_kept_on_future(self):
+        class FailingApiClient(swagger_client.ApiClient):
+            def request(self, *args, **kwargs):
+                raise swagger_client.rest.ApiException(status=0, reason='down')
+
+        api_client = FailingApiClient()
+        future = swagger_client.CreditApi(api_client).get_credit('k', '1', callback=lambda r: None)
+        with self.assertRaises(swagger_client.rest.ApiException):
+            future.result(timeout=5)
+        api_client.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,144 @@
+# coding: utf-8
+
+"""
+    API iSendPro
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+"""
+
+from __future__ import absolute_import
+
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+import swagger_client
+from swagger_client.hlr_cache import CachedHlrApi, HlrCache, normalize_num
+from swagger_client.models.hlr_reponse_etat_etat import HLRReponseEtatEtat
+
+from .fakes import FakeApiClient
+
+
+class HlrApiClient(FakeApiClient):
+    """ Answers /hlr with one entry per number """
+
+    def __init__(self):
+        super(HlrApiClient, self).__init__()
+        self.requested = []
+
+    def answer(self, method, url, query_params, body):
+        self.requested.append(body['num'])
+        return {"etat": {"etat": [{"tel": num, "operateur": "op-" + num[-2:]} for num in body['num']]}}
+
+
+class TestHlrCache(unittest.TestCase):
+    """ HlrCache unit test """
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_normalize_num(self):
+        for num in ['0680010203', '+33 6 80 01 02 03', '0033680010203', '33680010203']:
+            self.assertEqual(normalize_num(num), '33680010203')
+
+    def test_ttl_and_lru(self):
+        cache = HlrCache(ttl=60, maxsize=2)
+        for i in range(3):
+            cache.set(str(i), HLRReponseEtatEtat(tel=str(i), operateur='op'))
+        self.assertIsNone(cache.get('0'))
+        self.assertEqual(cache.get('2').operateur, 'op')
+
+        cache.ttl = -1
+        cache.set('3', HLRReponseEtatEtat(tel='3', operateur='op'))
+        self.assertIsNone(cache.get('3'))
+
+    def test_sqlite_survives_restart(self):
+        path = os.path.join(self.tmp, 'hlr.sqlite')
+        cache = HlrCache(path=path)
+        cache.set('33680010203', HLRReponseEtatEtat(tel='0680010203', operateur='Orange'))
+        cache.close()
+
+        cache = HlrCache(path=path)
+        entry = cache.get('33680010203')
+        cache.close()
+        self.assertEqual((entry.tel, entry.operateur), ('0680010203', 'Orange'))
+
+    def test_only_misses_are_requested(self):
+        api_client = HlrApiClient()
+        api = CachedHlrApi(api_client, cache=HlrCache())
+
+        request = swagger_client.HLRrequest(keyid='k', num=['0680010203', '0680010204'])
+        api.get_hlr(request)
+        request = swagger_client.HLRrequest(keyid='k', num=['0680010205', '+33680010203',
+                                                            '0680010205', '0680010204'])
+        response = api.get_hlr(request)
+
+        self.assertEqual(api_client.requested, [['0680010203', '0680010204'], ['0680010205']])
+        self.assertEqual([etat.operateur for etat in response.etat.etat],
+                         ['op-05', 'op-03', 'op-05', 'op-04'])
+
+    def test_all_cached_makes_no_request(self):
+        api_client = HlrApiClient()
+        cache = HlrCache()
+        cache.set('33680010203', HLRReponseEtatEtat(tel='0680010203', operateur='Orange'))
+        response = CachedHlrApi(api_client, cache=cache).get_hlr(
+            swagger_client.HLRrequest(keyid='k', num=['0680010203']))
+        self.assertEqual(api_client.requested, [])
+        self.assertEqual(response.etat.etat[0].operateur, 'Orange')
+
+    def test_partial_reordered_response_is_matched_by_number(self):
+        class PartialApiClient(HlrApiClient):
+            def answer(self, method, url, query_params, body):
+                self.requested.append(body['num'])
+                # the first number is missing, the others are reversed
+                return {"etat": {"etat": [{"tel": num, "operateur": "op-" + num[-2:]}
+                                          for num in reversed(body['num'][1:])]}}
+
+        api_client = PartialApiClient()
+        cache = HlrCache()
+        request = swagger_client.HLRrequest(keyid='k', num=['0680010203', '0680010204',
+                                                            '0680010205'])
+        response = CachedHlrApi(api_client, cache=cache).get_hlr(request)
+
+        self.assertEqual([etat and etat.operateur for etat in response.etat.etat],
+                         [None, 'op-04', 'op-05'])
+        self.assertIsNone(cache.get('33680010203'))
+        self.assertEqual(cache.get('33680010205').operateur, 'op-05')
+
+    def test_results_without_number_are_matched_by_position(self):
+        class AnonymousApiClient(HlrApiClient):
+            def answer(self, method, url, query_params, body):
+                return {"etat": {"etat": [{"operateur": "op-" + num[-2:]} for num in body['num']]}}
+
+        cache = HlrCache()
+        request = swagger_client.HLRrequest(keyid='k', num=['0680010203', '0680010204'])
+        response = CachedHlrApi(AnonymousApiClient(), cache=cache).get_hlr(request)
+        self.assertEqual([etat.operateur for etat in response.etat.etat], ['op-03', 'op-04'])
+
+        class ShortApiClient(HlrApiClient):
+            def answer(self, method, url, query_params, body):
+                return {"etat": {"etat": [{"operateur": "op"}]}}
+
+        cache = HlrCache()
+        response = CachedHlrApi(ShortApiClient(), cache=cache).get_hlr(request)
+        self.assertEqual(response.etat.etat, [None, None])
+        self.assertIsNone(cache.get('33680010203'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,147 @@
+# coding: utf-8
+
+"""
+    API iSendPro
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+"""
+
+from __future__ import absolute_import
+
+import io
+import json
+import threading
+import unittest
+import zipfile
+
+from six.moves.BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+from six.moves.urllib.parse import urlparse, parse_qs
+
+import swagger_client
+from swagger_client.bulk import BulkSmsSender
+from swagger_client.liste_noire import BloomFilter, ListeNoire
+
+
+class ListeNoireHandler(BaseHTTPRequestHandler):
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        self.rfile.read(int(self.headers.get('Content-Length') or 0))
+        self.server.calls.append((url.path, query))
+        if url.path == '/getlistenoire':
+            buf = io.BytesIO()
+            with zipfile.ZipFile(buf, 'w') as archive:
+                archive.writestr('listenoire.csv', 'tel;date\r\n' + ''.join(
+                    '%s;2016-07-01\r\n' % num for num in self.server.nums))
+            body = buf.getvalue()
+        else:
+            body = json.dumps({"etat": {"etat": [{"tel": query['num'][0],
+                                                  "listeNoire": "OK"}]}}).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestBloomFilter(unittest.TestCase):
+    """ BloomFilter unit test """
+
+    def test_no_false_negatives_and_few_false_positives(self):
+        bloom = BloomFilter(10000, 0.01)
+        for i in range(10000):
+            bloom.add('3368%07d' % i)
+        self.assertTrue(all('3368%07d' % i in bloom for i in range(10000)))
+        false_positives = sum('3369%07d' % i in bloom for i in range(10000))
+        self.assertLess(false_positives, 200)
+        self.assertLess(len(bloom.bits), 13000)
+
+
+class TestListeNoire(unittest.TestCase):
+    """ ListeNoire unit test """
+
+    def setUp(self):
+        self.server = HTTPServer(('127.0.0.1', 0), ListeNoireHandler)
+        self.server.nums = ['0680000001', '+33 6 80 00 00 02', '0033680000003']
+        self.server.calls = []
+        thread = threading.Thread(target=self.server.serve_forever, args=(0.05,))
+        thread.daemon = True
+        thread.start()
+        host = 'http://127.0.0.1:%d' % self.server.server_address[1]
+        self.api_client = swagger_client.ApiClient(host=host)
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def check_mirror(self, liste_noire):
+        self.assertEqual(liste_noire.sync('k'), 3)
+        self.assertEqual(self.server.calls[0][1], {'keyid': ['k'], 'getListeNoire': ['1']})
+        self.assertIn('+33680000001', liste_noire)
+        self.assertIn('0680000002', liste_noire)
+        self.assertIn('33680000003', liste_noire)
+        self.assertNotIn('0680000004', liste_noire)
+
+        liste_noire.add('k', '0680000004')
+        liste_noire.remove('k', '0680000001')
+        self.assertEqual([(path, query['num']) for path, query in self.server.calls[1:]],
+                         [('/setlistenoire', ['0680000004']), ('/dellistenoire', ['0680000001'])])
+        self.assertIn('0680000004', liste_noire)
+        self.assertNotIn('0680000001', liste_noire)
+        self.assertEqual(len(liste_noire), 3)
+
+        liste_noire.add('k', '0680000001')
+        self.assertIn('0680000001', liste_noire)
+
+    def test_sync_and_updates(self):
+        self.check_mirror(ListeNoire(self.api_client))
+
+    def test_bloom_filter_mirror(self):
+        liste_noire = ListeNoire(self.api_client, bloom_error_rate=0.001)
+        self.check_mirror(liste_noire)
+        self.assertIsNotNone(liste_noire._bloom)
+        self.assertEqual(liste_noire._nums, set())
+
+    def test_bloom_filter_only_mode_drops_false_positives(self):
+        liste_noire = ListeNoire(self.api_client, bloom_error_rate=0.01)
+        liste_noire.load('3368%07d' % i for i in range(10000))
+        self.assertEqual(len(liste_noire), 10000)
+        self.assertEqual(liste_noire._nums, set())
+        self.assertLess(len(liste_noire._bloom.bits), 13000)
+        # the cost of the memory saved: a share of the recipients is dropped
+        kept = list(liste_noire.filter(('3369%07d' % i,) for i in range(10000)))
+        self.assertTrue(9800 < len(kept) < 10000, len(kept))
+
+    def test_bulk_sends_skip_blacklisted_recipients(self):
+        liste_noire = ListeNoire(self.api_client)
+        liste_noire.load(['0680000002'])
+        sent = []
+
+        class Sender(BulkSmsSender):
+            def batches(self, rows, **params):
+                sent.extend(rows)
+                return iter([])
+
+        dropped = []
+        sender = Sender(self.api_client, liste_noire=liste_noire)
+        list(sender.send([('068000000%d' % i, 'a') for i in range(4)], 'k', dropped=dropped))
+        self.assertEqual([num for num, _ in sent], ['0680000000', '0680000001', '0680000003'])
+        self.assertEqual(dropped, [('0680000002', 'a')])
+
+
+if __name__ == '__main__':
+    unittest.main()
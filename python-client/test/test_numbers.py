@@ -0,0 +1,86 @@
+# coding: utf-8
+
+"""
+    API iSendPro
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+"""
+
+from __future__ import absolute_import
+
+import unittest
+
+from swagger_client import numbers
+from swagger_client.numbers import (canonical_num, normalize_nums, num_keys, unique_nums,
+                                    unique_rows, numpy)
+
+NUMS = ['0680010203', '+33 6 80 01 02 03', '0033680010203', '33680010203',
+        '06.80.01.02.04', '(06) 80-01-02-05', '0044 7911 123456', '447911123456',
+        'abc', '', '06800102', '3306800102', '0000000000000', '06 80 01 02 03 x']
+CANONICAL = ['33680010203', '33680010203', '33680010203', '33680010203',
+             '33680010204', '33680010205', '447911123456', '447911123456',
+             None, None, None, None, None, None]
+
+
+class TestNumbers(unittest.TestCase):
+    """ Phone numbers unit test """
+
+    def test_canonical_num(self):
+        self.assertEqual([canonical_num(num) for num in NUMS], CANONICAL)
+        self.assertIsNone(canonical_num(None))
+
+    def test_normalize_nums(self):
+        self.assertEqual(normalize_nums(NUMS), CANONICAL)
+        self.assertEqual(normalize_nums(NUMS * 20), CANONICAL * 20)
+
+    def test_num_keys_keep_invalid_numbers(self):
+        self.assertEqual(num_keys(['06 80 01 02 03', '123 45']), ['33680010203', '12345'])
+
+    def test_unique_nums(self):
+        self.assertEqual(unique_nums(NUMS),
+                         (['33680010203', '33680010204', '33680010205', '447911123456'],
+                          [0, 4, 5, 6]))
+
+    def test_unique_rows(self):
+        dropped = []
+        seen = set(['33680010205'])
+        rows = ((num, 'Bonjour') for num in NUMS)
+        kept = list(unique_rows(rows, seen=seen, dropped=dropped, chunk_size=3))
+        self.assertEqual([num for num, _ in kept],
+                         ['0680010203', '06.80.01.02.04', '0044 7911 123456'])
+        self.assertEqual(len(dropped), len(NUMS) - 3)
+        self.assertIn('447911123456', seen)
+
+    @unittest.skipIf(numpy is None, "numpy is not installed")
+    def test_arrays(self):
+        nums = numpy.array(NUMS)
+        result = normalize_nums(nums)
+        self.assertIsInstance(result, numpy.ndarray)
+        self.assertEqual([num or None for num in result.tolist()], CANONICAL)
+        unique, indexes = unique_nums(nums)
+        self.assertEqual(unique.tolist(),
+                         ['33680010203', '33680010204', '33680010205', '447911123456'])
+        self.assertEqual(indexes.tolist(), [0, 4, 5, 6])
+        self.assertEqual(normalize_nums(numpy.array(['', '0'])).tolist(), ['', ''])
+        self.assertEqual(len(normalize_nums(numpy.array([], dtype=str))), 0)
+
+    def test_pure_python_fallback(self):
+        saved, numbers.numpy = numbers.numpy, None
+        try:
+            self.assertEqual(normalize_nums(NUMS * 20), CANONICAL * 20)
+        finally:
+            numbers.numpy = saved
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,249 @@
+# coding: utf-8
+
+"""
+    API iSendPro
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+"""
+
+from __future__ import absolute_import
+
+import os
+import shutil
+import sqlite3
+import tempfile
+import time
+import unittest
+
+import urllib3
+
+import swagger_client
+from swagger_client import outbox as outbox_module
+from swagger_client.outbox import OutboxWorkers, SmsOutbox
+from swagger_client.rest import ApiException
+from swagger_client.retry import RetryPolicy, RetryRule, default_rules, has_trackers
+
+from . import fakes
+
+
+class EchoApiClient(fakes.EchoApiClient):
+    """ answers /smsmulti with code 0, or 8 for numbers ending with 9 """
+
+    def entry(self, i, num, body):
+        if num.endswith('9'):
+            return {"code": 8, "tel": num, "message": "Numero invalide"}
+        return {"code": 0, "tel": num, "message": "OK"}
+
+
+class OutboxTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp, 'outbox.sqlite')
+        self.outbox = SmsOutbox(self.path, retry_delay=0, max_attempts=2)
+
+    def tearDown(self):
+        self.outbox.close()
+        shutil.rmtree(self.tmp)
+
+
+class TestSmsOutbox(OutboxTestCase):
+    """ SmsOutbox unit test """
+
+    def test_enqueue_dedups_on_tracker(self):
+        trackers = self.outbox.enqueue_many([('0680000001', 'a', 't1'), ('0680000002', 'b')], 'k')
+        self.assertEqual(trackers[0], 't1')
+        self.outbox.enqueue('0680000003', 'c', 'k', tracker='t1')
+        self.assertEqual(self.outbox.stats()['pending'], 2)
+
+    def test_lease_ack_fail_and_dead_letter(self):
+        self.outbox.enqueue_many([('06800000%02d' % i, 'a', 't%d' % i) for i in range(5)],
+                                 'k', emetteur='iSendPro')
+        leased = self.outbox.lease(3)
+        self.assertEqual([m.tracker for m in leased], ['t0', 't1', 't2'])
+        self.assertEqual(leased[0].emetteur, 'iSendPro')
+        self.assertEqual([m.tracker for m in self.outbox.lease(10)], ['t3', 't4'])
+        self.assertEqual(self.outbox.lease(10), [])
+
+        self.assertEqual(self.outbox.mark_inflight(['t0', 't1', 't2'], leased[0].lease_token),
+                         ['t0', 't1', 't2'])
+        self.outbox.ack(['t0'], [0])
+        self.outbox.fail(['t1', 't2'], 'boom')
+        leased = self.outbox.lease(10)
+        self.assertEqual([m.tracker for m in leased], ['t1', 't2'])
+        self.outbox.mark_inflight(['t1'], leased[0].lease_token)
+        self.outbox.fail(['t1'], 'boom again')
+        stats = self.outbox.stats()
+        self.assertEqual((stats['sent'], stats['dead'], stats['leased']), (1, 1, 3))
+        message, code, error = self.outbox.dead_letters()[0]
+        self.assertEqual((message.tracker, message.attempts, error), ('t1', 2, 'boom again'))
+
+    def test_expired_leases_are_taken_again(self):
+        outbox = SmsOutbox(self.path, lease_seconds=0)
+        try:
+            outbox.enqueue('0680000001', 'a', 'k', tracker='t1')
+            first, = outbox.lease()
+            time.sleep(0.01)
+            second, = outbox.lease()
+            self.assertNotEqual(first.lease_token, second.lease_token)
+            # only the last lease may send the message
+            self.assertEqual(outbox.mark_inflight(['t1'], first.lease_token), [])
+            self.assertEqual(outbox.mark_inflight(['t1'], second.lease_token), ['t1'])
+            self.assertEqual(outbox.mark_inflight(['t1'], second.lease_token), [])
+        finally:
+            outbox.close()
+
+    def test_databases_without_lease_token_are_migrated(self):
+        self.outbox.close()
+        os.remove(self.path)
+        db = sqlite3.connect(self.path)
+        db.executescript(outbox_module._SCHEMA.replace('    lease_token TEXT,\n', ''))
+        db.execute("INSERT INTO outbox (tracker, num, sms, keyid) VALUES ('t1', '0680000001', 'a', 'k')")
+        db.commit()
+        db.close()
+
+        self.outbox = SmsOutbox(self.path)
+        message, = self.outbox.lease()
+        self.assertEqual(self.outbox.mark_inflight(['t1'], message.lease_token), ['t1'])
+
+    def test_recover_without_double_send(self):
+        self.outbox.enqueue_many([('06800000%02d' % i, 'a', 't%d' % i) for i in range(4)], 'k')
+        token = self.outbox.lease(4)[0].lease_token
+        self.outbox.mark_inflight(['t1', 't2', 't3'], token)
+        self.outbox.close()
+
+        # restart
+        outbox = SmsOutbox(self.path)
+        try:
+            seen = []
+
+            def reconcile(messages):
+                seen.extend(m.tracker for m in messages)
+                return ['t2']
+
+            self.assertEqual(outbox.recover(reconcile),
+                             {'requeued': 1, 'reconciled': 1, 'unknown': 2})
+            self.assertEqual(seen, ['t1', 't2', 't3'])
+            stats = outbox.stats()
+            self.assertEqual((stats['pending'], stats['sent'], stats['dead']), (1, 1, 2))
+            self.assertEqual([m.tracker for m in outbox.lease()], ['t0'])
+        finally:
+            outbox.close()
+
+    def test_recover_can_resend_unknown(self):
+        self.outbox.enqueue('0680000001', 'a', 'k', tracker='t1')
+        message, = self.outbox.lease()
+        self.outbox.mark_inflight(['t1'], message.lease_token)
+        self.assertEqual(self.outbox.recover(resend_unknown=True)['unknown'], 1)
+        self.assertEqual(self.outbox.stats()['pending'], 1)
+
+
+class TestOutboxWorkers(OutboxTestCase):
+    """ OutboxWorkers unit test """
+
+    def test_workers_drain_the_outbox(self):
+        api_client = EchoApiClient()
+        self.outbox.enqueue_many([('06800%05d' % i, 'a') for i in range(250)], 'k', emetteur='A')
+        self.outbox.enqueue_many([('06810%05d' % i, 'b') for i in range(50)], 'k', emetteur='B')
+        workers = OutboxWorkers(self.outbox, api_client, workers=3, batch_size=100,
+                                poll_interval=0.01)
+        workers.start()
+        deadline = time.time() + 5
+        while self.outbox.stats()['pending'] and time.time() < deadline:
+            time.sleep(0.01)
+        workers.stop()
+
+        stats = self.outbox.stats()
+        self.assertEqual(stats['sent'] + stats['dead'], 300)
+        self.assertEqual(stats['dead'], 30)
+        self.assertEqual(sum(len(body['num']) for body in api_client.bodies), 300)
+        for body in api_client.bodies:
+            self.assertEqual(len(set(body['sms'])), 1)
+            self.assertEqual(len(body['tracker']), len(body['num']))
+        self.assertEqual(self.outbox.dead_letters()[0][1:], (8, 'Numero invalide'))
+
+    def test_requests_not_sent_are_retried_then_dead_lettered(self):
+        error = urllib3.exceptions.ConnectTimeoutError('connect timeout')
+        api_client = EchoApiClient(fail=error, retry_policy=RetryPolicy(backoff_factor=0))
+        workers = OutboxWorkers(self.outbox, api_client, batch_size=10)
+        self.outbox.enqueue_many([('068000000%d' % i, 'a') for i in range(3)], 'k')
+        self.assertEqual(workers.run_once(), 3)
+        self.assertEqual(self.outbox.stats()['pending'], 3)
+        self.assertEqual(workers.run_once(), 3)
+        self.assertEqual(self.outbox.stats()['dead'], 3)
+        # the api client retried each attempt of the outbox
+        self.assertEqual(len(api_client.bodies), 6)
+
+    def test_requests_maybe_processed_are_not_sent_again(self):
+        # trackers opt in to resending /smsmulti, which the workers ignore
+        opt_in = RetryPolicy(rules=default_rules() + [RetryRule('/smsmulti', idempotent=has_trackers)],
+                             backoff_factor=0)
+        errors = (ApiException(status=500, reason='boom'),
+                  urllib3.exceptions.ReadTimeoutError(None, '/smsmulti', 'read timeout'))
+        for error in errors:
+            for api_client in (EchoApiClient(fail=error), EchoApiClient(fail=error, retry_policy=opt_in)):
+                workers = OutboxWorkers(self.outbox, api_client, batch_size=10)
+                self.outbox.enqueue_many([('068000000%d' % i, 'a') for i in range(3)], 'k')
+                self.assertEqual(workers.run_once(), 3)
+                self.assertEqual(workers.run_once(), 0)
+                self.assertEqual(len(api_client.bodies), 1)
+        self.assertIs(api_client.retry_policy, opt_in)
+        stats = self.outbox.stats()
+        self.assertEqual((stats['pending'], stats['dead']), (0, 12))
+        self.assertTrue(self.outbox.dead_letters()[0][2].startswith('outcome unknown'))
+
+    def test_results_are_matched_by_number(self):
+        class PartialApiClient(EchoApiClient):
+            def answer(self, method, url, query_params, body):
+                # out of order, the first number missing
+                return {"etat": {"etat": [self.entry(i, num, body)
+                                          for i, num in reversed(list(enumerate(body['num'])))][:-1]}}
+
+        workers = OutboxWorkers(self.outbox, PartialApiClient(), batch_size=10)
+        self.outbox.enqueue_many([('0680000001', 'a', 't1'), ('0680000009', 'a', 't9'),
+                                  ('+33 6 80 00 00 02', 'a', 't2')], 'k')
+        self.assertEqual(workers.run_once(), 3)
+        stats = self.outbox.stats()
+        self.assertEqual((stats['sent'], stats['dead']), (1, 2))
+        errors = dict((message.tracker, error) for message, _, error in self.outbox.dead_letters())
+        self.assertEqual(errors, {'t1': 'outcome unknown: no result in the response',
+                                  't9': 'Numero invalide'})
+
+    def test_expired_leases_are_not_sent_twice(self):
+        class SlowApiClient(EchoApiClient):
+            def request(self, *args, **kwargs):
+                time.sleep(0.3)
+                return super(SlowApiClient, self).request(*args, **kwargs)
+
+        api_client = SlowApiClient()
+        outbox = SmsOutbox(self.path, lease_seconds=0.1)
+        try:
+            outbox.enqueue('0680000001', 'a', 'k', emetteur='A')
+            outbox.enqueue('0680000002', 'a', 'k', emetteur='B')
+            workers = OutboxWorkers(outbox, api_client, workers=2, batch_size=10,
+                                    poll_interval=0.01)
+            workers.start()
+            deadline = time.time() + 5
+            while outbox.stats()['sent'] < 2 and time.time() < deadline:
+                time.sleep(0.01)
+            time.sleep(0.5)
+            workers.stop()
+            self.assertEqual(sorted(body['num'] for body in api_client.bodies),
+                             [['0680000001'], ['0680000002']])
+            self.assertEqual(outbox.stats()['sent'], 2)
+        finally:
+            outbox.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
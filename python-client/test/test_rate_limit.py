@@ -0,0 +1,113 @@
+# coding: utf-8
+
+"""
+    API iSendPro
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+"""
+
+from __future__ import absolute_import
+
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+
+import swagger_client
+from swagger_client.models.sms_request import SMSRequest
+from swagger_client.rate_limit import FileBackend, RateLimiter, reserve, request_keyid
+
+from .fakes import FakeApiClient
+
+
+class RecordingRateLimiter(RateLimiter):
+
+    def __init__(self, *args, **kwargs):
+        super(RecordingRateLimiter, self).__init__(*args, **kwargs)
+        self.calls = []
+
+    def acquire(self, keyid, resource_path, tokens=1):
+        self.calls.append((keyid, resource_path))
+        return super(RecordingRateLimiter, self).acquire(keyid, resource_path, tokens)
+
+
+class TestTokenBucket(unittest.TestCase):
+    """ token bucket unit test """
+
+    def test_reserve(self):
+        state, wait = reserve(None, 10, 2, 1, 100.0)
+        self.assertEqual((state, wait), ((1, 100.0), 0))
+        state, wait = reserve(state, 10, 2, 1, 100.0)
+        self.assertEqual(wait, 0)
+        state, wait = reserve(state, 10, 2, 1, 100.0)
+        self.assertAlmostEqual(wait, 0.1)
+        state, wait = reserve(state, 10, 2, 1, 100.0)
+        self.assertAlmostEqual(wait, 0.2)
+        # refilled, capped to the capacity
+        state, wait = reserve(state, 10, 2, 1, 200.0)
+        self.assertEqual((state, wait), ((1, 200.0), 0))
+
+    def test_request_keyid(self):
+        self.assertEqual(request_keyid({'keyid': 'q'}, None), 'q')
+        self.assertEqual(request_keyid({}, SMSRequest(keyid='b')), 'b')
+        self.assertEqual(request_keyid(None, {'keyid': 'd'}), 'd')
+        self.assertIsNone(request_keyid(None, None))
+
+
+class TestRateLimiter(unittest.TestCase):
+    """ RateLimiter unit test """
+
+    def test_threads_are_shaped(self):
+        limiter = RateLimiter(rate=100, burst=1)
+        start = time.time()
+        threads = [threading.Thread(target=limiter.acquire, args=('k', '/credit'))
+                   for _ in range(11)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertGreaterEqual(time.time() - start, 0.09)
+
+    def test_keyids_and_paths_have_their_own_buckets(self):
+        limiter = RateLimiter(rate=1, paths={'/smsmulti': (1, 1)})
+        self.assertEqual(limiter.reserve('a', '/credit'), 0)
+        self.assertEqual(limiter.reserve('b', '/credit'), 0)
+        self.assertGreater(limiter.reserve('a', '/credit'), 0.9)
+
+        limiter = RateLimiter(paths={'/smsmulti': 1})
+        self.assertEqual(limiter.reserve('a', '/smsmulti'), 0)
+        self.assertEqual(limiter.reserve('a', '/credit'), 0)
+        self.assertGreater(limiter.reserve('a', '/smsmulti'), 0.9)
+
+    def test_file_backend_is_shared(self):
+        tmp = tempfile.mkdtemp()
+        try:
+            path = os.path.join(tmp, 'rate.json')
+            first = RateLimiter(rate=1, backend=FileBackend(path))
+            second = RateLimiter(rate=1, backend=FileBackend(path))
+            self.assertEqual(first.reserve('k', '/credit'), 0)
+            self.assertGreater(second.reserve('k', '/credit'), 0.9)
+        finally:
+            shutil.rmtree(tmp)
+
+    def test_api_client_acquires_tokens(self):
+        api_client = FakeApiClient()
+        api_client.rate_limiter = RecordingRateLimiter(rate=1000)
+        swagger_client.CreditApi(api_client).get_credit('k', '1')
+        self.assertEqual(api_client.rate_limiter.calls, [('k', '/credit')])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,179 @@
+# coding: utf-8
+
+"""
+    API iSendPro
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+"""
+
+from __future__ import absolute_import
+
+import io
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+import zipfile
+
+from datetime import timedelta
+
+from six.moves.BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+from six.moves.urllib.parse import urlparse, parse_qs
+
+import swagger_client
+from swagger_client.rest import ApiException
+from swagger_client.reports import CampagneReports, iter_report_rows, row_minute, split_period
+
+
+def make_zip(rows):
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, 'w', zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr('rapport.csv', ''.join(';'.join(row) + '\r\n' for row in rows))
+    return buf.getvalue()
+
+
+class ReportHandler(BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        query = parse_qs(urlparse(self.path).query)
+        if query.get('keyid') != ['k']:
+            self.send_response(403)
+            self.end_headers()
+            self.wfile.write(b'{"etat": "cle invalide"}')
+            return
+        body = self.server.report(query)
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/zip')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class ReportServerTestCase(unittest.TestCase):
+
+    def report(self, query):
+        rows = [['date', 'tel', 'statut']]
+        rows += [[query['date_deb'][0], '0680%06d' % i, 'OK'] for i in range(1000)]
+        return make_zip(rows)
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.server = HTTPServer(('127.0.0.1', 0), ReportHandler)
+        self.server.report = self.report
+        thread = threading.Thread(target=self.server.serve_forever, args=(0.05,))
+        thread.daemon = True
+        thread.start()
+        host = 'http://127.0.0.1:%d' % self.server.server_address[1]
+        self.api_client = swagger_client.ApiClient(host=host)
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.tmp)
+
+
+class TestCampagneReports(ReportServerTestCase):
+    """ CampagneReports unit test """
+
+    def test_download_is_streamed_to_disk(self):
+        reports = CampagneReports(self.api_client, chunk_size=512)
+        path = reports.download('k', '2016-07-01 00:00', '2016-07-02 00:00',
+                                path=os.path.join(self.tmp, 'report.zip'))
+        self.assertTrue(zipfile.is_zipfile(path))
+        rows = list(iter_report_rows(path))
+        self.assertEqual(rows[0], ['date', 'tel', 'statut'])
+        self.assertEqual(len(rows), 1001)
+
+    def test_rows_removes_the_download(self):
+        reports = CampagneReports(self.api_client)
+        rows = reports.rows('k', '2016-07-01 00:00', '2016-07-02 00:00')
+        self.assertEqual(next(rows)[0], 'date')
+        self.assertEqual(sum(1 for _ in rows), 1000)
+
+    def test_error_status_raises(self):
+        reports = CampagneReports(self.api_client)
+        with self.assertRaises(ApiException) as ctx:
+            reports.download('bad', '2016-07-01 00:00', '2016-07-02 00:00',
+                             path=os.path.join(self.tmp, 'report.zip'))
+        self.assertEqual(ctx.exception.status, 403)
+
+    def test_plain_csv(self):
+        path = os.path.join(self.tmp, 'report.csv')
+        with open(path, 'w') as f:
+            f.write('a,b\n1,2\n')
+        self.assertEqual(list(iter_report_rows(path)), [['a', 'b'], ['1', '2']])
+
+
+class TestParallelReports(ReportServerTestCase):
+    """ CampagneReports.rows_parallel unit test """
+
+    def report(self, query):
+        deb, fin = query['date_deb'][0], query['date_fin'][0]
+        self.queries.append((deb, fin))
+        # a row sent in the boundary minute is in both sub-reports, with
+        # seconds; the other row of that minute only in the first one
+        return make_zip([['date', 'tel'], [deb + ':30', '0680000001'],
+                         [fin + ':30', '0680000001'], [fin + ':45', '0680000002']])
+
+    def setUp(self):
+        super(TestParallelReports, self).setUp()
+        self.queries = []
+
+    def test_split_period(self):
+        self.assertEqual(split_period('2016-07-01 00:00', '2016-07-20 12:00', timedelta(days=7)),
+                         [('2016-07-01 00:00', '2016-07-08 00:00'),
+                          ('2016-07-08 00:00', '2016-07-15 00:00'),
+                          ('2016-07-15 00:00', '2016-07-20 12:00')])
+        self.assertEqual(split_period('2016-07-01 00:00', '2016-07-03 00:00', timedelta(days=1)),
+                         [('2016-07-01 00:00', '2016-07-02 00:00'),
+                          ('2016-07-02 00:00', '2016-07-03 00:00')])
+        self.assertEqual(split_period('2016-07-01 00:00', '2016-07-01 00:00', timedelta(days=1)),
+                         [('2016-07-01 00:00', '2016-07-01 00:00')])
+        with self.assertRaises(ValueError):
+            split_period('2016-07-02 00:00', '2016-07-01 00:00', timedelta(days=1))
+
+    def test_row_minute(self):
+        self.assertEqual(row_minute(['x', '2016-07-01 10:05:33', '2016-07-02 00:00']), '2016-07-01 10:05')
+        self.assertEqual(row_minute(['01/07/2016 10:05', 'x']), '2016-07-01 10:05')
+        self.assertIsNone(row_minute(['date', '0680000001']))
+
+    def test_rows_are_merged_in_order_without_duplicates(self):
+        config = swagger_client.Configuration()
+        temp_folder_path, config.temp_folder_path = config.temp_folder_path, self.tmp
+        try:
+            reports = CampagneReports(self.api_client)
+            rows = list(reports.rows_parallel('k', '2016-07-01 00:00', '2016-07-31 00:00',
+                                              window=timedelta(days=3), max_workers=3))
+        finally:
+            config.temp_folder_path = temp_folder_path
+        # the sub-periods share their boundary minute
+        self.assertEqual(sorted(self.queries)[:2], [('2016-07-01 00:00', '2016-07-04 00:00'),
+                                                    ('2016-07-04 00:00', '2016-07-07 00:00')])
+        self.assertEqual(rows[0], ['date', 'tel'])
+        self.assertEqual(rows.count(['date', 'tel']), 1)
+        self.assertEqual(rows[1:5], [['2016-07-01 00:00:30', '0680000001'],
+                                     ['2016-07-04 00:00:30', '0680000001'],
+                                     ['2016-07-04 00:00:45', '0680000002'],
+                                     ['2016-07-07 00:00:30', '0680000001']])
+        self.assertEqual(len(rows[1:]), len(set(tuple(row) for row in rows[1:])))
+        self.assertEqual(rows[-2:], [['2016-07-31 00:00:30', '0680000001'],
+                                     ['2016-07-31 00:00:45', '0680000002']])
+        self.assertEqual(len(rows), 1 + 11 + 10)
+        self.assertEqual(os.listdir(self.tmp), [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,141 @@
+# coding: utf-8
+
+"""
+    API iSendPro
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+"""
+
+from __future__ import absolute_import
+
+import socket
+import threading
+import time
+import unittest
+
+from six.moves.BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+from six.moves.socketserver import ThreadingMixIn
+
+import swagger_client
+from swagger_client.rest import RESTClientObject
+
+
+class CreditHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        body = b'{"etat": {"credit": 3.5, "quantite": "10"}}'
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_HEAD(self):
+        self.send_response(200)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+class CountingServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+    def __init__(self, *args, **kwargs):
+        HTTPServer.__init__(self, *args, **kwargs)
+        self.connections = 0
+
+    def process_request(self, request, client_address):
+        self.connections += 1
+        ThreadingMixIn.process_request(self, request, client_address)
+
+
+class TestPoolConfiguration(unittest.TestCase):
+    """ RESTClientObject connection pool unit test """
+
+    def setUp(self):
+        self.config = swagger_client.Configuration()
+        self.saved = (self.config.connection_pool_maxsize, self.config.connection_pool_block,
+                      self.config.connect_timeout, self.config.read_timeout,
+                      self.config.warm_up_connections)
+        self.server = CountingServer(('127.0.0.1', 0), CreditHandler)
+        thread = threading.Thread(target=self.server.serve_forever, args=(0.05,))
+        thread.daemon = True
+        thread.start()
+        self.host = 'http://127.0.0.1:%d' % self.server.server_address[1]
+
+    def tearDown(self):
+        (self.config.connection_pool_maxsize, self.config.connection_pool_block,
+         self.config.connect_timeout, self.config.read_timeout,
+         self.config.warm_up_connections) = self.saved
+        self.server.shutdown()
+        self.server.server_close()
+
+    def wait_connections(self, expected):
+        # connections are counted when the server thread accepts them
+        deadline = time.time() + 2
+        while self.server.connections < expected and time.time() < deadline:
+            time.sleep(0.01)
+        return self.server.connections
+
+    def test_pool_settings_from_configuration(self):
+        self.config.connection_pool_maxsize = 12
+        self.config.connection_pool_block = True
+        self.config.connect_timeout = 2
+        self.config.read_timeout = 30
+        pool_kw = RESTClientObject().pool_manager.connection_pool_kw
+        self.assertEqual(pool_kw['maxsize'], 12)
+        self.assertTrue(pool_kw['block'])
+        self.assertEqual((pool_kw['timeout'].connect_timeout, pool_kw['timeout'].read_timeout),
+                         (2, 30))
+        self.assertIn((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1), pool_kw['socket_options'])
+
+    def test_pool_size_defaults_to_thread_pool_size(self):
+        self.config.connection_pool_maxsize = None
+        thread_pool_size, self.config.thread_pool_size = self.config.thread_pool_size, 6
+        try:
+            pool_kw = RESTClientObject().pool_manager.connection_pool_kw
+        finally:
+            self.config.thread_pool_size = thread_pool_size
+        self.assertEqual(pool_kw['maxsize'], 6)
+
+    def test_warm_up_connections_are_reused(self):
+        self.config.connection_pool_maxsize = 4
+        self.config.warm_up_connections = 3
+        api_client = swagger_client.ApiClient(host=self.host)
+        self.assertEqual(self.wait_connections(3), 3)
+
+        credit_api = swagger_client.CreditApi(api_client)
+        for _ in range(5):
+            self.assertEqual(credit_api.get_credit('k', '1').etat.credit, 3.5)
+        self.assertEqual(self.server.connections, 3)
+
+    def test_warm_up_is_capped_by_maxsize(self):
+        self.config.connection_pool_maxsize = 2
+        api_client = swagger_client.ApiClient(host=self.host)
+        self.assertEqual(api_client.warm_up(10), 2)
+        self.assertEqual(self.wait_connections(2), 2)
+
+    def test_warm_up_failures_are_not_raised(self):
+        sock = socket.socket()
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+        sock.close()
+        api_client = swagger_client.ApiClient(host='http://127.0.0.1:%d' % port)
+        self.assertEqual(api_client.warm_up(2), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
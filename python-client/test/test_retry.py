@@ -0,0 +1,182 @@
+# coding: utf-8
+
+"""
+    API iSendPro
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+"""
+
+from __future__ import absolute_import
+
+import json
+import time
+import unittest
+
+from email.utils import formatdate
+
+import urllib3
+
+import swagger_client
+from swagger_client.models.sms_request import SMSRequest
+from swagger_client.rest import ApiException
+from swagger_client.retry import RetryPolicy, RetryRule, default_rules, has_trackers
+
+from .fakes import FakeResponse
+
+
+class FlakyApiClient(swagger_client.ApiClient):
+    """ fails with the given errors, then answers """
+
+    def __init__(self, errors, data, **kwargs):
+        super(FlakyApiClient, self).__init__(**kwargs)
+        self.errors = list(errors)
+        self.data = data
+        self.attempts = 0
+
+    def request(self, method, url, query_params=None, headers=None,
+                post_params=None, body=None, **kwargs):
+        self.attempts += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return FakeResponse(json.dumps(self.data))
+
+
+def status_error(status, headers=None):
+    error = ApiException(status=status, reason='error')
+    error.headers = headers
+    return error
+
+
+def connect_error():
+    return urllib3.exceptions.MaxRetryError(
+        None, '/sms', urllib3.exceptions.NewConnectionError(None, 'refused'))
+
+
+class TestRetryPolicy(unittest.TestCase):
+    """ RetryPolicy unit test """
+
+    def setUp(self):
+        self.policy = RetryPolicy(jitter=False, backoff_factor=1)
+
+    def test_read_only_endpoints_are_retried(self):
+        self.assertEqual(self.policy.retry_delay('/credit', None, 1, status_error(503)), 1)
+        self.assertEqual(self.policy.retry_delay('/credit', None, 2, status_error(502)), 2)
+        self.assertIsNone(self.policy.retry_delay('/credit', None, 3, status_error(502)))
+        self.assertIsNone(self.policy.retry_delay('/credit', None, 1, status_error(400)))
+        self.assertEqual(self.policy.retry_delay(
+            '/hlr', None, 1, urllib3.exceptions.ReadTimeoutError(None, '/hlr', 'timeout')), 1)
+
+    def test_sms_is_not_resent_by_default(self):
+        request = SMSRequest(num=['0680010203', '0680010204'], sms=['a', 'b'],
+                             tracker=['t1', 't2'])
+        self.assertIsNone(self.policy.retry_delay('/smsmulti', request, 1, status_error(503)))
+        self.assertIsNone(self.policy.retry_delay(
+            '/sms', request, 1, urllib3.exceptions.ReadTimeoutError(None, '/sms', 'timeout')))
+        self.assertEqual(self.policy.retry_delay('/smsmulti', request, 1, status_error(429)), 1)
+
+    def test_sms_with_trackers_opt_in(self):
+        policy = RetryPolicy(rules=default_rules() + [RetryRule('/smsmulti', idempotent=has_trackers)],
+                             jitter=False, backoff_factor=1)
+        request = SMSRequest(num=['0680010203', '0680010204'], sms=['a', 'b'])
+        self.assertIsNone(policy.retry_delay('/smsmulti', request, 1, status_error(503)))
+        request.tracker = ['t1', '']
+        self.assertIsNone(policy.retry_delay('/smsmulti', request, 1, status_error(503)))
+        request.tracker = ['t1', 't2']
+        self.assertEqual(policy.retry_delay('/smsmulti', request, 1, status_error(503)), 1)
+        self.assertIsNone(policy.retry_delay('/sms', request, 1, status_error(503)))
+        self.assertTrue(has_trackers({'tracker': 't1'}))
+
+    def test_unsent_and_rejected_requests_are_always_retried(self):
+        request = SMSRequest(num=['0680010203'], sms=['a'])
+        self.assertEqual(self.policy.retry_delay('/smsmulti', request, 1, connect_error()), 1)
+        self.assertEqual(self.policy.retry_delay('/repertoire', None, 2, status_error(429)), 2)
+        self.assertIsNone(self.policy.retry_delay('/repertoire', None, 1, status_error(503)))
+        self.assertIsNone(self.policy.retry_delay('/credit', None, 1, ValueError('bug')))
+
+    def test_backoff_and_jitter(self):
+        policy = RetryPolicy(max_attempts=10, backoff_factor=0.5, max_backoff=3)
+        for attempt, bound in [(1, 0.5), (2, 1), (3, 2), (4, 3), (8, 3)]:
+            self.assertEqual(RetryPolicy(max_attempts=10, backoff_factor=0.5, max_backoff=3,
+                                         jitter=False).retry_delay('/credit', None, attempt,
+                                                                   status_error(500)), bound)
+            for _ in range(20):
+                self.assertTrue(0 <= policy.retry_delay('/credit', None, attempt,
+                                                        status_error(500)) <= bound)
+
+    def test_retry_after(self):
+        self.assertEqual(self.policy.retry_delay(
+            '/credit', None, 1, status_error(503, {'Retry-After': '7'})), 7)
+        self.assertEqual(self.policy.retry_delay(
+            '/credit', None, 1, status_error(429, {'Retry-After': '7200'})), 120)
+        delay = self.policy.retry_delay(
+            '/credit', None, 1,
+            status_error(503, {'Retry-After': formatdate(time.time() + 30, usegmt=True)}))
+        self.assertTrue(25 <= delay <= 30)
+
+    def test_custom_rules(self):
+        policy = RetryPolicy(rules=[RetryRule('/repertoire', idempotent=True, max_attempts=5)],
+                             jitter=False)
+        self.assertEqual(policy.retry_delay('/repertoire', None, 4, status_error(500)), 4)
+        self.assertIsNone(policy.retry_delay('/credit', None, 1, status_error(500)))
+
+    def test_without_resending(self):
+        policy = RetryPolicy(rules=default_rules() + [RetryRule('/smsmulti', idempotent=True,
+                                                                max_attempts=5)],
+                             jitter=False, backoff_factor=1)
+        strict = policy.without_resending('/smsmulti')
+        self.assertIsNone(strict.retry_delay('/smsmulti', None, 1, status_error(503)))
+        self.assertEqual(strict.retry_delay('/smsmulti', None, 4, connect_error()), 8)
+        self.assertEqual(strict.retry_delay('/credit', None, 1, status_error(503)), 1)
+        self.assertEqual(policy.retry_delay('/smsmulti', None, 1, status_error(503)), 1)
+
+    def test_call_sleeps_between_attempts(self):
+        errors = [status_error(503), status_error(503)]
+        delays = []
+
+        def func():
+            if errors:
+                raise errors.pop(0)
+            return 'ok'
+
+        self.assertEqual(self.policy.call(func, '/credit', sleep=delays.append), 'ok')
+        self.assertEqual(delays, [1, 2])
+
+
+class TestApiClientRetries(unittest.TestCase):
+    """ ApiClient retries unit test """
+
+    policy = RetryPolicy(backoff_factor=0)
+
+    def test_transient_errors_are_retried(self):
+        api_client = FlakyApiClient([status_error(503), connect_error()],
+                                    {"etat": {"credit": 3.5, "quantite": "10"}},
+                                    retry_policy=self.policy)
+        credit = swagger_client.CreditApi(api_client).get_credit('k', '1')
+        self.assertEqual(credit.etat.credit, 3.5)
+        self.assertEqual(api_client.attempts, 3)
+
+    def test_sms_is_not_resent(self):
+        api_client = FlakyApiClient([status_error(503)], {"etat": {"etat": []}},
+                                    retry_policy=self.policy)
+        request = SMSRequest(keyid='k', num=['0680010203'], sms=['a'], tracker=['t1'])
+        with self.assertRaises(ApiException):
+            swagger_client.SmsApi(api_client).send_sms_multi(request)
+        self.assertEqual(api_client.attempts, 1)
+
+        api_client.errors = [connect_error(), status_error(429)]
+        swagger_client.SmsApi(api_client).send_sms_multi(request)
+        self.assertEqual(api_client.attempts, 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
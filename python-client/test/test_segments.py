@@ -0,0 +1,83 @@
+# coding: utf-8
+
+"""
+    API iSendPro
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+"""
+
+from __future__ import absolute_import
+
+import unittest
+
+import swagger_client
+from swagger_client.segments import count_sms, count_sms_batch, numpy, GSM7, UCS2
+
+
+class TestSegments(unittest.TestCase):
+    """ Offline comptage unit test """
+
+    def test_gsm7_limits(self):
+        self.assertEqual(count_sms(u'a' * 160), (GSM7, 160, 1))
+        self.assertEqual(count_sms(u'a' * 161), (GSM7, 161, 2))
+        self.assertEqual(count_sms(u'a' * 306), (GSM7, 306, 2))
+        self.assertEqual(count_sms(u'a' * 307), (GSM7, 307, 3))
+
+    def test_gsm7_extension_counts_twice(self):
+        self.assertEqual(count_sms(u'€' * 80), (GSM7, 160, 1))
+        self.assertEqual(count_sms(u'[a]'), (GSM7, 5, 1))
+
+    def test_ucs2_limits(self):
+        self.assertEqual(count_sms(u'ж' * 70), (UCS2, 70, 1))
+        self.assertEqual(count_sms(u'ж' * 71), (UCS2, 71, 2))
+        self.assertEqual(count_sms(u'ж' * 134), (UCS2, 134, 2))
+        self.assertEqual(count_sms(u'ж' * 135), (UCS2, 135, 3))
+
+    def test_ucs2_forced_and_surrogates(self):
+        self.assertEqual(count_sms(u'abc', ucs2='1'), (UCS2, 3, 1))
+        self.assertEqual(count_sms(u'\U0001F600'), (UCS2, 2, 1))
+
+    def test_stop_suffix(self):
+        self.assertEqual(count_sms(u'a' * 148, emetteur='iSendPro'), (GSM7, 160, 1))
+        self.assertEqual(count_sms(u'a' * 149, emetteur='iSendPro'), (GSM7, 161, 2))
+        self.assertEqual(count_sms(u'a' * 149, emetteur='iSendPro', nostop='1'), (GSM7, 149, 1))
+        self.assertEqual(count_sms(u'a' * 149, emetteur='iSendPro', nostop='0'), (GSM7, 161, 2))
+
+    def test_offline_comptage_api(self):
+        request = swagger_client.ComptageRequest(keyid='k', sms=u'Bonjour', num='0680010203')
+        response = swagger_client.OfflineComptageApi().comptage(request)
+        self.assertIsInstance(response, swagger_client.ComptageReponse)
+        etat = response.etat.etat[0]
+        self.assertEqual((etat.tel, etat.nb_sms, etat.nb_caractere), ('0680010203', '1', '7'))
+
+
+    def test_batch_matches_single(self):
+        messages = [u'', u'Bonjour', u'a' * 161, u'€' * 81, u'ж' * 70, u'ж' * 71,
+                    u'\U0001F600 ok', u'{[~]}' * 40, None]
+        for kwargs in ({}, {'emetteur': 'iSendPro'}, {'ucs2': '1'},
+                       {'emetteur': 'iSendPro', 'nostop': '1'}):
+            batch = count_sms_batch(messages, **kwargs)
+            expected = [count_sms(sms, **kwargs) for sms in messages]
+            self.assertEqual(list(batch.encoding), [count.encoding for count in expected])
+            self.assertEqual(list(batch.nb_caractere), [count.nb_caractere for count in expected])
+            self.assertEqual(list(batch.nb_sms), [count.nb_sms for count in expected])
+
+    @unittest.skipIf(numpy is None, "numpy is not installed")
+    def test_batch_numpy_input(self):
+        batch = count_sms_batch(numpy.array([u'abc', u'жжж'], dtype=object))
+        self.assertEqual(batch.encoding.tolist(), [GSM7, UCS2])
+        self.assertEqual(batch.nb_sms.tolist(), [1, 1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,138 @@
+# coding: utf-8
+
+"""
+    API iSendPro
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+"""
+
+from __future__ import absolute_import
+
+import json
+import threading
+import unittest
+
+from six.moves.BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+
+import swagger_client
+from swagger_client.codec import get_codec
+from swagger_client.models.sms_request import SMSRequest
+from swagger_client.streaming import StreamingBody
+
+
+class EchoHandler(BaseHTTPRequestHandler):
+
+    def do_POST(self):
+        if self.headers.get('Transfer-Encoding') == 'chunked':
+            body = b''
+            while True:
+                size = int(self.rfile.readline().strip(), 16)
+                body += self.rfile.read(size)
+                self.rfile.readline()
+                if not size:
+                    break
+        else:
+            body = self.rfile.read(int(self.headers['Content-Length']))
+        self.server.received.append((self.headers.get('Transfer-Encoding'), body))
+        response = b'{"etat": {"etat": []}}'
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(response)))
+        self.end_headers()
+        self.wfile.write(response)
+
+    def log_message(self, *args):
+        pass
+
+
+def sms_request(entries):
+    return SMSRequest(keyid='k', emetteur='iSendPro',
+                      num=['336%08d' % i for i in range(entries)],
+                      sms=[u'Message n°%d' % i for i in range(entries)])
+
+
+class TestStreamingBody(unittest.TestCase):
+    """ StreamingBody unit test """
+
+    def setUp(self):
+        self.api_client = swagger_client.ApiClient()
+
+    def streaming_body(self, body, **kwargs):
+        return StreamingBody(body, self.api_client.sanitize_for_serialization,
+                             get_codec('json'), **kwargs)
+
+    def test_encodes_like_sanitize(self):
+        request = sms_request(2500)
+        body = self.streaming_body(request, chunk_items=100, chunk_size=1024)
+        chunks = list(body)
+        self.assertGreater(len(chunks), 10)
+        self.assertEqual(json.loads(b''.join(chunks).decode('utf-8')),
+                         self.api_client.sanitize_for_serialization(request))
+        self.assertEqual(body.content_length(), len(b''.join(chunks)))
+
+    def test_dicts_and_empty_lists(self):
+        for data in [{}, {'num': [], 'keyid': None}, {'a': {'b': [1, 2]}}]:
+            self.assertEqual(json.loads(b''.join(self.streaming_body(data)).decode('utf-8')), data)
+
+    def test_prepare_body_threshold(self):
+        config = swagger_client.Configuration()
+        self.assertIsInstance(self.api_client.prepare_body(sms_request(config.stream_body_threshold + 1)),
+                              StreamingBody)
+        self.assertIsInstance(self.api_client.prepare_body(sms_request(10)), dict)
+        threshold, config.stream_body_threshold = config.stream_body_threshold, None
+        try:
+            self.assertIsInstance(self.api_client.prepare_body(sms_request(50000)), dict)
+        finally:
+            config.stream_body_threshold = threshold
+
+
+class TestStreamingRequest(unittest.TestCase):
+    """ streamed /smsmulti request unit test """
+
+    def setUp(self):
+        self.config = swagger_client.Configuration()
+        self.saved = self.config.stream_body_threshold, self.config.stream_body_chunked
+        self.config.stream_body_threshold = 100
+        self.server = HTTPServer(('127.0.0.1', 0), EchoHandler)
+        self.server.received = []
+        thread = threading.Thread(target=self.server.serve_forever, args=(0.05,))
+        thread.daemon = True
+        thread.start()
+        host = 'http://127.0.0.1:%d' % self.server.server_address[1]
+        self.sms_api = swagger_client.SmsApi(swagger_client.ApiClient(host=host))
+
+    def tearDown(self):
+        self.config.stream_body_threshold, self.config.stream_body_chunked = self.saved
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_content_length(self):
+        request = sms_request(5000)
+        self.sms_api.send_sms_multi(request)
+        encoding, body = self.server.received[0]
+        self.assertIsNone(encoding)
+        self.assertEqual(json.loads(body.decode('utf-8')),
+                         self.sms_api.api_client.sanitize_for_serialization(request))
+
+    def test_chunked(self):
+        self.config.stream_body_chunked = True
+        request = sms_request(5000)
+        self.sms_api.send_sms_multi(request)
+        encoding, body = self.server.received[0]
+        self.assertEqual(encoding, 'chunked')
+        self.assertEqual(json.loads(body.decode('utf-8')),
+                         self.sms_api.api_client.sanitize_for_serialization(request))
+
+
+if __name__ == '__main__':
+    unittest.main()